@@ -0,0 +1,100 @@
+import asyncio
+from contextlib import asynccontextmanager, nullcontext
+from typing import Any, AsyncGenerator, Dict, List, Optional
+
+import asyncpg
+from pgvector.asyncpg import register_vector
+
+from config import settings
+from services.concurrency import Bulkhead, postgres_bulkhead
+
+
+class AsyncDatabase:
+    """Async connection manager for PostgreSQL with pgvector support, backed by asyncpg."""
+
+    def __init__(
+        self,
+        connection_string: str,
+        min_size: int = 1,
+        max_size: int = 10,
+        idle_timeout: float = 300.0,
+        bulkhead: Optional[Bulkhead] = None
+    ):
+        self.connection_string = connection_string
+        self.min_size = min_size
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.bulkhead = bulkhead
+        self._pool: Optional[asyncpg.Pool] = None
+        self._pool_lock = asyncio.Lock()
+
+    @staticmethod
+    async def _init_connection(conn: asyncpg.Connection) -> None:
+        await register_vector(conn)
+
+    async def connect(self) -> asyncpg.Pool:
+        """Create the connection pool if it does not exist yet."""
+        if self._pool is None:
+            async with self._pool_lock:
+                if self._pool is None:
+                    self._pool = await asyncpg.create_pool(
+                        self.connection_string,
+                        min_size=self.min_size,
+                        max_size=self.max_size,
+                        max_inactive_connection_lifetime=self.idle_timeout,
+                        init=self._init_connection
+                    )
+        return self._pool
+
+    async def close(self) -> None:
+        """Close the connection pool."""
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+
+    @asynccontextmanager
+    async def get_connection(self) -> AsyncGenerator[asyncpg.Connection, None]:
+        """Context manager for a pooled connection wrapped in a transaction."""
+        pool = await self.connect()
+        async with self.bulkhead.limit() if self.bulkhead else nullcontext():
+            async with pool.acquire() as conn:
+                async with conn.transaction():
+                    yield conn
+
+    async def fetch(self, query: str, *args) -> List[Dict[str, Any]]:
+        """Run a query and return all rows as dictionaries."""
+        async with self.get_connection() as conn:
+            rows = await conn.fetch(query, *args)
+            return [dict(row) for row in rows]
+
+    async def fetchrow(self, query: str, *args) -> Optional[Dict[str, Any]]:
+        """Run a query and return the first row as a dictionary."""
+        async with self.get_connection() as conn:
+            row = await conn.fetchrow(query, *args)
+            return dict(row) if row is not None else None
+
+    async def fetchval(self, query: str, *args) -> Any:
+        """Run a query and return the first column of the first row."""
+        async with self.get_connection() as conn:
+            return await conn.fetchval(query, *args)
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """Return connection pool metrics."""
+        if self._pool is None:
+            return {"min_size": self.min_size, "max_size": self.max_size, "size": 0, "idle": 0}
+        return {
+            "min_size": self._pool.get_min_size(),
+            "max_size": self._pool.get_max_size(),
+            "size": self._pool.get_size(),
+            "idle": self._pool.get_idle_size(),
+        }
+
+
+# Global async database instance
+async_db = AsyncDatabase(
+    settings.database_url,
+    min_size=settings.db_pool_min_size,
+    max_size=settings.db_pool_max_size,
+    idle_timeout=settings.db_pool_idle_timeout,
+    bulkhead=postgres_bulkhead
+)
@@ -0,0 +1,95 @@
+"""
+Benchmark per-request connections against pooled checkout
+
+Runs the same lightweight query with a fresh psycopg2.connect per request
+(the old Database behaviour) and with the pooled Database, from several
+threads, and reports latency percentiles and pool wait metrics.
+
+Usage:
+    python benchmark_db_pool.py [--requests 200] [--threads 8] [--query "SELECT 1"]
+"""
+import argparse
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List
+
+import psycopg2
+
+from config import settings
+from database import Database
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def run(label: str, request: Callable[[], None], requests: int, threads: int) -> None:
+    latencies: List[float] = []
+
+    def timed_request(_):
+        started = time.perf_counter()
+        request()
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(timed_request, range(requests)))
+    elapsed = time.perf_counter() - started
+
+    print(f"\n{label}")
+    print("-" * 60)
+    print(f"  Requests:   {requests} over {threads} threads")
+    print(f"  Throughput: {requests / elapsed:.1f} req/s")
+    print(f"  Mean:       {statistics.mean(latencies):.2f} ms")
+    print(f"  p50:        {percentile(latencies, 50):.2f} ms")
+    print(f"  p95:        {percentile(latencies, 95):.2f} ms")
+    print(f"  p99:        {percentile(latencies, 99):.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--query", default="SELECT 1")
+    args = parser.parse_args()
+
+    def per_request_connect():
+        conn = psycopg2.connect(settings.database_url)
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(args.query)
+                cursor.fetchall()
+            conn.commit()
+        finally:
+            conn.close()
+
+    pooled_db = Database(
+        settings.database_url,
+        min_size=settings.db_pool_min_size,
+        max_size=settings.db_pool_max_size,
+        idle_timeout=settings.db_pool_idle_timeout,
+        checkout_timeout=settings.db_pool_checkout_timeout,
+        health_check_after=settings.db_pool_health_check_after
+    )
+
+    def pooled_checkout():
+        with pooled_db.get_cursor() as cursor:
+            cursor.execute(args.query)
+            cursor.fetchall()
+
+    run("Per-request psycopg2.connect", per_request_connect, args.requests, args.threads)
+    run("Pooled checkout", pooled_checkout, args.requests, args.threads)
+
+    print("\nPool metrics")
+    print("-" * 60)
+    for key, value in pooled_db.pool_stats().items():
+        print(f"  {key}: {value}")
+
+    pooled_db.close()
+
+
+if __name__ == "__main__":
+    main()
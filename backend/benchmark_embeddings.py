@@ -0,0 +1,106 @@
+"""
+Benchmark embedding backends against the FlagEmbedding reference
+
+Encodes a fixed corpus (sentences from article_1.txt and article_2.txt) with
+the reference FlagEmbedding model and with a candidate backend, and reports
+throughput, single-query latency percentiles and cosine agreement between the
+two backends' vectors.
+
+Usage:
+    python benchmark_embeddings.py --backend onnx [--onnx-model-dir models/bge-base-en-v1.5-onnx-int8]
+    python benchmark_embeddings.py --backend onnx --threads 4 --queries 200
+"""
+import argparse
+import os
+import re
+import time
+from typing import List
+
+import numpy as np
+
+from config import settings
+from embedding_backends import load_backend
+from embeddings import MODEL_ID
+
+CORPUS_FILES = ["article_1.txt", "article_2.txt"]
+
+
+def load_corpus(min_words: int = 5) -> List[str]:
+    """Split the sample articles into sentences, keeping ones long enough to be meaningful."""
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    sentences: List[str] = []
+    for name in CORPUS_FILES:
+        with open(os.path.join(base_dir, name), encoding="utf-8") as f:
+            text = f.read()
+        for sentence in re.split(r"(?<=[.!?])\s+|\n+", text):
+            sentence = sentence.strip()
+            if len(sentence.split()) >= min_words:
+                sentences.append(sentence)
+    return sentences
+
+
+def benchmark(label: str, model, corpus: List[str], queries: List[str], batch_size: int) -> np.ndarray:
+    # One untimed pass so lazy initialisation does not skew the numbers
+    model.encode_queries(queries[:1])
+
+    started = time.perf_counter()
+    passages = np.asarray(model.encode(corpus, batch_size=batch_size), dtype=np.float32)
+    elapsed = time.perf_counter() - started
+
+    latencies: List[float] = []
+    for query in queries:
+        query_started = time.perf_counter()
+        model.encode_queries([query])
+        latencies.append((time.perf_counter() - query_started) * 1000)
+
+    print(f"\n{label}")
+    print("-" * 60)
+    print(f"  Batch throughput: {len(corpus) / elapsed:.1f} sentences/s ({len(corpus)} sentences, batch {batch_size})")
+    print(f"  Query p50:        {np.percentile(latencies, 50):.2f} ms")
+    print(f"  Query p99:        {np.percentile(latencies, 99):.2f} ms")
+    return passages
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend", default=settings.embedding_backend, help="Candidate backend (flag or onnx)")
+    parser.add_argument("--onnx-model-dir", default=settings.onnx_model_dir)
+    parser.add_argument("--onnx-model-file", default=settings.onnx_model_file)
+    parser.add_argument("--threads", type=int, default=settings.onnx_intra_op_threads,
+                        help="ONNX Runtime intra-op threads (0 = runtime default)")
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--queries", type=int, default=100, help="Single-query encodes for latency percentiles")
+    args = parser.parse_args()
+
+    corpus = load_corpus()
+    queries = [corpus[i % len(corpus)] for i in range(args.queries)]
+
+    print("=" * 60)
+    print(f"Embedding backend benchmark ({len(corpus)} sentences)")
+    print("=" * 60)
+
+    reference = benchmark("flag (reference)", load_backend("flag", MODEL_ID), corpus, queries, args.batch_size)
+    if args.backend == "flag":
+        return
+
+    candidate_model = load_backend(
+        args.backend,
+        MODEL_ID,
+        onnx_model_dir=args.onnx_model_dir,
+        onnx_model_file=args.onnx_model_file,
+        intra_op_threads=args.threads
+    )
+    candidate = benchmark(f"{args.backend} (threads={args.threads or 'default'})",
+                          candidate_model, corpus, queries, args.batch_size)
+
+    # Both backends return L2-normalized vectors, so the row-wise dot product is the cosine
+    cosines = np.sum(reference * candidate, axis=1)
+    print("\nCosine agreement with reference")
+    print("-" * 60)
+    print(f"  Mean: {cosines.mean():.5f}")
+    print(f"  Min:  {cosines.min():.5f}")
+    print(f"  p1:   {np.percentile(cosines, 1):.5f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,4 @@
+from typing import Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -13,6 +14,11 @@ class Settings(BaseSettings):
 
     # Database Configuration
     database_url: str
+    db_pool_min_size: int = 1
+    db_pool_max_size: int = 10
+    db_pool_idle_timeout: float = 300.0  # Seconds before surplus idle connections are closed
+    db_pool_checkout_timeout: float = 30.0  # Seconds to wait for a free connection
+    db_pool_health_check_after: float = 30.0  # Ping connections idle longer than this on checkout
 
     # ElevenLabs API Configuration
     elevenlabs_api_key: str
@@ -24,6 +30,37 @@ class Settings(BaseSettings):
     aws_s3_secret_access_key: str
     aws_s3_region: str = "us-west-2"
 
+    # Per-upstream concurrency limits for the async service layer
+    postgres_max_concurrency: int = 10
+    elevenlabs_max_concurrency: int = 4
+    s3_max_concurrency: int = 8
+    embedding_max_concurrency: int = 32  # Callers waiting on the query batcher, not forward passes
+    bulkhead_acquire_timeout: float = 30.0  # Seconds to wait for a slot before failing fast
+
+    # Query embedding cache
+    query_cache_max_entries: int = 1024
+    query_cache_ttl_seconds: float = 3600.0
+    query_cache_disk_path: Optional[str] = None  # SQLite file for a cache that survives restarts
+
+    # Query encoding micro-batching
+    query_batch_max_size: int = 32
+    query_batch_max_wait_ms: float = 5.0
+
+    # Embedding backend: "flag" (FlagEmbedding/PyTorch) or "onnx" (ONNX Runtime, int8)
+    embedding_backend: str = "flag"
+    onnx_model_dir: str = "models/bge-base-en-v1.5-onnx-int8"
+    onnx_model_file: str = "model_quantized.onnx"
+    onnx_intra_op_threads: int = 0  # 0 = ONNX Runtime default (one per physical core)
+
+    # Shared embedding server (see embedding_server.py); unset = load the model in-process
+    embedding_server_socket: Optional[str] = None
+    embedding_server_workers: int = 1
+    # Shared secret; unset = the server writes a random key next to the socket (mode 0600)
+    embedding_server_authkey: Optional[str] = None
+
+    # Startup
+    warmup_on_startup: bool = True  # Load the model and clients in the background after boot
+
     # FastAPI Configuration
     host: str = "0.0.0.0"
     port: int = 8000
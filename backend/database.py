@@ -1,31 +1,250 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, Generator, Optional, Tuple
+
 import psycopg2
 from psycopg2.extras import RealDictCursor
-from contextlib import contextmanager
-from typing import Generator
 from config import settings
 
 
+class PoolTimeoutError(Exception):
+    """Raised when no pooled connection becomes available in time."""
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of psycopg2 connections.
+
+    Connections are reused across requests instead of paying a TCP + TLS +
+    auth handshake per cursor. Idle connections above ``min_size`` are closed
+    after ``idle_timeout`` seconds, and connections that have been idle for
+    longer than ``health_check_after`` seconds are pinged before being handed
+    out so a connection dropped by the server is never returned to a caller.
+    """
+
+    def __init__(
+        self,
+        connection_string: str,
+        min_size: int = 1,
+        max_size: int = 10,
+        idle_timeout: float = 300.0,
+        checkout_timeout: float = 30.0,
+        health_check_after: float = 30.0
+    ):
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError("Pool sizes must satisfy 0 <= min_size <= max_size and max_size >= 1")
+
+        self.connection_string = connection_string
+        self.min_size = min_size
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.checkout_timeout = checkout_timeout
+        self.health_check_after = health_check_after
+
+        # Idle connections with the monotonic time they were returned
+        self._idle: Deque[Tuple[psycopg2.extensions.connection, float]] = deque()
+        self._size = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+        # Metrics
+        self._checkouts = 0
+        self._waits = 0
+        self._wait_time_total = 0.0
+        self._wait_time_max = 0.0
+        self._timeouts = 0
+        self._connections_opened = 0
+        self._connections_closed = 0
+        self._health_check_failures = 0
+
+    def _connect(self) -> psycopg2.extensions.connection:
+        conn = psycopg2.connect(self.connection_string)
+        with self._cond:
+            self._connections_opened += 1
+        return conn
+
+    def _discard(self, conn: psycopg2.extensions.connection) -> None:
+        """Close a connection and release its slot. Caller must hold the lock."""
+        try:
+            conn.close()
+        except Exception:
+            pass
+        self._size -= 1
+        self._connections_closed += 1
+        self._cond.notify()
+
+    def _is_healthy(self, conn: psycopg2.extensions.connection, idle_for: float) -> bool:
+        """Check a connection before handing it out."""
+        if conn.closed:
+            return False
+        if idle_for < self.health_check_after:
+            return True
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except Exception:
+            return False
+
+    def _reap_idle(self) -> None:
+        """Close connections idle past the timeout, keeping min_size. Caller must hold the lock."""
+        now = time.monotonic()
+        while self._idle and self._size > self.min_size:
+            conn, returned_at = self._idle[0]
+            if now - returned_at < self.idle_timeout:
+                break
+            self._idle.popleft()
+            self._discard(conn)
+
+    def getconn(self) -> psycopg2.extensions.connection:
+        """Check out a connection, waiting up to checkout_timeout seconds."""
+        started = time.monotonic()
+        deadline = started + self.checkout_timeout
+        waited = False
+
+        while True:
+            candidate = None
+            open_new = False
+
+            with self._cond:
+                if self._closed:
+                    raise PoolTimeoutError("Connection pool is closed")
+
+                self._reap_idle()
+
+                if self._idle:
+                    candidate = self._idle.pop()
+                elif self._size < self.max_size:
+                    self._size += 1
+                    open_new = True
+                else:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._timeouts += 1
+                        raise PoolTimeoutError(
+                            f"Timed out after {self.checkout_timeout}s waiting for a database connection"
+                        )
+                    waited = True
+                    self._cond.wait(remaining)
+                    continue
+
+            if open_new:
+                try:
+                    conn = self._connect()
+                except Exception:
+                    with self._cond:
+                        self._size -= 1
+                        self._cond.notify()
+                    raise
+                self._record_checkout(started, waited)
+                return conn
+
+            conn, returned_at = candidate
+            if self._is_healthy(conn, time.monotonic() - returned_at):
+                self._record_checkout(started, waited)
+                return conn
+
+            with self._cond:
+                self._health_check_failures += 1
+                self._discard(conn)
+
+    def _record_checkout(self, started: float, waited: bool) -> None:
+        wait_time = time.monotonic() - started
+        with self._cond:
+            self._checkouts += 1
+            if waited:
+                self._waits += 1
+            self._wait_time_total += wait_time
+            self._wait_time_max = max(self._wait_time_max, wait_time)
+
+    def putconn(self, conn: psycopg2.extensions.connection, discard: bool = False) -> None:
+        """Return a connection to the pool."""
+        if not discard and not conn.closed:
+            # Never hand out a connection that is still inside a transaction
+            try:
+                if conn.get_transaction_status() != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+            except Exception:
+                discard = True
+
+        with self._cond:
+            if discard or conn.closed or self._closed:
+                self._discard(conn)
+                return
+            self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    def close(self) -> None:
+        """Close all idle connections and refuse further checkouts."""
+        with self._cond:
+            self._closed = True
+            while self._idle:
+                conn, _ = self._idle.popleft()
+                self._discard(conn)
+            self._cond.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return pool size and checkout/wait metrics."""
+        with self._cond:
+            return {
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": self._size - len(self._idle),
+                "checkouts": self._checkouts,
+                "waits": self._waits,
+                "timeouts": self._timeouts,
+                "wait_time_total_ms": round(self._wait_time_total * 1000, 3),
+                "wait_time_avg_ms": round(self._wait_time_total * 1000 / self._checkouts, 3) if self._checkouts else 0.0,
+                "wait_time_max_ms": round(self._wait_time_max * 1000, 3),
+                "connections_opened": self._connections_opened,
+                "connections_closed": self._connections_closed,
+                "health_check_failures": self._health_check_failures,
+            }
+
+
 class Database:
     """Database connection manager for PostgreSQL with pgvector support."""
 
-    def __init__(self, connection_string: str):
+    def __init__(
+        self,
+        connection_string: str,
+        min_size: int = 1,
+        max_size: int = 10,
+        idle_timeout: float = 300.0,
+        checkout_timeout: float = 30.0,
+        health_check_after: float = 30.0
+    ):
         self.connection_string = connection_string
+        self.pool = ConnectionPool(
+            connection_string,
+            min_size=min_size,
+            max_size=max_size,
+            idle_timeout=idle_timeout,
+            checkout_timeout=checkout_timeout,
+            health_check_after=health_check_after
+        )
 
     @contextmanager
     def get_connection(self) -> Generator[psycopg2.extensions.connection, None, None]:
-        """Context manager for database connections."""
-        conn = None
+        """Context manager for pooled database connections."""
+        conn = self.pool.getconn()
+        discard = False
         try:
-            conn = psycopg2.connect(self.connection_string)
             yield conn
             conn.commit()
         except Exception as e:
-            if conn:
+            try:
                 conn.rollback()
+            except Exception:
+                discard = True
             raise e
         finally:
-            if conn:
-                conn.close()
+            self.pool.putconn(conn, discard=discard or bool(conn.closed))
 
     @contextmanager
     def get_cursor(self, cursor_factory=RealDictCursor) -> Generator[psycopg2.extensions.cursor, None, None]:
@@ -37,6 +256,21 @@ class Database:
             finally:
                 cursor.close()
 
+    def pool_stats(self) -> Dict[str, Any]:
+        """Return connection pool metrics."""
+        return self.pool.stats()
+
+    def close(self) -> None:
+        """Close all pooled connections."""
+        self.pool.close()
+
 
 # Global database instance
-db = Database(settings.database_url)
+db = Database(
+    settings.database_url,
+    min_size=settings.db_pool_min_size,
+    max_size=settings.db_pool_max_size,
+    idle_timeout=settings.db_pool_idle_timeout,
+    checkout_timeout=settings.db_pool_checkout_timeout,
+    health_check_after=settings.db_pool_health_check_after
+)
@@ -94,4 +94,7 @@ CREATE TABLE settings (
 CREATE INDEX idx_articles_date_written ON articles(date_written DESC);
 CREATE INDEX idx_articles_category ON articles(category_id);
 CREATE INDEX idx_feedback_user ON feedback(user_id);
-CREATE INDEX idx_articles_vector ON articles USING ivfflat (vector vector_cosine_ops);
+-- HNSW builds a usable graph on an empty table, unlike IVFFlat whose list
+-- centroids are computed from the rows present at build time. Rebuild with
+-- parameters tuned to the row count via `python vector_index.py build`.
+CREATE INDEX idx_articles_vector ON articles USING hnsw (vector vector_cosine_ops) WITH (m = 16, ef_construction = 64);
@@ -0,0 +1,3 @@
+-- Replace the IVFFlat index built on an empty table with HNSW
+DROP INDEX IF EXISTS idx_articles_vector;
+CREATE INDEX idx_articles_vector ON articles USING hnsw (vector vector_cosine_ops) WITH (m = 16, ef_construction = 64);
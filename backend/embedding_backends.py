@@ -0,0 +1,211 @@
+"""
+Pluggable embedding backends
+
+Both backends expose the FlagEmbedding interface used by the rest of the app
+(encode / encode_queries returning L2-normalized float32 arrays), so callers
+such as ArticleService never know which one is loaded. The backend is chosen
+with EMBEDDING_BACKEND:
+
+    flag  FlagEmbedding (PyTorch) BGE, the reference implementation
+    onnx  ONNX Runtime BGE, int8 dynamically quantized for CPU-only nodes
+
+Export a quantized model for the onnx backend once with:
+    python embedding_backends.py export --output-dir models/bge-base-en-v1.5-onnx-int8
+"""
+import argparse
+import os
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+QUERY_INSTRUCTION = "Represent this sentence for searching relevant passages:"
+BACKENDS = ("flag", "onnx")
+
+
+class OnnxEmbeddingModel:
+    """BGE encoder running on ONNX Runtime with CLS pooling, matching FlagEmbedding's output."""
+
+    def __init__(
+        self,
+        model_dir: str,
+        model_file: str = "model_quantized.onnx",
+        intra_op_threads: int = 0,
+        max_length: int = 512,
+        batch_size: int = 32,
+        query_instruction: str = QUERY_INSTRUCTION
+    ):
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+
+        model_path = os.path.join(model_dir, model_file)
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(
+                f"ONNX model not found at {model_path}; "
+                "run `python embedding_backends.py export` first"
+            )
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        if intra_op_threads > 0:
+            options.intra_op_num_threads = intra_op_threads
+        options.inter_op_num_threads = 1
+
+        self.session = ort.InferenceSession(model_path, sess_options=options, providers=["CPUExecutionProvider"])
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        self.input_names = {i.name for i in self.session.get_inputs()}
+        self.max_length = max_length
+        self.batch_size = batch_size
+        self.query_instruction = query_instruction
+
+    def _encode_batch(self, texts: List[str]) -> np.ndarray:
+        tokens = self.tokenizer(
+            texts,
+            padding=True,
+            truncation=True,
+            max_length=self.max_length,
+            return_tensors="np"
+        )
+        inputs = {name: tokens[name].astype(np.int64) for name in self.input_names if name in tokens}
+        last_hidden_state = self.session.run(None, inputs)[0]
+
+        # BGE uses the [CLS] token as the sentence embedding
+        embeddings = last_hidden_state[:, 0].astype(np.float32)
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        return embeddings / np.maximum(norms, 1e-12)
+
+    def encode(self, sentences: Sequence[str], batch_size: Optional[int] = None, **kwargs) -> np.ndarray:
+        """Encode passages."""
+        if isinstance(sentences, str):
+            return self.encode([sentences], batch_size=batch_size)[0]
+
+        batch_size = batch_size or self.batch_size
+        # Sort by length so each batch pads to similar lengths, then restore order
+        order = sorted(range(len(sentences)), key=lambda i: len(sentences[i]), reverse=True)
+        results: List[Optional[np.ndarray]] = [None] * len(sentences)
+        for start in range(0, len(order), batch_size):
+            indices = order[start:start + batch_size]
+            batch = self._encode_batch([sentences[i] for i in indices])
+            for i, embedding in zip(indices, batch):
+                results[i] = embedding
+        return np.stack(results) if results else np.empty((0, 0), dtype=np.float32)
+
+    def encode_queries(self, queries: Sequence[str], batch_size: Optional[int] = None, **kwargs) -> np.ndarray:
+        """Encode search queries with the BGE retrieval instruction."""
+        if isinstance(queries, str):
+            return self.encode_queries([queries], batch_size=batch_size)[0]
+        return self.encode([f"{self.query_instruction}{q}" for q in queries], batch_size=batch_size)
+
+
+def load_flag_model(model_id: str, use_fp16: bool = True):
+    """Load the reference FlagEmbedding model."""
+    from FlagEmbedding import FlagAutoModel
+
+    return FlagAutoModel.from_finetuned(
+        model_id,
+        query_instruction_for_retrieval=QUERY_INSTRUCTION,
+        use_fp16=use_fp16
+    )
+
+
+def load_backend(
+    backend: str,
+    model_id: str,
+    onnx_model_dir: Optional[str] = None,
+    onnx_model_file: str = "model_quantized.onnx",
+    intra_op_threads: int = 0
+):
+    """
+    Load an embedding backend by name
+
+    Args:
+        backend: "flag" or "onnx"
+        model_id: Hugging Face model id for the flag backend
+        onnx_model_dir: Directory with the exported ONNX model and tokenizer
+        onnx_model_file: ONNX file inside onnx_model_dir
+        intra_op_threads: ONNX Runtime intra-op threads (0 = runtime default)
+
+    Returns:
+        Model exposing encode() and encode_queries()
+    """
+    if backend == "flag":
+        return load_flag_model(model_id)
+    if backend == "onnx":
+        if not onnx_model_dir:
+            raise ValueError("onnx backend requires ONNX_MODEL_DIR")
+        return OnnxEmbeddingModel(
+            onnx_model_dir,
+            model_file=onnx_model_file,
+            intra_op_threads=intra_op_threads
+        )
+    raise ValueError(f"Unknown embedding backend {backend!r}; expected one of {BACKENDS}")
+
+
+def export_onnx(model_id: str, output_dir: str, quantize: bool = True, opset: int = 17) -> str:
+    """
+    Export a Hugging Face BGE model to ONNX and optionally int8-quantize it
+
+    Args:
+        model_id: Hugging Face model id
+        output_dir: Directory for model.onnx, model_quantized.onnx and the tokenizer
+        quantize: Also write a dynamically int8-quantized copy
+        opset: ONNX opset version
+
+    Returns:
+        Path to the model the onnx backend should load
+    """
+    import torch
+    from transformers import AutoModel, AutoTokenizer
+
+    os.makedirs(output_dir, exist_ok=True)
+
+    tokenizer = AutoTokenizer.from_pretrained(model_id)
+    model = AutoModel.from_pretrained(model_id)
+    model.eval()
+    tokenizer.save_pretrained(output_dir)
+
+    sample = tokenizer(["export sample"], return_tensors="pt")
+    input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in sample]
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["last_hidden_state"] = {0: "batch", 1: "sequence"}
+
+    fp32_path = os.path.join(output_dir, "model.onnx")
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            tuple(sample[name] for name in input_names),
+            fp32_path,
+            input_names=input_names,
+            output_names=["last_hidden_state"],
+            dynamic_axes=dynamic_axes,
+            opset_version=opset
+        )
+
+    if not quantize:
+        return fp32_path
+
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    quantized_path = os.path.join(output_dir, "model_quantized.onnx")
+    quantize_dynamic(fp32_path, quantized_path, weight_type=QuantType.QInt8)
+    return quantized_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = subparsers.add_parser("export", help="Export BGE to ONNX and quantize to int8")
+    export_parser.add_argument("--model-id", default="BAAI/bge-base-en-v1.5")
+    export_parser.add_argument("--output-dir", default="models/bge-base-en-v1.5-onnx-int8")
+    export_parser.add_argument("--no-quantize", action="store_true")
+
+    args = parser.parse_args()
+
+    if args.command == "export":
+        path = export_onnx(args.model_id, args.output_dir, quantize=not args.no_quantize)
+        print(f"✓ Exported {args.model_id} to {path}")
+
+
+if __name__ == "__main__":
+    main()
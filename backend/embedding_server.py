@@ -0,0 +1,302 @@
+"""
+Shared embedding server
+
+Runs the BGE model in one local process (or a small pool of processes pinned
+to cores) and serves encode requests over Unix sockets, so uvicorn workers
+do not each load their own copy of the model. Set EMBEDDING_SERVER_SOCKET
+(and EMBEDDING_SERVER_WORKERS when running a pool) in the API's environment
+and embeddings.get_model() returns a RemoteEmbeddingModel client instead of
+loading the model in-process.
+
+Query encodes from every connected API worker go through one micro-batcher
+per server process, so concurrent searches across workers share forward
+passes.
+
+Connections are authenticated with EMBEDDING_SERVER_AUTHKEY, or, when it is
+unset, with a random key the server writes to <socket>.key (mode 0600) for
+clients running as the same user. Sockets are created with mode 0600 as well:
+the protocol pickles requests, so anyone who can connect can run code in the
+server.
+
+Usage:
+    python embedding_server.py --socket /tmp/audiobot-embed.sock
+    python embedding_server.py --socket /tmp/audiobot-embed.sock --workers 2 --cpus 0-7
+"""
+import argparse
+import itertools
+import logging
+import multiprocessing
+import os
+import secrets
+import signal
+import threading
+from multiprocessing.connection import Client, Connection, Listener
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def worker_socket_paths(socket_path: str, workers: int) -> List[str]:
+    """Socket path for each server process in a pool."""
+    if workers <= 1:
+        return [socket_path]
+    return [f"{socket_path}.{i}" for i in range(workers)]
+
+
+def parse_cpus(spec: Optional[str]) -> Optional[List[int]]:
+    """Parse a CPU list such as "0-3,6,8-9"."""
+    if not spec:
+        return None
+    cpus: List[int] = []
+    for part in spec.split(","):
+        if "-" in part:
+            start, end = part.split("-")
+            cpus.extend(range(int(start), int(end) + 1))
+        else:
+            cpus.append(int(part))
+    return cpus
+
+
+class EmbeddingServerError(Exception):
+    """Raised by the client when the server reports a failure."""
+
+
+def authkey_path(socket_path: str) -> str:
+    """File holding the generated key for a server (shared by every socket of a pool)."""
+    return f"{socket_path}.key"
+
+
+def create_authkey(socket_path: str, configured: Optional[str] = None) -> bytes:
+    """The configured key, or a new random key written to authkey_path with mode 0600."""
+    if configured:
+        return configured.encode("utf-8")
+
+    key = secrets.token_bytes(32)
+    path = authkey_path(socket_path)
+    if os.path.exists(path):
+        os.remove(path)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "wb") as f:
+        f.write(key)
+    return key
+
+
+def read_authkey(socket_path: str, configured: Optional[str] = None) -> bytes:
+    """The configured key, or the key the server generated for socket_path."""
+    if configured:
+        return configured.encode("utf-8")
+
+    try:
+        with open(authkey_path(socket_path), "rb") as f:
+            return f.read()
+    except FileNotFoundError:
+        raise EmbeddingServerError(
+            f"No key at {authkey_path(socket_path)}: start embedding_server.py first "
+            "or set EMBEDDING_SERVER_AUTHKEY"
+        )
+
+
+class RemoteEmbeddingModel:
+    """
+    Client for the embedding server with the same interface as the in-process model
+
+    Each thread keeps its own connection per server socket, and requests are
+    spread round-robin across the sockets of a server pool.
+    """
+
+    def __init__(
+        self,
+        socket_path: str,
+        workers: int = 1,
+        authkey: Optional[bytes] = None,
+        timeout: float = 30.0
+    ):
+        self.socket_paths = worker_socket_paths(socket_path, workers)
+        self.authkey = authkey if authkey is not None else read_authkey(socket_path)
+        self.timeout = timeout
+        self._local = threading.local()
+        self._next_socket = itertools.cycle(range(len(self.socket_paths)))
+        self._cycle_lock = threading.Lock()
+
+    def _connection(self, index: int) -> Connection:
+        connections: Dict[int, Connection] = getattr(self._local, "connections", None)
+        if connections is None:
+            connections = self._local.connections = {}
+        conn = connections.get(index)
+        if conn is None or conn.closed:
+            conn = Client(self.socket_paths[index], family="AF_UNIX", authkey=self.authkey)
+            connections[index] = conn
+        return conn
+
+    def _drop_connection(self, index: int) -> None:
+        conn = getattr(self._local, "connections", {}).pop(index, None)
+        if conn is not None:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+    def _request(self, op: str, texts: Sequence[str]) -> Any:
+        with self._cycle_lock:
+            index = next(self._next_socket)
+
+        # One retry covers a server restart that closed our pooled connection
+        for attempt in range(2):
+            try:
+                conn = self._connection(index)
+                conn.send({"op": op, "texts": list(texts)})
+                if not conn.poll(self.timeout):
+                    self._drop_connection(index)
+                    raise EmbeddingServerError(f"Embedding server did not answer within {self.timeout}s")
+                response = conn.recv()
+                break
+            except (EOFError, ConnectionError, OSError):
+                self._drop_connection(index)
+                if attempt == 1:
+                    raise
+
+        if not response.get("ok"):
+            raise EmbeddingServerError(response.get("error", "unknown error"))
+        return response["result"]
+
+    def encode_queries(self, queries: Sequence[str], **kwargs) -> np.ndarray:
+        """Encode search queries (with the retrieval instruction)."""
+        return self._request("encode_queries", queries)
+
+    def encode(self, sentences: Sequence[str], **kwargs) -> np.ndarray:
+        """Encode passages."""
+        return self._request("encode", sentences)
+
+    def ping(self) -> bool:
+        return self._request("ping", []) == "pong"
+
+
+def _handle_connection(conn: Connection, model, query_batcher) -> None:
+    with conn:
+        while True:
+            try:
+                request = conn.recv()
+            except (EOFError, ConnectionError, OSError):
+                return
+
+            try:
+                op = request.get("op")
+                if op == "encode_queries":
+                    result = query_batcher.encode_many(request["texts"]) if request["texts"] else np.empty((0,))
+                elif op == "encode":
+                    result = model.encode(request["texts"])
+                elif op == "ping":
+                    result = "pong"
+                else:
+                    raise ValueError(f"Unknown op {op!r}")
+                response = {"ok": True, "result": result}
+            except Exception as e:
+                logger.error(f"Embedding request failed: {e}")
+                response = {"ok": False, "error": str(e)}
+
+            try:
+                conn.send(response)
+            except (ConnectionError, OSError):
+                return
+
+
+def listen(socket_path: str, authkey: bytes) -> Listener:
+    """Listen on a Unix socket that only the current user can connect to."""
+    if os.path.exists(socket_path):
+        os.remove(socket_path)
+
+    # Create the socket owner-only from the start (chmod after bind would leave a window)
+    umask = os.umask(0o177)
+    try:
+        return Listener(socket_path, family="AF_UNIX", authkey=authkey)
+    finally:
+        os.umask(umask)
+
+
+def serve(socket_path: str, authkey: bytes, cpus: Optional[List[int]] = None) -> None:
+    """Load the model and serve encode requests on one Unix socket."""
+    if cpus:
+        os.sched_setaffinity(0, cpus)
+
+    from config import settings
+    from embeddings import load_local_model
+    from query_batcher import QueryBatcher
+
+    if cpus and settings.embedding_backend == "flag":
+        import torch
+        torch.set_num_threads(len(cpus))
+
+    logger.info(f"Loading embedding model for {socket_path} (cpus={cpus or 'all'})...")
+    model = load_local_model()
+    query_batcher = QueryBatcher(
+        lambda texts: model.encode_queries(texts),
+        max_batch_size=settings.query_batch_max_size,
+        max_wait_ms=settings.query_batch_max_wait_ms
+    )
+
+    listener = listen(socket_path, authkey)
+    logger.info(f"✓ Embedding server listening on {socket_path}")
+
+    try:
+        while True:
+            try:
+                conn = listener.accept()
+            except (multiprocessing.AuthenticationError, OSError) as e:
+                logger.warning(f"Rejected connection: {e}")
+                continue
+            threading.Thread(
+                target=_handle_connection,
+                args=(conn, model, query_batcher),
+                daemon=True
+            ).start()
+    finally:
+        listener.close()
+        query_batcher.close()
+
+
+def main():
+    from config import settings
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--socket", default=settings.embedding_server_socket or "/tmp/audiobot-embed.sock")
+    parser.add_argument("--workers", type=int, default=settings.embedding_server_workers)
+    parser.add_argument("--cpus", help="CPUs to pin to, split evenly across workers (e.g. 0-7)")
+    args = parser.parse_args()
+
+    authkey = create_authkey(args.socket, settings.embedding_server_authkey)
+    paths = worker_socket_paths(args.socket, args.workers)
+    cpus = parse_cpus(args.cpus)
+
+    if args.workers <= 1:
+        serve(paths[0], authkey, cpus)
+        return
+
+    cpu_slices: List[Optional[List[int]]] = [None] * args.workers
+    if cpus:
+        per_worker = max(1, len(cpus) // args.workers)
+        cpu_slices = [cpus[i * per_worker:(i + 1) * per_worker] or None for i in range(args.workers)]
+
+    context = multiprocessing.get_context("spawn")
+    processes = [
+        context.Process(target=serve, args=(path, authkey, cpu_slice), name=f"embedding-server-{i}")
+        for i, (path, cpu_slice) in enumerate(zip(paths, cpu_slices))
+    ]
+    for process in processes:
+        process.start()
+
+    def shutdown(signum, frame):
+        for process in processes:
+            process.terminate()
+
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+
+    for process in processes:
+        process.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,318 @@
+"""
+Memory-mapped snapshot of article embeddings for exact in-memory top-k search
+
+The snapshot keeps every article vector, L2-normalized, in a float32 (or
+float16) matrix backed by a file on disk, alongside the matching article ids.
+Cosine similarity against a query is then a single matrix-vector product,
+and top-k selection uses argpartition instead of a full sort, so a query
+never has to pull every row over the wire from Postgres.
+
+The snapshot is refreshed incrementally by article id: rows with an id above
+the last one seen are fetched in id order, and the last refresh_overlap ids
+below it are re-checked for rows that were missing, since a long transaction
+can commit a row after rows with higher ids were already read. Vectors that
+change in place, rows committed more than refresh_overlap ids late and rows
+that are deleted are only picked up by rebuild().
+
+Layout of the snapshot directory:
+    vectors.bin   raw (capacity, dim) matrix
+    ids.bin       raw (capacity,) int64 article ids
+    meta.json     dim, dtype, count, capacity and the refresh watermark (last id)
+"""
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+SUPPORTED_DTYPES = ("float32", "float16")
+
+
+def _to_array(value: Any) -> np.ndarray:
+    """Convert a pgvector value (array, list or '[1,2,3]' string) to float32."""
+    if isinstance(value, str):
+        return np.array(value.strip("[]").split(","), dtype=np.float32)
+    return np.asarray(value, dtype=np.float32)
+
+
+class EmbeddingSnapshot:
+    """Exact cosine top-k search over a memory-mapped embedding matrix."""
+
+    def __init__(
+        self,
+        directory: str,
+        dim: int = 1536,
+        dtype: str = "float32",
+        initial_capacity: int = 1024,
+        refresh_overlap: int = 10_000
+    ):
+        if dtype not in SUPPORTED_DTYPES:
+            raise ValueError(f"dtype must be one of {SUPPORTED_DTYPES}, got {dtype!r}")
+
+        self.directory = directory
+        self.dim = dim
+        self.dtype = dtype
+        self.initial_capacity = initial_capacity
+        self.refresh_overlap = refresh_overlap
+
+        self._lock = threading.RLock()
+        self._vectors: Optional[np.memmap] = None
+        self._ids: Optional[np.memmap] = None
+        self._id_to_row: Dict[int, int] = {}
+        self._count = 0
+        self._capacity = 0
+        self._watermark_id = 0
+
+        os.makedirs(directory, exist_ok=True)
+        self._load()
+
+    # ------------------------------------------------------------------
+    # Files
+    # ------------------------------------------------------------------
+
+    @property
+    def _meta_path(self) -> str:
+        return os.path.join(self.directory, "meta.json")
+
+    @property
+    def _vectors_path(self) -> str:
+        return os.path.join(self.directory, "vectors.bin")
+
+    @property
+    def _ids_path(self) -> str:
+        return os.path.join(self.directory, "ids.bin")
+
+    def _open_arrays(self, capacity: int, mode: str) -> None:
+        self._vectors = np.memmap(self._vectors_path, dtype=self.dtype, mode=mode, shape=(capacity, self.dim))
+        self._ids = np.memmap(self._ids_path, dtype=np.int64, mode=mode, shape=(capacity,))
+        self._capacity = capacity
+
+    def _load(self) -> None:
+        """Open an existing snapshot, or create an empty one."""
+        if not os.path.exists(self._meta_path):
+            self._open_arrays(self.initial_capacity, "w+")
+            self._count = 0
+            self._write_meta()
+            return
+
+        with open(self._meta_path) as f:
+            meta = json.load(f)
+
+        if meta["dim"] != self.dim or meta["dtype"] != self.dtype:
+            raise ValueError(
+                f"Snapshot in {self.directory} has dim={meta['dim']} dtype={meta['dtype']}, "
+                f"expected dim={self.dim} dtype={self.dtype}; call rebuild() or use another directory"
+            )
+
+        self._open_arrays(meta["capacity"], "r+")
+        self._count = meta["count"]
+        self._watermark_id = meta.get("watermark_id", 0)
+        self._id_to_row = {int(article_id): row for row, article_id in enumerate(self._ids[:self._count])}
+
+    def _write_meta(self) -> None:
+        """Flush arrays, then atomically publish the new count and watermark."""
+        self._vectors.flush()
+        self._ids.flush()
+
+        meta = {
+            "dim": self.dim,
+            "dtype": self.dtype,
+            "count": self._count,
+            "capacity": self._capacity,
+            "watermark_id": self._watermark_id,
+        }
+        tmp_path = self._meta_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, self._meta_path)
+
+    def _grow(self, needed: int) -> None:
+        """Grow the backing files so at least `needed` rows fit."""
+        new_capacity = max(self._capacity * 2, needed, self.initial_capacity)
+        old_vectors = np.array(self._vectors[:self._count])
+        old_ids = np.array(self._ids[:self._count])
+
+        # Drop the old maps before resizing the files underneath them
+        self._vectors = None
+        self._ids = None
+
+        self._open_arrays(new_capacity, "w+")
+        self._vectors[:self._count] = old_vectors
+        self._ids[:self._count] = old_ids
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def upsert(self, article_ids: Sequence[int], vectors: Sequence[Any]) -> int:
+        """
+        Insert or overwrite vectors for the given article ids
+
+        Args:
+            article_ids: Article ids
+            vectors: One embedding per id
+
+        Returns:
+            Number of vectors written (zero-norm vectors are skipped)
+        """
+        if not article_ids:
+            return 0
+
+        matrix = np.stack([_to_array(v) for v in vectors])
+        if matrix.shape[1] != self.dim:
+            raise ValueError(f"Expected {self.dim}-dimensional vectors, got {matrix.shape[1]}")
+
+        norms = np.linalg.norm(matrix, axis=1)
+        valid = norms > 0
+        matrix = (matrix[valid] / norms[valid, None]).astype(self.dtype)
+        article_ids = [int(a) for a, ok in zip(article_ids, valid) if ok]
+
+        with self._lock:
+            new_ids = [a for a in dict.fromkeys(article_ids) if a not in self._id_to_row]
+            if self._count + len(new_ids) > self._capacity:
+                self._grow(self._count + len(new_ids))
+
+            for article_id, vector in zip(article_ids, matrix):
+                row = self._id_to_row.get(article_id)
+                if row is None:
+                    row = self._count
+                    self._id_to_row[article_id] = row
+                    self._ids[row] = article_id
+                    self._count += 1
+                self._vectors[row] = vector
+
+        return len(article_ids)
+
+    def refresh(self, cursor, batch_size: int = 5000) -> int:
+        """
+        Fetch articles added since the last refresh and add them to the snapshot
+
+        New rows are paged by id (WHERE id > last ORDER BY id LIMIT
+        batch_size). Ids in the overlap window below the watermark that have a
+        vector but are not in the snapshot are fetched as well; they belong to
+        transactions that committed after the last refresh read past them.
+
+        Args:
+            cursor: psycopg2 RealDictCursor
+            batch_size: Rows fetched per round trip
+
+        Returns:
+            Number of vectors added or updated
+        """
+        with self._lock:
+            written = 0
+
+            if self._watermark_id > 0:
+                cursor.execute("""
+                    SELECT id
+                    FROM articles
+                    WHERE vector IS NOT NULL AND id > %s AND id <= %s
+                """, (max(0, self._watermark_id - self.refresh_overlap), self._watermark_id))
+                missing = [row["id"] for row in cursor.fetchall() if int(row["id"]) not in self._id_to_row]
+
+                for start in range(0, len(missing), batch_size):
+                    cursor.execute(
+                        "SELECT id, vector FROM articles WHERE id = ANY(%s)",
+                        (missing[start:start + batch_size],)
+                    )
+                    rows = cursor.fetchall()
+                    written += self.upsert([row["id"] for row in rows], [row["vector"] for row in rows])
+
+            while True:
+                cursor.execute("""
+                    SELECT id, vector
+                    FROM articles
+                    WHERE vector IS NOT NULL AND id > %s
+                    ORDER BY id
+                    LIMIT %s
+                """, (self._watermark_id, batch_size))
+                rows = cursor.fetchall()
+                if not rows:
+                    break
+
+                written += self.upsert([row["id"] for row in rows], [row["vector"] for row in rows])
+                self._watermark_id = int(rows[-1]["id"])
+
+            self._write_meta()
+            return written
+
+    def rebuild(self, cursor, batch_size: int = 5000) -> int:
+        """Discard the snapshot and reload every vector from Postgres."""
+        with self._lock:
+            self._vectors = None
+            self._ids = None
+            self._id_to_row = {}
+            self._count = 0
+            self._watermark_id = 0
+            self._open_arrays(self.initial_capacity, "w+")
+            return self.refresh(cursor, batch_size=batch_size)
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return self._count
+
+    def search(
+        self,
+        query_vector: Sequence[float],
+        top_k: int = 10,
+        candidate_ids: Optional[Sequence[int]] = None
+    ) -> List[Tuple[int, float]]:
+        """
+        Exact cosine top-k search
+
+        Args:
+            query_vector: Query embedding
+            top_k: Number of results to return
+            candidate_ids: Optional subset of article ids to search within
+
+        Returns:
+            List of (article_id, cosine_similarity), most similar first
+        """
+        query = _to_array(query_vector)
+        norm = np.linalg.norm(query)
+        if norm == 0:
+            return []
+        query = query / norm
+
+        with self._lock:
+            if self._count == 0 or top_k <= 0:
+                return []
+
+            if candidate_ids is not None:
+                rows = np.array(
+                    [self._id_to_row[int(a)] for a in candidate_ids if int(a) in self._id_to_row],
+                    dtype=np.int64
+                )
+                if rows.size == 0:
+                    return []
+                scores = self._vectors[rows] @ query
+            else:
+                rows = None
+                scores = self._vectors[:self._count] @ query
+
+            scores = scores.astype(np.float32)
+            k = min(top_k, scores.shape[0])
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+
+            if rows is not None:
+                top_rows = rows[top]
+            else:
+                top_rows = top
+
+            return [(int(self._ids[row]), float(score)) for row, score in zip(top_rows, scores[top])]
+
+    def stats(self) -> Dict[str, Any]:
+        """Return snapshot size and watermark."""
+        return {
+            "count": self._count,
+            "capacity": self._capacity,
+            "dim": self.dim,
+            "dtype": self.dtype,
+            "bytes": self._capacity * self.dim * np.dtype(self.dtype).itemsize,
+            "watermark_id": self._watermark_id,
+        }
@@ -1,17 +1,96 @@
-from FlagEmbedding import FlagAutoModel
+import threading
 
-model = FlagAutoModel.from_finetuned('BAAI/bge-base-en-v1.5',
-                                      query_instruction_for_retrieval="Represent this sentence for searching relevant passages:",
-                                      use_fp16=True)
+import numpy as np
 
+from config import settings
+from query_batcher import QueryBatcher
+from query_cache import QueryEmbeddingCache
+from startup_profile import startup_profile
 
-sentences_1 = ["I love NLP"]
-sentences_2 = ["I love BGE"]
-embeddings_1 = model.encode(sentences_1)
-embeddings_2 = model.encode(sentences_2)
+MODEL_ID = 'BAAI/bge-base-en-v1.5'
 
-print(embeddings_1.shape)
-print(embeddings_1@embeddings_2.T)
+# Backends produce slightly different vectors, so cache entries are kept apart
+CACHE_MODEL_ID = f"{MODEL_ID}:{settings.embedding_backend}"
+
+_model = None
+_model_lock = threading.Lock()
+
+
+def load_local_model():
+    """Load the configured embedding backend (FlagEmbedding or ONNX int8) into this process."""
+    from embedding_backends import load_backend
+
+    return load_backend(
+        settings.embedding_backend,
+        MODEL_ID,
+        onnx_model_dir=settings.onnx_model_dir,
+        onnx_model_file=settings.onnx_model_file,
+        intra_op_threads=settings.onnx_intra_op_threads
+    )
+
+
+def get_model():
+    """
+    Get or load the embedding model singleton
+
+    The model (and torch) are only imported on first use, so importing this
+    module is cheap. Loading is guarded by a lock so concurrent first callers
+    load it once. When EMBEDDING_SERVER_SOCKET is set, a client for the shared
+    embedding server is returned instead, with the same encode/encode_queries
+    interface.
+
+    Returns:
+        FlagEmbedding model or RemoteEmbeddingModel instance
+    """
+    global _model
+
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                with startup_profile.phase("embeddings.load_model"):
+                    if settings.embedding_server_socket:
+                        from embedding_server import RemoteEmbeddingModel, read_authkey
+
+                        _model = RemoteEmbeddingModel(
+                            settings.embedding_server_socket,
+                            workers=settings.embedding_server_workers,
+                            authkey=read_authkey(settings.embedding_server_socket, settings.embedding_server_authkey)
+                        )
+                    else:
+                        _model = load_local_model()
+
+    return _model
+
+
+def is_model_loaded() -> bool:
+    return _model is not None
+
+
+# Cache of query embeddings so hot queries skip BGE inference entirely
+query_cache = QueryEmbeddingCache(
+    max_entries=settings.query_cache_max_entries,
+    ttl_seconds=settings.query_cache_ttl_seconds,
+    disk_path=settings.query_cache_disk_path
+)
+
+# Gathers concurrent query encodes into one batched forward pass
+query_batcher = QueryBatcher(
+    lambda texts: get_model().encode_queries(texts),
+    max_batch_size=settings.query_batch_max_size,
+    max_wait_ms=settings.query_batch_max_wait_ms
+)
+
+
+def encode_query(query_text: str) -> np.ndarray:
+    """Encode a search query, reusing a cached embedding when available."""
+    return query_cache.get_or_compute(CACHE_MODEL_ID, query_text, query_batcher.encode)
+
+
+def warmup() -> None:
+    """Load the model and run one forward pass so the first request is not slow."""
+    get_model()
+    with startup_profile.phase("embeddings.first_encode"):
+        get_model().encode_queries(["warmup"])
 
 # from openai import OpenAI
 # import pandas as pd
@@ -1,25 +1,42 @@
-from fastapi import FastAPI, HTTPException, status
-from fastapi.responses import FileResponse
-from fastapi.middleware.cors import CORSMiddleware
-from typing import List
+from startup_profile import startup_profile
+
+with startup_profile.phase("import.fastapi"):
+    from fastapi import FastAPI, HTTPException, status
+    from fastapi.responses import FileResponse, JSONResponse
+    from fastapi.middleware.cors import CORSMiddleware
+from typing import List, Set
+import asyncio
+import logging
 import os
 
-from models import (
-    ArticleResponse,
-    GeneratePodcastRequest,
-    GeneratePodcastFromArticlesRequest,
-    GeneratePodcastFromCategoriesRequest,
-    GenerateAudioFromTextRequest,
-    SearchArticlesRequest,
-    PodcastResponse,
-    VoicesResponse,
-    VoiceInfo
-)
-from services.article_service import ArticleService
-from services.tts_service import tts_service
-from services.s3_service import s3_service
-from services.podcast_service import podcast_service
-from config import settings
+with startup_profile.phase("import.config"):
+    from config import settings
+with startup_profile.phase("import.models"):
+    from models import (
+        ArticleResponse,
+        GeneratePodcastRequest,
+        GeneratePodcastFromArticlesRequest,
+        GeneratePodcastFromCategoriesRequest,
+        GenerateAudioFromTextRequest,
+        SearchArticlesRequest,
+        PodcastResponse,
+        VoicesResponse,
+        VoiceInfo
+    )
+with startup_profile.phase("import.services"):
+    from services.async_article_service import AsyncArticleService
+    from services.async_tts_service import async_tts_service
+    from services.async_s3_service import async_s3_service
+    from services.async_podcast_service import async_podcast_service
+    from services.concurrency import BulkheadFullError, bulkhead_stats
+with startup_profile.phase("import.database"):
+    from async_database import async_db
+    from database import db
+with startup_profile.phase("import.embeddings"):
+    import embeddings
+    from embeddings import query_batcher, query_cache
+
+logger = logging.getLogger(__name__)
 
 app = FastAPI(
     title="Audiobot API",
@@ -37,9 +54,72 @@ app.add_middleware(
 )
 
 
+# Strong references to fire-and-forget tasks; the event loop only keeps weak ones
+_background_tasks: Set[asyncio.Task] = set()
+
+# Serializes warmup runs; set once a run succeeds so later calls return at once
+_warmup_lock = asyncio.Lock()
+_warmed_up = False
+
+
+def warmup() -> None:
+    """
+    Load the embedding model and build upstream clients ahead of the first request.
+
+    Safe to call more than once; every step is a no-op after the first run.
+    """
+    embeddings.warmup()
+    async_tts_service.client
+    async_s3_service.s3_client
+
+
+async def run_warmup() -> None:
+    """Run warmup off the event loop and mark the worker ready; a no-op once it has succeeded."""
+    global _warmed_up
+    async with _warmup_lock:
+        if _warmed_up:
+            return
+        try:
+            with startup_profile.phase("warmup.database"):
+                await async_db.connect()
+            with startup_profile.phase("warmup.total"):
+                await asyncio.to_thread(warmup)
+            _warmed_up = True
+            startup_profile.mark_ready()
+        except Exception:
+            logger.exception("Warmup failed; worker stays not-ready")
+
+
+@app.on_event("startup")
+async def startup_event():
+    """Start warmup in the background so liveness answers immediately."""
+    if settings.warmup_on_startup:
+        task = asyncio.create_task(run_warmup())
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+    else:
+        # Everything initializes lazily on first use
+        startup_profile.mark_ready()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Close the async database pool."""
+    await async_db.close()
+
+
+@app.exception_handler(BulkheadFullError)
+async def bulkhead_full_handler(request, exc: BulkheadFullError):
+    """Fail fast with 503 when an upstream is saturated."""
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": str(exc)}
+    )
+
+
 @app.get("/")
 async def root():
-    """Health check endpoint."""
+    """Liveness check: the process is up and serving requests."""
     return {
         "status": "healthy",
         "service": "Audiobot API",
@@ -47,14 +127,52 @@ async def root():
     }
 
 
+@app.get("/ready")
+async def ready():
+    """Readiness check: the model is loaded and upstream clients are built."""
+    if not startup_profile.ready:
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"status": "warming_up", "model_loaded": embeddings.is_model_loaded()}
+        )
+    return {"status": "ready", "model_loaded": embeddings.is_model_loaded()}
+
+
+@app.post("/warmup")
+async def trigger_warmup():
+    """Explicitly run warmup (e.g. from a deploy hook when WARMUP_ON_STARTUP is off)."""
+    await run_warmup()
+    return startup_profile.report()
+
+
+@app.get("/startup")
+async def get_startup_profile():
+    """Startup-time breakdown by import and initialization phase."""
+    return startup_profile.report()
+
+
+@app.get("/metrics")
+async def get_metrics():
+    """Runtime metrics for connection pools and caches."""
+    return {
+        "db_pool": db.pool_stats(),
+        "async_db_pool": async_db.pool_stats(),
+        "bulkheads": bulkhead_stats(),
+        "query_cache": query_cache.stats(),
+        "query_batcher": query_batcher.stats()
+    }
+
+
 @app.get("/voices", response_model=VoicesResponse)
 async def get_voices():
     """Get list of available ElevenLabs voices."""
     try:
-        voices = tts_service.get_available_voices()
+        voices = await async_tts_service.get_available_voices()
         return VoicesResponse(
             voices=[VoiceInfo(**voice) for voice in voices]
         )
+    except (HTTPException, BulkheadFullError):
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -66,12 +184,16 @@ async def get_voices():
 async def search_articles(request: SearchArticlesRequest):
     """Search articles using vector similarity."""
     try:
-        articles = ArticleService.search_articles_by_text(
+        articles = await AsyncArticleService.search_articles_by_text(
             query_text=request.query,
             limit=request.limit,
-            category_ids=request.category_ids
+            category_ids=request.category_ids,
+            ef_search=request.ef_search,
+            probes=request.probes
         )
         return [ArticleResponse(**article) for article in articles]
+    except (HTTPException, BulkheadFullError):
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -87,12 +209,14 @@ async def get_user_articles(
 ):
     """Get articles based on user preferences."""
     try:
-        articles = ArticleService.get_articles_by_user_preferences(
+        articles = await AsyncArticleService.get_articles_by_user_preferences(
             user_id=user_id,
             limit=limit,
             similarity_threshold=similarity_threshold
         )
         return [ArticleResponse(**article) for article in articles]
+    except (HTTPException, BulkheadFullError):
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -107,11 +231,13 @@ async def get_articles_by_category(
 ):
     """Get articles by category IDs."""
     try:
-        articles = ArticleService.get_articles_by_category(
+        articles = await AsyncArticleService.get_articles_by_category(
             category_ids=category_ids,
             limit=limit
         )
         return [ArticleResponse(**article) for article in articles]
+    except (HTTPException, BulkheadFullError):
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -124,7 +250,7 @@ async def generate_podcast_from_user_preferences(request: GeneratePodcastRequest
     """Generate a podcast based on user preferences."""
     try:
         # Fetch articles based on user preferences
-        articles = ArticleService.get_articles_by_user_preferences(
+        articles = await AsyncArticleService.get_articles_by_user_preferences(
             user_id=request.user_id,
             limit=request.limit,
             similarity_threshold=request.similarity_threshold
@@ -137,16 +263,16 @@ async def generate_podcast_from_user_preferences(request: GeneratePodcastRequest
             )
 
         # Generate audio from articles
-        audio_path, script = tts_service.generate_audio_from_articles(
+        audio_path, script = await async_tts_service.generate_audio_from_articles(
             articles=articles,
             voice_id=request.voice_id
         )
 
         # Upload to S3
-        s3_url = s3_service.upload_podcast(audio_path)
+        s3_url = await async_s3_service.upload_podcast(audio_path)
 
         # Save podcast record to database
-        podcast_id = podcast_service.create_podcast_record(
+        podcast_id = await async_podcast_service.create_podcast_record(
             user_id=request.user_id,
             script=script,
             s3_link=s3_url
@@ -163,7 +289,7 @@ async def generate_podcast_from_user_preferences(request: GeneratePodcastRequest
             article_count=len(articles),
             message=f"Successfully generated podcast with {len(articles)} articles"
         )
-    except HTTPException:
+    except (HTTPException, BulkheadFullError):
         raise
     except Exception as e:
         raise HTTPException(
@@ -177,7 +303,7 @@ async def generate_podcast_from_articles(request: GeneratePodcastFromArticlesReq
     """Generate a podcast from specific article IDs."""
     try:
         # Fetch articles by IDs
-        articles = ArticleService.get_articles_by_ids(
+        articles = await AsyncArticleService.get_articles_by_ids(
             article_ids=request.article_ids
         )
 
@@ -188,7 +314,7 @@ async def generate_podcast_from_articles(request: GeneratePodcastFromArticlesReq
             )
 
         # Generate audio from articles
-        audio_path, script = tts_service.generate_audio_from_articles(
+        audio_path, script = await async_tts_service.generate_audio_from_articles(
             articles=articles,
             voice_id=request.voice_id
         )
@@ -200,7 +326,7 @@ async def generate_podcast_from_articles(request: GeneratePodcastFromArticlesReq
             article_count=len(articles),
             message=f"Successfully generated podcast with {len(articles)} articles"
         )
-    except HTTPException:
+    except (HTTPException, BulkheadFullError):
         raise
     except Exception as e:
         raise HTTPException(
@@ -214,7 +340,7 @@ async def generate_podcast_from_categories(request: GeneratePodcastFromCategorie
     """Generate a podcast from articles in specific categories."""
     try:
         # Fetch articles by categories
-        articles = ArticleService.get_articles_by_category(
+        articles = await AsyncArticleService.get_articles_by_category(
             category_ids=request.category_ids,
             limit=request.limit
         )
@@ -226,7 +352,7 @@ async def generate_podcast_from_categories(request: GeneratePodcastFromCategorie
             )
 
         # Generate audio from articles
-        audio_path, script = tts_service.generate_audio_from_articles(
+        audio_path, script = await async_tts_service.generate_audio_from_articles(
             articles=articles,
             voice_id=request.voice_id
         )
@@ -238,7 +364,7 @@ async def generate_podcast_from_categories(request: GeneratePodcastFromCategorie
             article_count=len(articles),
             message=f"Successfully generated podcast with {len(articles)} articles"
         )
-    except HTTPException:
+    except (HTTPException, BulkheadFullError):
         raise
     except Exception as e:
         raise HTTPException(
@@ -251,7 +377,7 @@ async def generate_podcast_from_categories(request: GeneratePodcastFromCategorie
 async def generate_audio_from_text(request: GenerateAudioFromTextRequest):
     """Generate audio from raw text."""
     try:
-        audio_path = tts_service.generate_audio_from_text(
+        audio_path = await async_tts_service.generate_audio_from_text(
             text=request.text,
             filename=request.filename,
             voice_id=request.voice_id
@@ -264,6 +390,8 @@ async def generate_audio_from_text(request: GenerateAudioFromTextRequest):
             article_count=0,
             message="Successfully generated audio from text"
         )
+    except (HTTPException, BulkheadFullError):
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -48,6 +48,8 @@ class SearchArticlesRequest(BaseModel):
     query: str = Field(..., min_length=1, description="Search query text")
     limit: int = Field(10, ge=1, le=50, description="Number of results to return")
     category_ids: Optional[List[int]] = Field(None, description="Optional category filter")
+    ef_search: Optional[int] = Field(None, ge=1, le=1000, description="Optional HNSW ef_search (higher = better recall, slower)")
+    probes: Optional[int] = Field(None, ge=1, le=10000, description="Optional IVFFlat probes (higher = better recall, slower)")
 
 
 class PodcastResponse(BaseModel):
@@ -0,0 +1,225 @@
+"""
+Async embedding service using Azure OpenAI
+Keeps several embedding requests in flight under the deployment's RPM/TPM quota
+"""
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from openai import AsyncAzureOpenAI, BadRequestError, RateLimitError
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from .embedding_batches import EmbeddingBatcher
+from .rate_limiter import RETRYABLE_ERRORS, RateLimiter, ThroughputMeter, retry_delay
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class AsyncEmbeddingService:
+    """
+    Concurrent, rate-limit-aware counterpart of EmbeddingService
+
+    Batches are packed by the same EmbeddingBatcher as EmbeddingService, then
+    sent with up to EMBEDDING_MAX_IN_FLIGHT requests in flight. Every request
+    first takes one request and its estimated tokens from a token bucket
+    sized to AZURE_OPENAI_EMBEDDING_RPM / AZURE_OPENAI_EMBEDDING_TPM. On a 429
+    all requests pause for the server's Retry-After and the in-flight limit is
+    halved, then grows back by one after each run of successful requests.
+    """
+
+    def __init__(self):
+        # Retries are handled here so 429s feed the shared limiter
+        self.client = AsyncAzureOpenAI(
+            api_key=os.getenv("AZURE_OPENAI_API_KEY"),
+            api_version=os.getenv("AZURE_OPENAI_API_VERSION", "2024-10-21"),
+            azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT"),
+            max_retries=0
+        )
+
+        # Text preparation, batch packing and the embedding cache
+        self.batcher = EmbeddingBatcher()
+        self.embedding_model = self.batcher.embedding_model
+
+        self.max_in_flight = int(os.getenv("EMBEDDING_MAX_IN_FLIGHT", "8"))
+        self.max_retries = int(os.getenv("EMBEDDING_MAX_RETRIES", "6"))
+        self.limiter = RateLimiter(
+            requests_per_minute=int(os.getenv("AZURE_OPENAI_EMBEDDING_RPM", "2100")),
+            tokens_per_minute=int(os.getenv("AZURE_OPENAI_EMBEDDING_TPM", "350000"))
+        )
+        self.meter = ThroughputMeter()
+
+        self.concurrency_limit = self.max_in_flight
+        self._in_flight = 0
+        self._successes = 0
+        self._slot_available: Optional[asyncio.Condition] = None
+
+        logger.info(f"Initialized AsyncEmbeddingService with model: {self.embedding_model}")
+
+    @asynccontextmanager
+    async def _slot(self):
+        """Hold one of the currently allowed in-flight request slots"""
+        if self._slot_available is None:
+            self._slot_available = asyncio.Condition()
+
+        async with self._slot_available:
+            await self._slot_available.wait_for(lambda: self._in_flight < self.concurrency_limit)
+            self._in_flight += 1
+        try:
+            yield
+        finally:
+            async with self._slot_available:
+                self._in_flight -= 1
+                self._slot_available.notify_all()
+
+    def _on_success(self) -> None:
+        self._successes += 1
+        if self._successes >= self.concurrency_limit and self.concurrency_limit < self.max_in_flight:
+            self.concurrency_limit += 1
+            self._successes = 0
+
+    def _on_throttled(self, delay: float) -> None:
+        self.meter.throttled += 1
+        self.limiter.pause(delay)
+        self.concurrency_limit = max(1, self.concurrency_limit // 2)
+        self._successes = 0
+
+    async def _embed_batch(self, batch: List[Tuple[int, str]]) -> Dict[int, Optional[List[float]]]:
+        """
+        Embed one packed batch, retrying transient failures
+
+        Throttling, timeouts and server errors are retried with backoff (a 429
+        also pauses every request and halves the in-flight limit). A rejected
+        request (400) is split in half (like EmbeddingService) so a bad item
+        only fails itself; other errors are raised.
+        """
+        estimated_tokens = sum(self.batcher.estimate_tokens(text) for _, text in batch)
+
+        for attempt in range(self.max_retries + 1):
+            error = None
+            async with self._slot():
+                self.meter.wait_seconds += await self.limiter.acquire(estimated_tokens)
+                try:
+                    response = await self.client.embeddings.create(
+                        input=[text for _, text in batch],
+                        model=self.embedding_model
+                    )
+                except Exception as e:
+                    error = e
+
+            if error is None:
+                usage = getattr(response, "usage", None)
+                actual_tokens = getattr(usage, "total_tokens", None) or estimated_tokens
+                self.limiter.reconcile(estimated_tokens, actual_tokens)
+                self.meter.record(len(batch), actual_tokens)
+                self._on_success()
+                return {batch[item.index][0]: item.embedding for item in response.data}
+
+            if isinstance(error, RETRYABLE_ERRORS):
+                if attempt == self.max_retries:
+                    break
+                delay = retry_delay(error, attempt)
+                if isinstance(error, RateLimitError):
+                    self._on_throttled(delay)
+                logger.warning(
+                    f"Embedding request failed ({type(error).__name__}, attempt {attempt+1}), retrying in {delay:.1f}s "
+                    f"with concurrency {self.concurrency_limit}"
+                )
+                await asyncio.sleep(delay)
+                continue
+
+            if not isinstance(error, BadRequestError):
+                self.meter.failed_items += len(batch)
+                raise error
+
+            if len(batch) == 1:
+                logger.error(f"Error generating embedding for text {batch[0][0]}: {str(error)}")
+                self.meter.failed_items += 1
+                return {batch[0][0]: None}
+
+            logger.warning(f"Embedding request for {len(batch)} texts rejected ({str(error)}), splitting batch")
+            middle = len(batch) // 2
+            halves = await asyncio.gather(self._embed_batch(batch[:middle]), self._embed_batch(batch[middle:]))
+            return {**halves[0], **halves[1]}
+
+        logger.error(f"Embedding request for {len(batch)} texts still failing after {self.max_retries} retries: {str(error)}")
+        self.meter.failed_items += len(batch)
+        return {idx: None for idx, _ in batch}
+
+    async def generate_embedding(self, text: str) -> Optional[List[float]]:
+        """
+        Generate embedding vector for a single text
+
+        Args:
+            text: Text to generate embedding for
+
+        Returns:
+            List of floats (1536 dimensions), or None if the text is empty, the
+            request was rejected (400) or it still failed after retries
+
+        Raises:
+            openai.APIError: Errors that retrying cannot fix, such as
+                authentication failures or a missing deployment
+        """
+        if not text or not text.strip():
+            logger.warning("Empty text provided for embedding")
+            return None
+
+        return (await self.generate_embeddings_batch([text]))[0]
+
+    async def generate_embeddings_batch(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """
+        Generate embeddings for multiple texts with concurrent requests
+
+        Args:
+            texts: List of texts to generate embeddings for
+
+        Returns:
+            List of embeddings in input order (or None for empty or failed items)
+
+        Raises:
+            openai.APIError: Errors that retrying cannot fix, such as
+                authentication failures or a missing deployment
+        """
+        if not texts:
+            return []
+
+        embeddings: List[Optional[List[float]]] = [None] * len(texts)
+        items = self.batcher.prepare_items(texts)
+
+        # Cache lookups are local SQLite (plus optional Postgres); keep them off the event loop
+        to_embed, wanted = await asyncio.to_thread(self.batcher.resolve_cached, items, embeddings)
+        batches = self.batcher.pack_batches(to_embed)
+        for results in await asyncio.gather(*(self._embed_batch(batch) for batch in batches)):
+            for idx, embedding in results.items():
+                embeddings[idx] = embedding
+
+        await asyncio.to_thread(self.batcher.store_results, wanted, embeddings)
+        self.batcher.log_summary(items, embeddings, len(batches))
+
+        return embeddings
+
+    def stats(self) -> Dict:
+        """Throughput, throttling, concurrency and cache counters"""
+        stats = self.meter.stats(in_flight=self._in_flight, concurrency_limit=self.concurrency_limit)
+        stats["cache"] = self.batcher.cache_stats()
+        return stats
+
+
+# Global singleton instance
+_async_embedding_service = None
+
+
+def get_async_embedding_service() -> AsyncEmbeddingService:
+    """
+    Get or create async embedding service singleton
+
+    Returns:
+        AsyncEmbeddingService instance
+    """
+    global _async_embedding_service
+
+    if _async_embedding_service is None:
+        _async_embedding_service = AsyncEmbeddingService()
+
+    return _async_embedding_service
@@ -0,0 +1,380 @@
+"""
+Async summarization service using Azure OpenAI
+Runs several chat completions at once under the deployment's RPM/TPM quota,
+so a batch of summaries takes about as long as the slowest one
+"""
+import asyncio
+import os
+import logging
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from openai import AsyncAzureOpenAI, RateLimitError
+
+from .rate_limiter import RETRYABLE_ERRORS, RateLimiter, ThroughputMeter, retry_delay
+from .summary_planner import MAX_COMPLETION_TOKENS, WORDS_PER_MINUTE, SummaryPlanner
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class AsyncSummarizationService:
+    """
+    Concurrent, rate-limit-aware counterpart of SummarizationService
+
+    Prompts, packing and caching come from the same SummaryPlanner as
+    SummarizationService. Up to SUMMARY_MAX_IN_FLIGHT chat completions run
+    at once. Each request first takes one request and (prompt tokens +
+    max_tokens) from a token bucket sized to AZURE_OPENAI_CHAT_RPM /
+    AZURE_OPENAI_CHAT_TPM, and the bucket is corrected with the real usage
+    afterwards. Throttling, timeouts and 5xx errors are retried up to
+    SUMMARY_MAX_RETRIES times with jittered exponential backoff (or the
+    server's Retry-After on 429, which pauses every request).
+    """
+
+    def __init__(self):
+        # Retries are handled here so throttling feeds the shared limiter
+        self.client = AsyncAzureOpenAI(
+            api_key=os.getenv("AZURE_OPENAI_API_KEY"),
+            api_version=os.getenv("AZURE_OPENAI_API_VERSION", "2024-10-21"),
+            azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT"),
+            max_retries=0
+        )
+
+        # Prompts, pack planning and the summary cache
+        self.planner = SummaryPlanner()
+        self.model = self.planner.model
+
+        self.max_in_flight = int(os.getenv("SUMMARY_MAX_IN_FLIGHT", "4"))
+        self.max_retries = int(os.getenv("SUMMARY_MAX_RETRIES", "5"))
+        self.limiter = RateLimiter(
+            requests_per_minute=int(os.getenv("AZURE_OPENAI_CHAT_RPM", "480")),
+            tokens_per_minute=int(os.getenv("AZURE_OPENAI_CHAT_TPM", "80000"))
+        )
+        self.meter = ThroughputMeter()
+        self._in_flight = 0
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+        logger.info(f"Initialized AsyncSummarizationService with model: {self.model}")
+
+    def _estimate_tokens(self, messages: List[Dict[str, str]], max_tokens: int = MAX_COMPLETION_TOKENS) -> int:
+        """Token budget for one request: the prompt (~3 chars per token) plus max_tokens"""
+        prompt_chars = sum(len(message["content"]) for message in messages)
+        return prompt_chars // 3 + 1 + max_tokens
+
+    async def _complete(self, messages: List[Dict[str, str]], max_tokens: int, items: int = 1, **kwargs):
+        """
+        Run one chat completion under the quota, retrying transient errors
+
+        Args:
+            messages: Chat messages
+            max_tokens: Completion budget
+            items: Articles the request covers (for throughput stats)
+            **kwargs: Extra completion parameters (e.g. response_format)
+
+        Returns:
+            The completion response, or None if it failed
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+
+        estimated_tokens = self._estimate_tokens(messages, max_tokens)
+
+        for attempt in range(self.max_retries + 1):
+            error = None
+            async with self._semaphore:
+                self.meter.wait_seconds += await self.limiter.acquire(estimated_tokens)
+                self._in_flight += 1
+                try:
+                    response = await self.client.chat.completions.create(
+                        model=self.model,
+                        messages=messages,
+                        temperature=0.7,
+                        max_tokens=max_tokens,
+                        **kwargs
+                    )
+                except Exception as e:
+                    error = e
+                finally:
+                    self._in_flight -= 1
+
+            if error is None:
+                usage = getattr(response, "usage", None)
+                actual_tokens = (usage.prompt_tokens + usage.completion_tokens) if usage else estimated_tokens
+                self.limiter.reconcile(estimated_tokens, actual_tokens)
+                self.meter.record(items, actual_tokens)
+                return response
+
+            if not isinstance(error, RETRYABLE_ERRORS) or attempt == self.max_retries:
+                logger.error(f"Error generating summary: {str(error)}")
+                self.meter.failed_items += items
+                return None
+
+            delay = retry_delay(error, attempt)
+            if isinstance(error, RateLimitError):
+                self.meter.throttled += 1
+                self.limiter.pause(delay)
+            logger.warning(f"Summary request failed ({type(error).__name__}, attempt {attempt+1}), retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+    async def create_audio_summary(
+        self,
+        text: str,
+        title: str = "",
+        target_duration_minutes: int = 2
+    ) -> Optional[str]:
+        """
+        Create a summary optimized for audio narration
+
+        Args:
+            text: Full article text to summarize
+            title: Article title (optional, for context)
+            target_duration_minutes: Target duration in minutes (default: 2)
+
+        Returns:
+            Summary text optimized for audio narration, or None if error
+        """
+        summary, _ = await self.create_audio_summary_with_usage(text, title, target_duration_minutes)
+        return summary
+
+    async def create_audio_summary_with_usage(
+        self,
+        text: str,
+        title: str = "",
+        target_duration_minutes: int = 2
+    ) -> Tuple[Optional[str], Dict[str, int]]:
+        """
+        Create an audio summary and report the chat completion's token usage
+
+        Args:
+            text: Full article text to summarize
+            title: Article title (optional, for context)
+            target_duration_minutes: Target duration in minutes (default: 2)
+
+        Returns:
+            Tuple of (summary text or None if error, {"prompt_tokens",
+            "completion_tokens"} as reported by Azure OpenAI, empty if unknown;
+            {"cached": 1} when the summary came from the summary cache)
+        """
+        if not text or not text.strip():
+            logger.warning("Empty text provided for summarization")
+            return None, {}
+
+        cached = await asyncio.to_thread(self.planner.cached_summary, text, title, target_duration_minutes)
+        if cached is not None:
+            return cached, {"cached": 1}
+
+        return await self._generate_summary(text, title, target_duration_minutes)
+
+    async def _generate_summary(self, text: str, title: str, target_duration_minutes: int) -> Tuple[Optional[str], Dict[str, int]]:
+        """Request one summary and add it to the summary cache"""
+        response = await self._complete(self.planner.build_messages(text, title, target_duration_minutes), MAX_COMPLETION_TOKENS)
+        if response is None:
+            return None, {}
+
+        try:
+            summary, usage = self.planner.parse_response(response, target_duration_minutes)
+        except Exception as e:
+            logger.error(f"Error reading summary response: {str(e)}")
+            self.meter.failed_items += 1
+            return None, {}
+
+        await asyncio.to_thread(self.planner.store_summary, text, title, target_duration_minutes, summary)
+        return summary, usage
+
+    async def stream_audio_summary(
+        self,
+        text: str,
+        title: str = "",
+        target_duration_minutes: int = 2
+    ) -> AsyncIterator[str]:
+        """
+        Stream an audio summary as the model writes it
+
+        A cached summary is yielded in one piece. Otherwise the chat
+        completion is streamed under the same quota and concurrency limits as
+        create_audio_summary; transient errors are retried only until the
+        first token arrives, after which they are raised. The finished
+        summary is added to the summary cache.
+
+        Args:
+            text: Full article text to summarize
+            title: Article title (optional, for context)
+            target_duration_minutes: Target duration in minutes (default: 2)
+
+        Yields:
+            Pieces of summary text in order
+        """
+        if not text or not text.strip():
+            raise ValueError("Empty text provided for summarization")
+
+        cached = await asyncio.to_thread(self.planner.cached_summary, text, title, target_duration_minutes)
+        if cached is not None:
+            yield cached
+            return
+
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+
+        messages = self.planner.build_messages(text, title, target_duration_minutes)
+        estimated_tokens = self._estimate_tokens(messages)
+        parts: List[str] = []
+        usage = None
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with self._semaphore:
+                    self.meter.wait_seconds += await self.limiter.acquire(estimated_tokens)
+                    self._in_flight += 1
+                    try:
+                        stream = await self.client.chat.completions.create(
+                            model=self.model,
+                            messages=messages,
+                            temperature=0.7,
+                            max_tokens=MAX_COMPLETION_TOKENS,
+                            stream=True,
+                            stream_options={"include_usage": True}
+                        )
+                        async for chunk in stream:
+                            if getattr(chunk, "usage", None):
+                                usage = chunk.usage
+                            delta = chunk.choices[0].delta.content if chunk.choices else None
+                            if delta:
+                                parts.append(delta)
+                                yield delta
+                    finally:
+                        self._in_flight -= 1
+                break
+            except RETRYABLE_ERRORS as e:
+                if parts or attempt == self.max_retries:
+                    self.meter.failed_items += 1
+                    raise
+                delay = retry_delay(e, attempt)
+                if isinstance(e, RateLimitError):
+                    self.meter.throttled += 1
+                    self.limiter.pause(delay)
+                logger.warning(f"Summary stream failed ({type(e).__name__}, attempt {attempt+1}), retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+            except Exception:
+                self.meter.failed_items += 1
+                raise
+
+        actual_tokens = (usage.prompt_tokens + usage.completion_tokens) if usage else estimated_tokens
+        self.limiter.reconcile(estimated_tokens, actual_tokens)
+        self.meter.record(1, actual_tokens)
+
+        summary = "".join(parts).strip()
+        logger.info(f"Streamed summary with {len(summary.split())} words (target: {target_duration_minutes * WORDS_PER_MINUTE})")
+        await asyncio.to_thread(self.planner.store_summary, text, title, target_duration_minutes, summary)
+
+    async def _generate_packed_summaries(
+        self,
+        pack: List[Tuple[str, str, str]],
+        target_duration_minutes: int
+    ) -> Dict[str, str]:
+        """
+        Request summaries for several (id, text, title) articles in one chat completion
+
+        Returns:
+            {article id: summary} for the articles the response covered
+            (empty if the request or its JSON failed)
+        """
+        response = await self._complete(
+            self.planner.build_packed_messages(pack, target_duration_minutes),
+            self.planner.completion_tokens_per_summary(target_duration_minutes) * len(pack),
+            items=len(pack),
+            response_format={"type": "json_object"}
+        )
+        if response is None:
+            return {}
+
+        try:
+            summaries, _ = self.planner.parse_packed_response(response, [article_id for article_id, _, _ in pack], target_duration_minutes)
+        except Exception as e:
+            logger.error(f"Error reading packed summary response: {str(e)}")
+            return {}
+
+        logger.info(f"Generated {len(summaries)}/{len(pack)} summaries in one packed request")
+        for article_id, text, title in pack:
+            await asyncio.to_thread(self.planner.store_summary, text, title, target_duration_minutes, summaries.get(article_id))
+        return summaries
+
+    async def create_batch_summaries(
+        self,
+        articles: List[dict],
+        target_duration_minutes: int = 2,
+        packed: Optional[bool] = None
+    ) -> List[Optional[str]]:
+        """
+        Create summaries for multiple articles concurrently
+
+        Articles already in the summary cache are returned without a request.
+        In packed mode short articles share a request (see
+        SummaryPlanner.plan_packs), and any article a packed response misses
+        is retried on its own.
+
+        Args:
+            articles: List of article dicts with 'text' and optionally 'title'
+            target_duration_minutes: Target duration per summary
+            packed: Pack short articles into shared requests (default: SUMMARY_PACK_ENABLED)
+
+        Returns:
+            List of summaries in input order (or None for failed items)
+        """
+        if packed is None:
+            packed = self.planner.pack_enabled
+
+        items = self.planner.batch_items(articles)
+        summaries: List[Optional[str]] = [None] * len(items)
+        pending = []
+        for idx, (text, title) in enumerate(items):
+            if not text.strip():
+                logger.warning(f"Empty text provided for article {idx}")
+                continue
+            summaries[idx] = await asyncio.to_thread(self.planner.cached_summary, text, title, target_duration_minutes)
+            if summaries[idx] is None:
+                pending.append(idx)
+
+        async def summarize(idx: int) -> None:
+            text, title = items[idx]
+            summaries[idx], _ = await self._generate_summary(text, title, target_duration_minutes)
+
+        async def summarize_unit(unit: List[int]) -> None:
+            if len(unit) > 1:
+                pack = [(str(idx), items[idx][0], items[idx][1]) for idx in unit]
+                packed_summaries = await self._generate_packed_summaries(pack, target_duration_minutes)
+                for article_id, summary in packed_summaries.items():
+                    summaries[int(article_id)] = summary
+            await asyncio.gather(*(summarize(idx) for idx in unit if summaries[idx] is None))
+
+        units = self.planner.plan_packs(items, pending, target_duration_minutes) if packed else [[idx] for idx in pending]
+        await asyncio.gather(*(summarize_unit(unit) for unit in units))
+
+        failed = sum(1 for summary in summaries if summary is None)
+        logger.info(f"Generated {len(articles) - failed}/{len(articles)} summaries" + (f", {failed} failed" if failed else ""))
+
+        return summaries
+
+    def stats(self) -> Dict:
+        """Throughput, throttling, concurrency and summary cache counters"""
+        stats = self.meter.stats(in_flight=self._in_flight, concurrency_limit=self.max_in_flight)
+        stats["cache"] = self.planner.cache_stats()
+        return stats
+
+
+# Global singleton instance
+_async_summarization_service = None
+
+
+def get_async_summarization_service() -> AsyncSummarizationService:
+    """
+    Get or create async summarization service singleton
+
+    Returns:
+        AsyncSummarizationService instance
+    """
+    global _async_summarization_service
+
+    if _async_summarization_service is None:
+        _async_summarization_service = AsyncSummarizationService()
+
+    return _async_summarization_service
@@ -0,0 +1,82 @@
+"""
+Backfill embeddings for articles stored without a vector
+
+Uses the async embedding client so many requests stay in flight while the
+token bucket keeps throughput under the deployment's RPM/TPM quota.
+
+Usage:
+    python -m parallel_api.backfill_embeddings [--chunk-size 1000] [--limit 0]
+"""
+import argparse
+import asyncio
+import logging
+import time
+
+from .async_embedding_service import get_async_embedding_service
+from .database import get_db_context
+from .models import Article
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def backfill(chunk_size: int = 1000, limit: int = 0) -> int:
+    """
+    Embed articles whose vector is NULL, chunk by chunk
+
+    Args:
+        chunk_size: Articles loaded, embedded and committed together
+        limit: Stop after this many articles (0 = all)
+
+    Returns:
+        Number of articles that received an embedding
+    """
+    embedding_service = get_async_embedding_service()
+    updated = 0
+    last_id = 0
+    started = time.monotonic()
+
+    while True:
+        with get_db_context() as db:
+            articles = (
+                db.query(Article)
+                .filter(Article.vector.is_(None), Article.id > last_id)
+                .order_by(Article.id)
+                .limit(chunk_size)
+                .all()
+            )
+            if not articles:
+                break
+
+            last_id = articles[-1].id
+            embeddings = await embedding_service.generate_embeddings_batch([a.text for a in articles])
+            for article, embedding in zip(articles, embeddings):
+                if embedding is not None:
+                    article.vector = embedding
+                    updated += 1
+
+        stats = embedding_service.stats()
+        logger.info(
+            f"Backfilled {updated} articles in {time.monotonic() - started:.0f}s "
+            f"({stats['items_per_second']} items/s, {stats['tokens_per_second']} tokens/s, "
+            f"{stats['throttled']} throttled, concurrency {stats['concurrency_limit']})"
+        )
+
+        if limit and updated >= limit:
+            break
+
+    return updated
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--limit", type=int, default=0)
+    args = parser.parse_args()
+
+    updated = asyncio.run(backfill(args.chunk_size, args.limit))
+    print(f"✓ Backfilled {updated} article embeddings")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark article ingest paths
+
+Inserts synthetic articles with random 1536-dim vectors using one ORM flush
+per row (the old /articles/batch/ path), a multi-row INSERT, and binary COPY,
+and reports rows/sec for each batch size. Every run is rolled back, so the
+articles table is left unchanged.
+
+Usage:
+    python -m parallel_api.benchmark_bulk_ingest [--sizes 100 1000 10000] [--orm-max 1000]
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timezone
+from typing import Dict, List
+
+import numpy as np
+
+from .bulk_ingest import VECTOR_DIM, bulk_insert_articles
+from .database import SessionLocal
+from .models import Article
+
+
+def make_rows(count: int) -> List[Dict]:
+    vectors = np.random.rand(count, VECTOR_DIM).astype(np.float32)
+    return [
+        {
+            "text": f"Benchmark article {i} " + "lorem ipsum " * random.randint(50, 300),
+            "summary": f"Benchmark article {i}",
+            "relevance_score": random.randint(1, 10),
+            "date_written": datetime.now(timezone.utc),
+            "source": f"https://example.com/benchmark/{i}",
+            "category_id": None,
+            "vector": vectors[i].tolist()
+        }
+        for i in range(count)
+    ]
+
+
+def orm_insert(db, rows: List[Dict]) -> None:
+    for row in rows:
+        article = Article(**row)
+        db.add(article)
+        db.flush()
+
+
+def run(label: str, rows: List[Dict], insert) -> float:
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        insert(db, rows)
+        elapsed = time.perf_counter() - started
+    finally:
+        db.rollback()
+        db.close()
+
+    rate = len(rows) / elapsed
+    print(f"  {label:<8} {len(rows):>6} rows  {elapsed:8.2f} s  {rate:10.1f} rows/s")
+    return rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--orm-max", type=int, default=1000, help="Skip the per-row ORM path above this size")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Article ingest benchmark (rolled back after each run)")
+    print("=" * 60)
+
+    for size in args.sizes:
+        rows = make_rows(size)
+        print(f"\nBatch of {size}")
+        print("-" * 60)
+        if size <= args.orm_max:
+            run("orm", rows, orm_insert)
+        run("insert", rows, lambda db, r: bulk_insert_articles(db, r, method="insert"))
+        run("copy", rows, lambda db, r: bulk_insert_articles(db, r, method="copy"))
+
+
+if __name__ == "__main__":
+    main()
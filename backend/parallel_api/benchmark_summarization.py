@@ -0,0 +1,120 @@
+"""
+Benchmark extractive pre-compression for summarization
+
+Compares the summarizer input before (first 8000 characters) and after
+compression (boilerplate stripped, top sentences within
+SUMMARY_INPUT_MAX_TOKENS) for stored articles or text files, and reports the
+estimated token reduction and compression time. With --summarize, each article
+is also summarized both ways (summary cache off) to report real prompt tokens
+and chat latency.
+
+Usage:
+    python -m parallel_api.benchmark_summarization [--limit 20] [--files a.txt b.txt] [--summarize]
+"""
+import argparse
+import statistics
+import time
+from typing import List, Tuple
+
+from .summarization_service import SummarizationService
+from .summary_planner import MAX_INPUT_CHARS
+from .text_compression import CHARS_PER_TOKEN, compress_text
+
+
+def load_articles(limit: int, files: List[str]) -> List[Tuple[str, str]]:
+    """(label, text) pairs from the given files, or the longest stored articles"""
+    if files:
+        articles = []
+        for path in files:
+            with open(path, encoding="utf-8") as f:
+                articles.append((path, f.read()))
+        return articles
+
+    from sqlalchemy import func
+
+    from .database import SessionLocal
+    from .models import Article
+
+    db = SessionLocal()
+    try:
+        rows = db.query(Article.source, Article.text).order_by(func.length(Article.text).desc()).limit(limit).all()
+    finally:
+        db.close()
+    return [(row.source or "", row.text or "") for row in rows]
+
+
+def timed_summary(service: SummarizationService, text: str, compress: bool, duration: int):
+    service.planner.compress_input = compress
+    started = time.perf_counter()
+    summary, usage = service.create_audio_summary_with_usage(text, target_duration_minutes=duration)
+    return (time.perf_counter() - started) * 1000, usage.get("prompt_tokens"), summary is not None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--limit", type=int, default=20, help="Longest N stored articles")
+    parser.add_argument("--files", nargs="+", default=[], help="Benchmark these text files instead")
+    parser.add_argument("--max-tokens", type=int, default=None, help="Compression budget (default: SUMMARY_INPUT_MAX_TOKENS)")
+    parser.add_argument("--summarize", action="store_true", help="Also call Azure OpenAI before and after")
+    parser.add_argument("--duration", type=int, default=2, help="Target summary minutes")
+    args = parser.parse_args()
+
+    service = SummarizationService()
+    service.planner.cache = None
+    max_tokens = args.max_tokens or service.planner.input_max_tokens
+    service.planner.input_max_tokens = max_tokens
+
+    articles = load_articles(args.limit, args.files)
+
+    print("=" * 78)
+    print(f"Summarization input benchmark ({len(articles)} articles, budget {max_tokens} tokens)")
+    print("=" * 78)
+    print(f"{'article':<30} {'chars':>8} {'before':>8} {'after':>8} {'saved':>7} {'ms':>7}")
+    print("-" * 78)
+
+    before_tokens, after_tokens, compress_ms = [], [], []
+    for label, text in articles:
+        compress_text.cache_clear()
+        started = time.perf_counter()
+        compressed = compress_text(text, max_tokens)
+        compress_ms.append((time.perf_counter() - started) * 1000)
+
+        before = len(text[:MAX_INPUT_CHARS]) // CHARS_PER_TOKEN + 1
+        after = len(compressed) // CHARS_PER_TOKEN + 1
+        before_tokens.append(before)
+        after_tokens.append(after)
+        print(f"{label[-30:]:<30} {len(text):>8} {before:>8} {after:>8} {1 - after / before:>6.0%} {compress_ms[-1]:>7.1f}")
+
+    if not articles:
+        return
+
+    print("-" * 78)
+    total_before, total_after = sum(before_tokens), sum(after_tokens)
+    print(f"Estimated input tokens: {total_before} -> {total_after} ({1 - total_after / total_before:.0%} fewer)")
+    print(f"Compression time: median {statistics.median(compress_ms):.1f} ms, max {max(compress_ms):.1f} ms")
+
+    if not args.summarize:
+        return
+
+    print("\nSummarizing (truncated vs compressed input)")
+    print("-" * 78)
+    results = {False: [], True: []}
+    for _, text in articles:
+        for compress in (False, True):
+            results[compress].append(timed_summary(service, text, compress, args.duration))
+
+    for compress, label in ((False, "truncated"), (True, "compressed")):
+        latencies = [ms for ms, _, ok in results[compress] if ok]
+        prompt_tokens = [tokens for _, tokens, ok in results[compress] if ok and tokens]
+        if not latencies:
+            print(f"  {label:<11} no successful summaries")
+            continue
+        print(
+            f"  {label:<11} median {statistics.median(latencies):8.0f} ms  "
+            f"mean {statistics.mean(latencies):8.0f} ms  "
+            f"prompt tokens {sum(prompt_tokens):>8}  ok {len(latencies)}/{len(articles)}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+"""
+Bulk article ingest
+Writes many articles and their vectors in one transaction with binary COPY
+(or a multi-row INSERT) instead of one ORM flush per row
+"""
+import logging
+import struct
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+from psycopg2.extras import execute_values
+from sqlalchemy.orm import Session
+
+from .sources import canonicalize_url
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+VECTOR_DIM = 1536
+
+COLUMNS = ("id", "text", "summary", "relevance_score", "date_written", "source", "source_canonical", "category_id", "vector")
+FIELD_KINDS = ("int", "text", "text", "int", "timestamptz", "text", "text", "int", "vector")
+
+PG_EPOCH = datetime(2000, 1, 1, tzinfo=timezone.utc)
+COPY_HEADER = b"PGCOPY\n\xff\r\n\x00" + struct.pack(">ii", 0, 0)
+COPY_TRAILER = struct.pack(">h", -1)
+
+# (article id or None, error message or None) for each input row
+RowResult = Tuple[Optional[int], Optional[str]]
+
+
+def _encode_field(value, kind: str) -> bytes:
+    """Encode one value in PostgreSQL binary COPY format (length-prefixed)"""
+    if value is None:
+        return struct.pack(">i", -1)
+
+    if kind == "int":
+        data = struct.pack(">i", value)
+    elif kind == "text":
+        data = value.encode("utf-8")
+    elif kind == "timestamptz":
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        delta = value - PG_EPOCH
+        micros = (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+        data = struct.pack(">q", micros)
+    elif kind == "vector":
+        # pgvector binary format: int16 dim, int16 unused, float4[dim]
+        vector = np.asarray(value, dtype=">f4")
+        data = struct.pack(">hh", len(vector), 0) + vector.tobytes()
+    else:
+        raise ValueError(f"Unknown field kind {kind}")
+
+    return struct.pack(">i", len(data)) + data
+
+
+def _row_values(article_id: int, row: Dict) -> Tuple:
+    """Column values in COLUMNS order; source_canonical is derived from source"""
+    source = row.get("source")
+    values = dict(row, source_canonical=canonicalize_url(source) if source else None)
+    return (article_id,) + tuple(values.get(column) for column in COLUMNS[1:])
+
+
+def _encode_row(article_id: int, row: Dict) -> bytes:
+    values = _row_values(article_id, row)
+    return struct.pack(">h", len(COLUMNS)) + b"".join(
+        _encode_field(value, kind) for value, kind in zip(values, FIELD_KINDS)
+    )
+
+
+class _CopyStream:
+    """File-like object that encodes rows lazily as COPY reads them"""
+
+    def __init__(self, chunks: Iterator[bytes]):
+        self._chunks = chunks
+        self._buffer = bytearray()
+
+    def read(self, size: int = -1) -> bytes:
+        while size < 0 or len(self._buffer) < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._buffer.extend(chunk)
+
+        if size < 0:
+            size = len(self._buffer)
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+
+def _copy_chunks(ids: Sequence[int], rows: Sequence[Dict]) -> Iterator[bytes]:
+    yield COPY_HEADER
+    for article_id, row in zip(ids, rows):
+        yield _encode_row(article_id, row)
+    yield COPY_TRAILER
+
+
+def _vector_literal(vector) -> Optional[str]:
+    if vector is None:
+        return None
+    return "[" + ",".join(str(float(x)) for x in vector) + "]"
+
+
+def validate_row(row: Dict) -> Optional[str]:
+    """Return why a row cannot be inserted, or None if it looks valid"""
+    if not row.get("text"):
+        return "text is required"
+
+    vector = row.get("vector")
+    if vector is not None and len(vector) != VECTOR_DIM:
+        return f"vector has {len(vector)} dimensions, expected {VECTOR_DIM}"
+
+    score = row.get("relevance_score")
+    if score is not None and not 1 <= score <= 10:
+        return f"relevance_score {score} is outside 1-10"
+
+    return None
+
+
+def _allocate_ids(cursor, count: int) -> List[int]:
+    """Reserve article ids up front so rows map to ids without relying on RETURNING order"""
+    cursor.execute(
+        "SELECT nextval(pg_get_serial_sequence('articles', 'id')) FROM generate_series(1, %s)",
+        (count,)
+    )
+    return [row[0] for row in cursor.fetchall()]
+
+
+def _write(cursor, ids: Sequence[int], rows: Sequence[Dict], method: str) -> None:
+    if method == "copy":
+        cursor.copy_expert(
+            f"COPY articles ({', '.join(COLUMNS)}) FROM STDIN WITH (FORMAT binary)",
+            _CopyStream(_copy_chunks(ids, rows))
+        )
+    elif method == "insert":
+        execute_values(
+            cursor,
+            f"INSERT INTO articles ({', '.join(COLUMNS)}) VALUES %s RETURNING id",
+            [
+                _row_values(article_id, row)[:-1] + (_vector_literal(row.get("vector")),)
+                for article_id, row in zip(ids, rows)
+            ],
+            template="(%s, %s, %s, %s, %s, %s, %s, %s, %s::vector)",
+            page_size=1000,
+            fetch=True
+        )
+    else:
+        raise ValueError(f"Unknown bulk insert method {method!r}; expected 'copy' or 'insert'")
+
+
+def bulk_insert_articles(db: Session, rows: List[Dict], method: str = "copy") -> List[RowResult]:
+    """
+    Insert many articles in the session's transaction
+
+    Rows are validated first; the valid ones are written with one binary COPY
+    (or multi-row INSERT ... RETURNING id). If that statement fails, the rows
+    are retried one by one under savepoints so each bad row reports its own
+    error while the rest are still inserted. The caller commits.
+
+    Args:
+        db: SQLAlchemy session
+        rows: Dicts with text, summary, relevance_score, date_written, source,
+            category_id and vector
+        method: "copy" (binary COPY) or "insert" (multi-row INSERT)
+
+    Returns:
+        One (article_id, error) pair per input row, in input order
+    """
+    results: List[RowResult] = [(None, None)] * len(rows)
+    if not rows:
+        return results
+
+    cursor = db.connection().connection.cursor()
+    try:
+        valid = []
+        for idx, row in enumerate(rows):
+            error = validate_row(row)
+            if error:
+                results[idx] = (None, error)
+            else:
+                valid.append(idx)
+
+        # Check category references up front so one bad id doesn't fail the whole COPY
+        category_ids = {rows[idx]["category_id"] for idx in valid if rows[idx].get("category_id") is not None}
+        if category_ids:
+            cursor.execute("SELECT id FROM categories WHERE id = ANY(%s)", (list(category_ids),))
+            missing = category_ids - {row[0] for row in cursor.fetchall()}
+            for idx in valid:
+                if rows[idx].get("category_id") in missing:
+                    results[idx] = (None, f"category_id {rows[idx]['category_id']} does not exist")
+            valid = [idx for idx in valid if results[idx][1] is None]
+
+        if not valid:
+            return results
+
+        ids = _allocate_ids(cursor, len(valid))
+        valid_rows = [rows[idx] for idx in valid]
+
+        cursor.execute("SAVEPOINT bulk_ingest")
+        try:
+            _write(cursor, ids, valid_rows, method)
+            cursor.execute("RELEASE SAVEPOINT bulk_ingest")
+            for idx, article_id in zip(valid, ids):
+                results[idx] = (article_id, None)
+            logger.info(f"Bulk inserted {len(valid)} articles with {method}")
+            return results
+
+        except Exception as e:
+            cursor.execute("ROLLBACK TO SAVEPOINT bulk_ingest")
+            logger.warning(f"Bulk {method} of {len(valid)} articles failed ({str(e)}), inserting row by row")
+
+        for idx, article_id, row in zip(valid, ids, valid_rows):
+            cursor.execute("SAVEPOINT bulk_ingest_row")
+            try:
+                _write(cursor, [article_id], [row], "insert")
+                cursor.execute("RELEASE SAVEPOINT bulk_ingest_row")
+                results[idx] = (article_id, None)
+            except Exception as e:
+                cursor.execute("ROLLBACK TO SAVEPOINT bulk_ingest_row")
+                results[idx] = (None, str(e).strip())
+
+        return results
+
+    finally:
+        cursor.close()
@@ -0,0 +1,158 @@
+"""
+Embedding request planning shared by the sync and async embedding services
+Prepares texts, serves them from the embedding cache and packs the rest into
+requests; holds no client, so each service only adds its own way of sending
+the requests
+"""
+import logging
+import os
+from typing import Dict, List, Optional, Tuple
+
+from .embedding_cache import content_key, create_embedding_cache
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingBatcher:
+    """Text preparation, batch packing and caching for one embedding model"""
+
+    def __init__(self):
+        self.embedding_model = os.getenv(
+            "AZURE_OPENAI_EMBEDDING_DEPLOYMENT_FAST",
+            "text-embedding-3-small"
+        )
+
+        # Truncate text if too long (max ~8000 tokens for text-embedding-3-small)
+        self.max_chars = int(os.getenv("EMBEDDING_MAX_CHARS", "30000"))
+
+        # Per-request limits for batched calls (the API accepts up to 2048 inputs)
+        self.batch_max_items = int(os.getenv("EMBEDDING_BATCH_MAX_ITEMS", "256"))
+        self.batch_max_tokens = int(os.getenv("EMBEDDING_BATCH_MAX_TOKENS", "250000"))
+
+        # Content-addressed cache so identical text is only embedded once
+        self.cache = create_embedding_cache(self.embedding_model)
+
+    def prepare_text(self, text: str) -> Optional[str]:
+        """Return text ready to embed (truncated to fit the model), or None if empty"""
+        if not text or not text.strip():
+            return None
+
+        if len(text) > self.max_chars:
+            logger.warning(f"Text too long ({len(text)} chars), truncating to {self.max_chars}")
+            text = text[:self.max_chars]
+
+        return text
+
+    def prepare_items(self, texts: List[str]) -> List[Tuple[int, str]]:
+        """(index, prepared text) pairs for every non-empty text"""
+        items = []
+        for idx, text in enumerate(texts):
+            prepared = self.prepare_text(text)
+            if prepared is None:
+                logger.warning(f"Empty text provided for embedding at index {idx}")
+                continue
+            items.append((idx, prepared))
+        return items
+
+    def estimate_tokens(self, text: str) -> int:
+        """Conservative token estimate (English averages ~4 chars per token)"""
+        return len(text) // 3 + 1
+
+    def pack_batches(self, items: List[Tuple[int, str]]) -> List[List[Tuple[int, str]]]:
+        """
+        Pack (index, text) pairs into requests under the item and token limits
+
+        Args:
+            items: Texts to embed with their position in the caller's list
+
+        Returns:
+            List of batches, each small enough for one embeddings.create call
+        """
+        batches = []
+        current: List[Tuple[int, str]] = []
+        current_tokens = 0
+
+        for index, text in items:
+            tokens = self.estimate_tokens(text)
+            if current and (
+                len(current) >= self.batch_max_items
+                or current_tokens + tokens > self.batch_max_tokens
+            ):
+                batches.append(current)
+                current = []
+                current_tokens = 0
+
+            current.append((index, text))
+            current_tokens += tokens
+
+        if current:
+            batches.append(current)
+
+        return batches
+
+    def resolve_cached(
+        self,
+        items: List[Tuple[int, str]],
+        embeddings: List[Optional[List[float]]]
+    ) -> Tuple[List[Tuple[int, str]], Dict[str, List[int]]]:
+        """
+        Fill embeddings from the cache and collapse duplicate texts
+
+        Args:
+            items: Prepared (index, text) pairs
+            embeddings: Output list, filled in place for cache hits
+
+        Returns:
+            (index, text) pairs that still need embedding (one per distinct
+            content key), and a mapping of each of those keys to every index
+            that wants it
+        """
+        keys = [content_key(self.embedding_model, text) for _, text in items]
+        cached = self.cache.get_many(keys) if self.cache else {}
+
+        wanted: Dict[str, List[int]] = {}
+        to_embed: List[Tuple[int, str]] = []
+        for (idx, text), key in zip(items, keys):
+            if key in cached:
+                embeddings[idx] = cached[key]
+            elif key in wanted:
+                wanted[key].append(idx)
+            else:
+                wanted[key] = [idx]
+                to_embed.append((idx, text))
+
+        if cached:
+            logger.info(f"Embedding cache hits: {len(items) - sum(len(v) for v in wanted.values())}/{len(items)}")
+
+        return to_embed, wanted
+
+    def store_results(self, wanted: Dict[str, List[int]], embeddings: List[Optional[List[float]]]) -> None:
+        """Copy each new embedding to duplicate inputs and write it to the cache"""
+        new_embeddings = {}
+        for key, indices in wanted.items():
+            embedding = embeddings[indices[0]]
+            if embedding is None:
+                continue
+            for idx in indices[1:]:
+                embeddings[idx] = embedding
+            new_embeddings[key] = embedding
+
+        if self.cache and new_embeddings:
+            self.cache.put_many(new_embeddings)
+
+    def log_summary(
+        self,
+        items: List[Tuple[int, str]],
+        embeddings: List[Optional[List[float]]],
+        requests: int
+    ) -> None:
+        failed = sum(1 for idx, _ in items if embeddings[idx] is None)
+        logger.info(
+            f"Generated {len(items) - failed}/{len(embeddings)} embeddings in {requests} request(s)"
+            + (f", {failed} failed" if failed else "")
+        )
+
+    def cache_stats(self) -> Optional[Dict]:
+        """Embedding cache hit/miss counters, or None when caching is disabled"""
+        return self.cache.stats() if self.cache else None
@@ -0,0 +1,79 @@
+"""
+Content-addressed embedding cache
+Stores document embeddings keyed by a hash of (model, normalized text) so
+re-ingested articles are never sent to Azure OpenAI twice
+"""
+import hashlib
+import os
+import unicodedata
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .kv_cache import PostgresStore, SQLiteStore, TwoTierCache
+
+
+def normalize_text(text: str) -> str:
+    """Normalize unicode and whitespace so the same article always hashes the same"""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def content_key(model: str, text: str) -> str:
+    """SHA-256 of the model name and normalized text"""
+    return hashlib.sha256(f"{model}\x00{normalize_text(text)}".encode("utf-8")).hexdigest()
+
+
+def _to_blob(embedding: List[float]) -> bytes:
+    return np.asarray(embedding, dtype=np.float32).tobytes()
+
+
+def _from_blob(blob: bytes) -> List[float]:
+    return np.frombuffer(blob, dtype=np.float32).tolist()
+
+
+class EmbeddingCache(TwoTierCache):
+    """Two-tier content-addressed cache of float32 embeddings for one embedding model"""
+
+    def __init__(self, model: str, local: SQLiteStore, shared: Optional[PostgresStore] = None):
+        super().__init__(local, shared, encode=_to_blob, decode=_from_blob, name="embedding")
+        self.model = model
+
+    def stats(self) -> Dict:
+        return {"model": self.model, **super().stats()}
+
+
+def create_embedding_cache(model: str) -> Optional[EmbeddingCache]:
+    """
+    Build the embedding cache from environment settings
+
+    EMBEDDING_CACHE_ENABLED (default true), EMBEDDING_CACHE_PATH,
+    EMBEDDING_CACHE_MAX_ENTRIES and EMBEDDING_CACHE_POSTGRES (default false;
+    uses DATABASE_URL and EMBEDDING_CACHE_POSTGRES_MAX_ENTRIES).
+
+    Returns:
+        EmbeddingCache, or None when caching is disabled
+    """
+    if os.getenv("EMBEDDING_CACHE_ENABLED", "true").lower() not in ("1", "true", "yes"):
+        return None
+
+    local = SQLiteStore(
+        os.getenv("EMBEDDING_CACHE_PATH", os.path.join(os.path.dirname(__file__), "embedding_cache.sqlite3")),
+        table="embeddings",
+        value_column="embedding",
+        value_type="BLOB",
+        max_entries=int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "100000"))
+    )
+
+    shared = None
+    if os.getenv("EMBEDDING_CACHE_POSTGRES", "false").lower() in ("1", "true", "yes"):
+        from .database import engine
+
+        shared = PostgresStore(
+            engine,
+            table="embedding_cache",
+            value_column="embedding",
+            value_type="BYTEA",
+            max_entries=int(os.getenv("EMBEDDING_CACHE_POSTGRES_MAX_ENTRIES", "1000000"))
+        )
+
+    return EmbeddingCache(model, local, shared)
@@ -3,10 +3,14 @@ Embedding service using Azure OpenAI
 Generates vector embeddings for text content
 """
 import os
-from openai import AzureOpenAI
+import time
+from openai import AzureOpenAI, BadRequestError
 from dotenv import load_dotenv
 import logging
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
+
+from .embedding_batches import EmbeddingBatcher
+from .rate_limiter import RETRYABLE_ERRORS, retry_delay
 
 load_dotenv()
 
@@ -19,19 +23,64 @@ class EmbeddingService:
 
     def __init__(self):
         """Initialize Azure OpenAI client"""
+        # Retries are handled in _embed_batch
         self.client = AzureOpenAI(
             api_key=os.getenv("AZURE_OPENAI_API_KEY"),
             api_version=os.getenv("AZURE_OPENAI_API_VERSION", "2024-10-21"),
-            azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT")
+            azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT"),
+            max_retries=0
         )
 
-        self.embedding_model = os.getenv(
-            "AZURE_OPENAI_EMBEDDING_DEPLOYMENT_FAST",
-            "text-embedding-3-small"
-        )
+        # Text preparation, batch packing and the embedding cache
+        self.batcher = EmbeddingBatcher()
+        self.embedding_model = self.batcher.embedding_model
+
+        # Retries of throttled, timed-out or 5xx requests, with backoff
+        self.max_retries = int(os.getenv("EMBEDDING_MAX_RETRIES", "6"))
 
         logger.info(f"Initialized EmbeddingService with model: {self.embedding_model}")
 
+    def _embed_batch(self, batch: List[Tuple[int, str]]) -> Dict[int, Optional[List[float]]]:
+        """
+        Embed one packed batch with a single request
+
+        Throttling, timeouts and server errors are retried with backoff. A
+        rejected request (400) is split in half and each half retried, so a
+        bad item only fails itself rather than everything it was packed with.
+        Other errors (authentication, missing deployment) are raised.
+
+        Returns:
+            Mapping of input index to embedding (None for items that failed)
+        """
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = self.client.embeddings.create(
+                    input=[text for _, text in batch],
+                    model=self.embedding_model
+                )
+
+                # response.data carries the position of each input; don't rely on ordering
+                return {batch[item.index][0]: item.embedding for item in response.data}
+
+            except RETRYABLE_ERRORS as e:
+                if attempt == self.max_retries:
+                    logger.error(f"Embedding request for {len(batch)} texts still failing after {self.max_retries} retries: {str(e)}")
+                    return {idx: None for idx, _ in batch}
+                delay = retry_delay(e, attempt)
+                logger.warning(f"Embedding request failed ({type(e).__name__}, attempt {attempt+1}), retrying in {delay:.1f}s")
+                time.sleep(delay)
+
+            except BadRequestError as e:
+                if len(batch) == 1:
+                    logger.error(f"Error generating embedding for text {batch[0][0]}: {str(e)}")
+                    return {batch[0][0]: None}
+
+                logger.warning(f"Embedding request for {len(batch)} texts rejected ({str(e)}), splitting batch")
+                middle = len(batch) // 2
+                results = self._embed_batch(batch[:middle])
+                results.update(self._embed_batch(batch[middle:]))
+                return results
+
     def generate_embedding(self, text: str) -> Optional[List[float]]:
         """
         Generate embedding vector for a single text
@@ -40,58 +89,59 @@ class EmbeddingService:
             text: Text to generate embedding for
 
         Returns:
-            List of floats (1536 dimensions) or None if error
+            List of floats (1536 dimensions), or None if the text is empty, the
+            request was rejected (400) or it still failed after retries
+
+        Raises:
+            openai.APIError: Errors that retrying cannot fix, such as
+                authentication failures or a missing deployment
         """
         if not text or not text.strip():
             logger.warning("Empty text provided for embedding")
             return None
 
-        try:
-            # Truncate text if too long (max ~8000 tokens for text-embedding-3-small)
-            max_chars = 30000  # Rough estimate
-            if len(text) > max_chars:
-                logger.warning(f"Text too long ({len(text)} chars), truncating to {max_chars}")
-                text = text[:max_chars]
-
-            response = self.client.embeddings.create(
-                input=text,
-                model=self.embedding_model
-            )
-
-            embedding = response.data[0].embedding
+        embedding = self.generate_embeddings_batch([text])[0]
 
+        if embedding is not None:
             logger.info(f"Generated embedding with {len(embedding)} dimensions")
 
-            return embedding
-
-        except Exception as e:
-            logger.error(f"Error generating embedding: {str(e)}")
-            return None
+        return embedding
 
     def generate_embeddings_batch(self, texts: List[str]) -> List[Optional[List[float]]]:
         """
         Generate embeddings for multiple texts
 
+        Cached texts are served from the embedding cache and duplicates are
+        embedded once. The rest are packed into as few embeddings.create calls
+        as the per-request item and token limits allow, and results are
+        returned in input order.
+
         Args:
             texts: List of texts to generate embeddings for
 
         Returns:
-            List of embeddings (or None for failed items)
+            List of embeddings (or None for empty or failed items)
+
+        Raises:
+            openai.APIError: Errors that retrying cannot fix, such as
+                authentication failures or a missing deployment
         """
         if not texts:
             return []
 
-        embeddings = []
+        embeddings: List[Optional[List[float]]] = [None] * len(texts)
 
-        for idx, text in enumerate(texts):
-            try:
-                embedding = self.generate_embedding(text)
-                embeddings.append(embedding)
-                logger.info(f"Generated embedding {idx+1}/{len(texts)}")
+        items = self.batcher.prepare_items(texts)
+        to_embed, wanted = self.batcher.resolve_cached(items, embeddings)
+        batches = self.batcher.pack_batches(to_embed)
+
+        for batch_number, batch in enumerate(batches):
+            for idx, embedding in self._embed_batch(batch).items():
+                embeddings[idx] = embedding
+            logger.info(f"Embedded batch {batch_number+1}/{len(batches)} ({len(batch)} texts)")
 
-            except Exception as e:
-                logger.error(f"Error generating embedding for text {idx}: {str(e)}")
-                embeddings.append(None)
+        self.batcher.store_results(wanted, embeddings)
+        self.batcher.log_summary(items, embeddings, len(batches))
 
         return embeddings
 
@@ -0,0 +1,155 @@
+"""
+In-process article ingestion
+Turns Parallel Extract results into stored articles with embeddings; used by
+the HTTP endpoints, background jobs and ParallelUnifiedService
+"""
+import asyncio
+import logging
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from .async_embedding_service import get_async_embedding_service
+from .bulk_ingest import bulk_insert_articles
+from .embedding_service import get_embedding_service
+from .schemas import BatchProcessResponse, ParallelExtractBatch, ParallelExtractResult
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def article_text(result: ParallelExtractResult) -> Optional[str]:
+    """Main text for an extract result: the first excerpt, else truncated full content"""
+    if result.excerpts and len(result.excerpts) > 0:
+        return result.excerpts[0]
+    if result.full_content:
+        return result.full_content[:10000]  # Limit to 10k chars
+    return None
+
+
+def publish_date(result: ParallelExtractResult) -> Optional[datetime]:
+    """Parse publish_date if available"""
+    if not result.publish_date:
+        return None
+    try:
+        return datetime.fromisoformat(result.publish_date.replace('Z', '+00:00'))
+    except Exception as e:
+        logger.warning(f"Could not parse date {result.publish_date}: {e}")
+        return None
+
+
+# (index in batch, result, text content, date written)
+Prepared = Tuple[int, ParallelExtractResult, str, Optional[datetime]]
+
+
+def _prepare(batch: ParallelExtractBatch) -> Tuple[List[Prepared], List[str]]:
+    prepared = []
+    errors = []
+    for idx, result in enumerate(batch.results):
+        # Parallel returns excerpts as a list, we'll use the first one
+        text_content = article_text(result)
+        if not text_content:
+            errors.append(f"Result {idx}: No text content available")
+            continue
+
+        prepared.append((idx, result, text_content, publish_date(result)))
+    return prepared, errors
+
+
+def _store(
+    db: Session,
+    batch: ParallelExtractBatch,
+    prepared: List[Prepared],
+    embeddings: List[Optional[List[float]]],
+    errors: List[str]
+) -> BatchProcessResponse:
+    article_ids = []
+
+    # Write every article and its vector in one COPY instead of a flush per row
+    rows = [
+        {
+            "text": text_content,
+            "summary": result.title,  # Use title as summary
+            "relevance_score": batch.default_relevance_score,
+            "date_written": date_written,
+            "source": result.url,
+            "category_id": batch.default_category_id,
+            "vector": embedding
+        }
+        for (_, result, text_content, date_written), embedding in zip(prepared, embeddings)
+    ]
+
+    for (idx, result, _, _), (article_id, error) in zip(prepared, bulk_insert_articles(db, rows)):
+        if error:
+            error_msg = f"Result {idx} ({result.url}): {error}"
+            errors.append(error_msg)
+            logger.error(error_msg)
+        else:
+            article_ids.append(article_id)
+
+    # Commit all articles
+    db.commit()
+
+    logger.info(f"Successfully created {len(article_ids)} articles")
+
+    return BatchProcessResponse(
+        success=len(article_ids) > 0,
+        articles_created=len(article_ids),
+        article_ids=article_ids,
+        errors=errors
+    )
+
+
+async def ingest_extract_batch(batch: ParallelExtractBatch, db: Session) -> BatchProcessResponse:
+    """
+    Embed and store a batch of Parallel Extract results
+
+    Maps excerpts[0] (or truncated full_content) -> article.text,
+    url -> article.source and publish_date -> article.date_written.
+    Per-result problems are reported in errors; anything else rolls the
+    transaction back and is raised.
+
+    Args:
+        batch: Extract results plus default category and relevance score
+        db: Database session (committed on success)
+
+    Returns:
+        BatchProcessResponse with created article ids and per-result errors
+    """
+    try:
+        prepared, errors = _prepare(batch)
+
+        # Generate embeddings for every article in as few requests as possible
+        embedding_service = get_async_embedding_service()
+        embeddings = await embedding_service.generate_embeddings_batch([text for _, _, text, _ in prepared])
+
+        return await asyncio.to_thread(_store, db, batch, prepared, embeddings, errors)
+
+    except Exception:
+        db.rollback()
+        raise
+
+
+def ingest_extract_batch_sync(batch: ParallelExtractBatch, db: Session) -> BatchProcessResponse:
+    """
+    Blocking counterpart of ingest_extract_batch for callers without an event loop
+
+    Uses the synchronous EmbeddingService (same batching and cache), so it
+    can be called from scripts and ParallelUnifiedService directly.
+
+    Args:
+        batch: Extract results plus default category and relevance score
+        db: Database session (committed on success)
+
+    Returns:
+        BatchProcessResponse with created article ids and per-result errors
+    """
+    try:
+        prepared, errors = _prepare(batch)
+        embeddings = get_embedding_service().generate_embeddings_batch([text for _, _, text, _ in prepared])
+        return _store(db, batch, prepared, embeddings, errors)
+
+    except Exception:
+        db.rollback()
+        raise
@@ -0,0 +1,210 @@
+"""
+Durable background job queue
+Jobs live in a `jobs` table in Postgres (claimed with FOR UPDATE SKIP LOCKED)
+or, for local development, in a SQLite file; worker processes claim and run them
+"""
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import create_engine, select, update
+from sqlalchemy.orm import sessionmaker
+
+from .models import Job
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+JOB_STATUSES = ("queued", "running", "succeeded", "failed")
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class JobStore:
+    """
+    Job table access for the API (enqueue, status) and workers (claim, progress, finish)
+
+    The same statements run on Postgres and SQLite. On Postgres the claim
+    subquery locks its row with SKIP LOCKED so concurrent workers never
+    block on or double-claim a job; SQLite serializes writers, so a single
+    UPDATE ... RETURNING is already atomic.
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.Session = sessionmaker(bind=engine, expire_on_commit=False)
+        Job.__table__.create(bind=engine, checkfirst=True)
+
+    def enqueue(self, kind: str, payload: Dict[str, Any], max_attempts: int = 1) -> Job:
+        """Add a job and return it (status "queued")"""
+        now = _now()
+        job = Job(
+            kind=kind,
+            status="queued",
+            payload=payload,
+            progress=0.0,
+            attempts=0,
+            max_attempts=max_attempts,
+            created_at=now,
+            run_after=now
+        )
+        with self.Session() as session:
+            session.add(job)
+            session.commit()
+        logger.info(f"Enqueued job {job.id} ({kind})")
+        return job
+
+    def claim(self, worker_id: str) -> Optional[Job]:
+        """Atomically take the oldest runnable queued job, or return None"""
+        now = _now()
+        next_job = (
+            select(Job.id)
+            .where(Job.status == "queued", Job.run_after <= now)
+            .order_by(Job.id)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        with self.Session() as session:
+            job_id = session.execute(
+                update(Job)
+                .where(Job.id == next_job, Job.status == "queued")
+                .values(
+                    status="running",
+                    worker_id=worker_id,
+                    attempts=Job.attempts + 1,
+                    started_at=now,
+                    heartbeat_at=now,
+                    message="Started"
+                )
+                .returning(Job.id)
+            ).scalar()
+            session.commit()
+
+            if job_id is None:
+                return None
+            return session.get(Job, job_id)
+
+    def heartbeat(self, job_id: int, worker_id: str) -> None:
+        with self.Session() as session:
+            session.execute(
+                update(Job)
+                .where(Job.id == job_id, Job.worker_id == worker_id, Job.status == "running")
+                .values(heartbeat_at=_now())
+            )
+            session.commit()
+
+    def set_progress(self, job_id: int, worker_id: str, progress: float, message: Optional[str] = None) -> bool:
+        """Record progress; returns False (and changes nothing) if worker_id no longer holds the job"""
+        with self.Session() as session:
+            updated = session.execute(
+                update(Job)
+                .where(Job.id == job_id, Job.worker_id == worker_id, Job.status == "running")
+                .values(progress=max(0.0, min(100.0, progress)), message=message, heartbeat_at=_now())
+            ).rowcount
+            session.commit()
+        return updated > 0
+
+    def complete(self, job_id: int, worker_id: str, result: Dict[str, Any]) -> bool:
+        """Mark the job succeeded; returns False (and changes nothing) if worker_id no longer holds it"""
+        with self.Session() as session:
+            updated = session.execute(
+                update(Job)
+                .where(Job.id == job_id, Job.worker_id == worker_id, Job.status == "running")
+                .values(status="succeeded", result=result, progress=100.0, message="Done", finished_at=_now())
+            ).rowcount
+            session.commit()
+        if not updated:
+            logger.warning(f"Job {job_id} finished on {worker_id}, which no longer holds it; result discarded")
+        return updated > 0
+
+    def fail(self, job_id: int, worker_id: str, error: str, retry_delay_seconds: float = 30.0) -> str:
+        """
+        Record a failed attempt; requeue the job if it has attempts left
+
+        Only applies while worker_id still holds the running job, so a worker
+        whose job was requeued as stale (and maybe claimed by another worker)
+        cannot overwrite it.
+
+        Returns:
+            The job's new status ("queued" or "failed"), or its unchanged
+            status if worker_id no longer holds it
+        """
+        now = _now()
+        with self.Session() as session:
+            job = session.get(Job, job_id, with_for_update=True)
+            if job is None:
+                return "failed"
+            if job.worker_id != worker_id or job.status != "running":
+                logger.warning(f"Job {job_id} failed on {worker_id}, which no longer holds it; left {job.status}")
+                return job.status
+
+            job.error = error
+            if job.attempts < job.max_attempts:
+                job.status = "queued"
+                job.worker_id = None
+                job.run_after = now + timedelta(seconds=retry_delay_seconds * job.attempts)
+                job.message = f"Retrying after attempt {job.attempts} failed"
+            else:
+                job.status = "failed"
+                job.finished_at = now
+                job.message = "Failed"
+            session.commit()
+            return job.status
+
+    def requeue_stale(self, stale_after_seconds: float) -> int:
+        """Fail or requeue running jobs whose worker stopped sending heartbeats"""
+        cutoff = _now() - timedelta(seconds=stale_after_seconds)
+        with self.Session() as session:
+            stale = session.execute(
+                select(Job.id, Job.worker_id).where(Job.status == "running", Job.heartbeat_at < cutoff)
+            ).all()
+
+        for job_id, worker_id in stale:
+            status = self.fail(job_id, worker_id, f"Worker stopped responding (no heartbeat for {stale_after_seconds:.0f}s)", 0)
+            logger.warning(f"Job {job_id} was abandoned by its worker, now {status}")
+        return len(stale)
+
+    def get(self, job_id: int) -> Optional[Job]:
+        with self.Session() as session:
+            return session.get(Job, job_id)
+
+    def list(self, status: Optional[str] = None, limit: int = 50) -> List[Job]:
+        query = select(Job).order_by(Job.id.desc()).limit(limit)
+        if status:
+            query = query.where(Job.status == status)
+        with self.Session() as session:
+            return list(session.execute(query).scalars().all())
+
+
+# Global singleton instance
+_job_store = None
+
+
+def get_job_store() -> JobStore:
+    """
+    Get or create the job store singleton
+
+    JOB_STORE=postgres (default) uses the articles database; JOB_STORE=sqlite
+    uses JOB_SQLITE_PATH for running the API and workers locally.
+
+    Returns:
+        JobStore instance
+    """
+    global _job_store
+
+    if _job_store is None:
+        backend = os.getenv("JOB_STORE", "postgres").lower()
+        if backend == "sqlite":
+            path = os.getenv("JOB_SQLITE_PATH", os.path.join(os.path.dirname(__file__), "jobs.sqlite3"))
+            engine = create_engine(f"sqlite:///{path}", connect_args={"timeout": 30})
+        elif backend == "postgres":
+            from .database import engine
+        else:
+            raise ValueError(f"Unknown JOB_STORE {backend!r}; expected 'postgres' or 'sqlite'")
+        _job_store = JobStore(engine)
+
+    return _job_store
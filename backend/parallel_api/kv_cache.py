@@ -0,0 +1,329 @@
+"""
+Two-tier key/value cache
+A local SQLite tier in front of an optional shared Postgres tier, each kept
+near max_entries least recently used rows; the embedding and summary caches
+are built from it
+"""
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# A trim evicts down to this fraction of max_entries, so the next one is many writes away
+TRIM_TO = 0.9
+
+# Reads refresh last_used only when it is older than this, so most hits write nothing
+TOUCH_AFTER_SECONDS = 3600.0
+
+
+class SQLiteStore:
+    """
+    Local cache tier in a SQLite file
+
+    Row count is tracked with a counter (read once at open, bumped per write),
+    so the LRU trim only runs once the counter passes max_entries.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        table: str,
+        value_column: str,
+        value_type: str = "BLOB",
+        max_entries: int = 100_000,
+        touch_after: float = TOUCH_AFTER_SECONDS
+    ):
+        self.path = path
+        self.table = table
+        self.value_column = value_column
+        self.max_entries = max_entries
+        self.touch_after = touch_after
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {table} (
+                key TEXT PRIMARY KEY,
+                {value_column} {value_type} NOT NULL,
+                last_used REAL NOT NULL
+            )
+        """)
+        self._conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_last_used ON {table}(last_used)")
+        self._conn.commit()
+        self._count = self._conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+    def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        if not keys:
+            return {}
+
+        found = {}
+        stale = []
+        cutoff = time.time() - self.touch_after
+        with self._lock:
+            # Stay under SQLite's bound-parameter limit
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, {self.value_column}, last_used FROM {self.table} WHERE key IN ({placeholders})",
+                    chunk
+                ).fetchall()
+                for key, value, last_used in rows:
+                    found[key] = value
+                    if last_used < cutoff:
+                        stale.append(key)
+
+            if stale:
+                now = time.time()
+                self._conn.executemany(
+                    f"UPDATE {self.table} SET last_used = ? WHERE key = ?",
+                    [(now, key) for key in stale]
+                )
+                self._conn.commit()
+
+        return found
+
+    def put_many(self, entries: Dict[str, Any]) -> int:
+        """Store entries, trimming least recently used rows once over the bound; returns rows evicted"""
+        if not entries:
+            return 0
+
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO {self.table} (key, {self.value_column}, last_used) VALUES (?, ?, ?)",
+                [(key, value, now) for key, value in entries.items()]
+            )
+            # Replacements count too, so the counter can only run ahead of the table
+            self._count += len(entries)
+            evicted = self._trim() if self._count > self.max_entries else 0
+            self._conn.commit()
+        return evicted
+
+    def _trim(self) -> int:
+        evicted = self._conn.execute(
+            f"""
+            DELETE FROM {self.table} WHERE key IN (
+                SELECT key FROM {self.table} ORDER BY last_used DESC LIMIT -1 OFFSET ?
+            )
+            """,
+            (int(self.max_entries * TRIM_TO),)
+        ).rowcount
+        self._count = self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+        return evicted
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+
+class PostgresStore:
+    """
+    Shared cache tier in a Postgres table, so every instance reuses the others' entries
+
+    Each process starts from the planner's row estimate and adds its own
+    writes; only when that passes max_entries is the table counted and, if
+    it really is over, trimmed.
+    """
+
+    def __init__(
+        self,
+        engine,
+        table: str,
+        value_column: str,
+        value_type: str = "BYTEA",
+        max_entries: int = 1_000_000,
+        touch_after: float = TOUCH_AFTER_SECONDS
+    ):
+        from sqlalchemy import text
+
+        self._text = text
+        self.engine = engine
+        self.table = table
+        self.value_column = value_column
+        self.max_entries = max_entries
+        self.touch_after = touch_after
+        self._lock = threading.Lock()
+
+        with self.engine.begin() as conn:
+            conn.execute(text(f"""
+                CREATE TABLE IF NOT EXISTS {table} (
+                    key TEXT PRIMARY KEY,
+                    {value_column} {value_type} NOT NULL,
+                    last_used TIMESTAMPTZ NOT NULL DEFAULT NOW()
+                )
+            """))
+            conn.execute(text(f"CREATE INDEX IF NOT EXISTS idx_{table}_last_used ON {table}(last_used)"))
+            # reltuples is -1 until the table is first analyzed
+            self._estimated_rows = max(0, conn.execute(
+                text("SELECT reltuples::bigint FROM pg_class WHERE relname = :table"),
+                {"table": table}
+            ).scalar() or 0)
+
+    def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        if not keys:
+            return {}
+
+        with self.engine.connect() as conn:
+            rows = conn.execute(
+                self._text(f"""
+                    SELECT key, {self.value_column}, last_used < NOW() - make_interval(secs => :touch_after)
+                    FROM {self.table}
+                    WHERE key = ANY(:keys)
+                """),
+                {"keys": keys, "touch_after": self.touch_after}
+            ).fetchall()
+
+        stale = [key for key, _, is_stale in rows if is_stale]
+        if stale:
+            with self.engine.begin() as conn:
+                conn.execute(
+                    self._text(f"UPDATE {self.table} SET last_used = NOW() WHERE key = ANY(:keys)"),
+                    {"keys": stale}
+                )
+
+        return {key: bytes(value) if isinstance(value, memoryview) else value for key, value, _ in rows}
+
+    def put_many(self, entries: Dict[str, Any]) -> int:
+        """Store entries, trimming least recently used rows once over the bound; returns rows evicted"""
+        if not entries:
+            return 0
+
+        with self.engine.begin() as conn:
+            conn.execute(
+                self._text(f"""
+                    INSERT INTO {self.table} (key, {self.value_column}) VALUES (:key, :value)
+                    ON CONFLICT (key) DO UPDATE SET {self.value_column} = EXCLUDED.{self.value_column}, last_used = NOW()
+                """),
+                [{"key": key, "value": value} for key, value in entries.items()]
+            )
+
+        with self._lock:
+            self._estimated_rows += len(entries)
+            if self._estimated_rows <= self.max_entries:
+                return 0
+
+        with self.engine.begin() as conn:
+            rows = conn.execute(self._text(f"SELECT COUNT(*) FROM {self.table}")).scalar()
+            evicted = 0
+            if rows > self.max_entries:
+                evicted = conn.execute(
+                    self._text(f"""
+                        DELETE FROM {self.table} WHERE key IN (
+                            SELECT key FROM {self.table} ORDER BY last_used DESC OFFSET :keep
+                        )
+                    """),
+                    {"keep": int(self.max_entries * TRIM_TO)}
+                ).rowcount
+
+        with self._lock:
+            self._estimated_rows = rows - evicted
+        return evicted
+
+    def count(self) -> int:
+        with self.engine.connect() as conn:
+            return conn.execute(self._text(f"SELECT COUNT(*) FROM {self.table}")).scalar()
+
+
+class TwoTierCache:
+    """
+    Local tier with an optional shared tier behind it
+
+    Lookups go to the local tier first and then to the shared tier; shared
+    hits are copied into the local tier. New values are written to both.
+    encode and decode convert values to and from what the stores hold.
+    """
+
+    def __init__(
+        self,
+        local: SQLiteStore,
+        shared: Optional[PostgresStore] = None,
+        encode: Optional[Callable[[Any], Any]] = None,
+        decode: Optional[Callable[[Any], Any]] = None,
+        name: str = "cache"
+    ):
+        self.local = local
+        self.shared = shared
+        self.name = name
+        self._encode = encode or (lambda value: value)
+        self._decode = decode or (lambda value: value)
+
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._shared_hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """
+        Look up values by key
+
+        Returns:
+            Mapping of key to cached value for the keys that were found
+        """
+        keys = list(set(keys))
+        found = self.local.get_many(keys)
+        local_hits = len(found)
+
+        if self.shared is not None and len(found) < len(keys):
+            missing = [key for key in keys if key not in found]
+            try:
+                shared_found = self.shared.get_many(missing)
+            except Exception as e:
+                logger.warning(f"Shared {self.name} cache lookup failed: {str(e)}")
+                shared_found = {}
+            if shared_found:
+                evicted = self.local.put_many(shared_found)
+                found.update(shared_found)
+                with self._lock:
+                    self._evictions += evicted
+
+        with self._lock:
+            self._hits += local_hits
+            self._shared_hits += len(found) - local_hits
+            self._misses += len(keys) - len(found)
+
+        return {key: self._decode(value) for key, value in found.items()}
+
+    def get(self, key: str) -> Optional[Any]:
+        return self.get_many([key]).get(key)
+
+    def put_many(self, values: Dict[str, Any]) -> None:
+        """Store values by key (None values are skipped)"""
+        entries = {key: self._encode(value) for key, value in values.items() if value is not None}
+        evicted = self.local.put_many(entries)
+
+        if self.shared is not None:
+            try:
+                self.shared.put_many(entries)
+            except Exception as e:
+                logger.warning(f"Shared {self.name} cache write failed: {str(e)}")
+
+        with self._lock:
+            self._evictions += evicted
+
+    def put(self, key: str, value: Any) -> None:
+        self.put_many({key: value})
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self._hits + self._shared_hits + self._misses
+            return {
+                "local_entries": self.local.count(),
+                "max_entries": self.local.max_entries,
+                "hits": self._hits,
+                "shared_hits": self._shared_hits,
+                "misses": self._misses,
+                "hit_rate": round((self._hits + self._shared_hits) / lookups, 4) if lookups else 0.0,
+                "evictions": self._evictions,
+                "shared_enabled": self.shared is not None,
+            }
@@ -1,41 +1,34 @@
 """
 FastAPI application for processing Parallel Extract API results and storing in PostgreSQL
 """
-from fastapi import FastAPI, Depends, HTTPException, status
+from fastapi import FastAPI, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List
-from datetime import datetime
+from typing import List, Optional
+from datetime import datetime, timedelta, timezone
+import asyncio
 import logging
-import os
-import sys
 
 # Use relative imports for parallel_api modules
 from .database import get_db, engine
-from .models import Base, Article
+from .models import Base, Article, WorkflowRun
 from .schemas import (
     ArticleCreate,
     ArticleResponse,
     ParallelExtractBatch,
     BatchProcessResponse,
-    ParallelExtractResult,
     NewsWithAudioRequest,
-    NewsWithAudioResponse,
-    ArticleAudioInfo
+    JobResponse,
+    WorkflowRunResponse,
+    WorkflowLatencyResponse
 )
-from .embedding_service import get_embedding_service
-from .summarization_service import get_summarization_service
-from .parallel_unified_service import ParallelUnifiedService
-
-# Add parent directory to path to import TTS service from backend
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
-
-# Import TTS service from backend
-try:
-    from services.tts_service import tts_service
-except ImportError:
-    logger = logging.getLogger(__name__)
-    logger.warning("Could not import tts_service from backend. Audio generation will not be available.")
-    tts_service = None
+from .async_embedding_service import get_async_embedding_service
+from .async_summarization_service import get_async_summarization_service
+from .ingest import ingest_extract_batch
+from .jobs import get_job_store
+from .sources import ensure_source_index
+from .stream_ingest import ingest_ndjson
+from .workflow_timing import stage_latency_percentiles
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -54,6 +47,7 @@ async def startup_event():
     """Create tables on startup if they don't exist"""
     logger.info("Creating database tables if they don't exist...")
     Base.metadata.create_all(bind=engine)
+    ensure_source_index(engine)
     logger.info("Database tables ready")
 
 
@@ -67,6 +61,18 @@ async def root():
     }
 
 
+@app.get("/embeddings/stats")
+async def embedding_stats():
+    """Throughput and throttling counters for the async embedding client"""
+    return get_async_embedding_service().stats()
+
+
+@app.get("/summaries/stats")
+async def summary_stats():
+    """Throughput, throttling and summary cache counters for the async summarization client"""
+    return get_async_summarization_service().stats()
+
+
 @app.post("/articles/", response_model=ArticleResponse, status_code=status.HTTP_201_CREATED)
 async def create_article(article: ArticleCreate, db: Session = Depends(get_db)):
     """
@@ -74,8 +80,8 @@ async def create_article(article: ArticleCreate, db: Session = Depends(get_db)):
     """
     try:
         # Generate embedding for the text
-        embedding_service = get_embedding_service()
-        embedding = embedding_service.generate_embedding(article.text)
+        embedding_service = get_async_embedding_service()
+        embedding = await embedding_service.generate_embedding(article.text)
 
         # Create article with embedding
         article_dict = article.model_dump()
@@ -111,76 +117,10 @@ async def process_parallel_extract_batch(
     - url -> article.source
     - publish_date -> article.date_written
     """
-    created_articles = []
-    article_ids = []
-    errors = []
-
     try:
-        for idx, result in enumerate(batch.results):
-            try:
-                # Extract the first excerpt as the main text
-                # Parallel returns excerpts as a list, we'll use the first one
-                text_content = None
-
-                if result.excerpts and len(result.excerpts) > 0:
-                    text_content = result.excerpts[0]
-                elif result.full_content:
-                    # If no excerpts, use full_content (truncate if too long)
-                    text_content = result.full_content[:10000]  # Limit to 10k chars
-                else:
-                    errors.append(f"Result {idx}: No text content available")
-                    continue
-
-                # Parse publish_date if available
-                date_written = None
-                if result.publish_date:
-                    try:
-                        date_written = datetime.fromisoformat(result.publish_date.replace('Z', '+00:00'))
-                    except Exception as e:
-                        logger.warning(f"Could not parse date {result.publish_date}: {e}")
-
-                # Generate embedding for the text
-                embedding_service = get_embedding_service()
-                embedding = embedding_service.generate_embedding(text_content)
-
-                # Create article with embedding
-                article = Article(
-                    text=text_content,
-                    summary=result.title,  # Use title as summary
-                    relevance_score=batch.default_relevance_score,
-                    date_written=date_written,
-                    source=result.url,
-                    category_id=batch.default_category_id,
-                    vector=embedding
-                )
-
-                db.add(article)
-                db.flush()  # Flush to get the ID
-
-                created_articles.append(article)
-                article_ids.append(article.id)
-
-                logger.info(f"Prepared article {article.id} from {result.url}")
-
-            except Exception as e:
-                error_msg = f"Result {idx} ({result.url if hasattr(result, 'url') else 'unknown'}): {str(e)}"
-                errors.append(error_msg)
-                logger.error(error_msg)
-
-        # Commit all articles
-        db.commit()
-
-        logger.info(f"Successfully created {len(created_articles)} articles")
-
-        return BatchProcessResponse(
-            success=len(created_articles) > 0,
-            articles_created=len(created_articles),
-            article_ids=article_ids,
-            errors=errors
-        )
+        return await ingest_extract_batch(batch, db)
 
     except Exception as e:
-        db.rollback()
         logger.error(f"Batch processing error: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -188,6 +128,33 @@ async def process_parallel_extract_batch(
         )
 
 
+@app.post("/articles/stream/")
+async def stream_parallel_extract_results(
+    request: Request,
+    category_id: Optional[int] = Query(None, description="Category for all articles"),
+    relevance_score: int = Query(5, ge=1, le=10, description="Relevance score for all articles"),
+    batch_size: int = Query(64, ge=1, le=1000, description="Records embedded and inserted together")
+):
+    """
+    Stream Parallel Extract results as NDJSON and create articles
+
+    The body is newline-delimited ParallelExtractResult records (Content-Type:
+    application/x-ndjson). Records are embedded and inserted in batches as they
+    arrive, with bounded queues between stages, and the response streams one
+    JSON line per record ({"line", "url", "article_id", "error"}) followed by a
+    {"summary": ...} line. Batches are committed as they complete.
+    """
+    return StreamingResponse(
+        ingest_ndjson(
+            request.stream(),
+            category_id=category_id,
+            relevance_score=relevance_score,
+            batch_size=batch_size
+        ),
+        media_type="application/x-ndjson"
+    )
+
+
 @app.get("/articles/", response_model=List[ArticleResponse])
 async def get_articles(
     skip: int = 0,
@@ -237,204 +204,127 @@ async def delete_article(article_id: int, db: Session = Depends(get_db)):
     return None
 
 
-@app.post("/news/generate-with-audio", response_model=NewsWithAudioResponse)
-async def generate_news_with_audio(request: NewsWithAudioRequest, db: Session = Depends(get_db)):
+@app.post(
+    "/news/generate-with-audio",
+    response_model=JobResponse,
+    status_code=status.HTTP_202_ACCEPTED
+)
+async def generate_news_with_audio(request: NewsWithAudioRequest):
     """
-    Complete workflow: Search → Extract → Summarize → Generate Audio → Store
+    Queue the complete workflow: Search → Extract → Summarize → Generate Audio → Store
 
-    This endpoint:
+    The workflow:
     1. Uses Parallel Search API to find relevant articles
     2. Uses Parallel Extract API to get full content
     3. Uses Azure OpenAI to create 2-minute summaries
     4. Uses ElevenLabs to generate audio for each summary
     5. Stores articles with embeddings in the database
 
-    Returns article metadata and paths to generated audio files
+    It runs on a background worker (`python -m parallel_api.worker`). This
+    returns the job right away; poll GET /jobs/{job_id} for progress, and the
+    NewsWithAudioResponse is in `result` once the job has succeeded.
     """
-    if not tts_service:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="Text-to-speech service is not available"
-        )
+    logger.info(f"Queueing news with audio generation for query: '{request.query}'")
+    store = get_job_store()
+    return await asyncio.to_thread(store.enqueue, "news_with_audio", request.model_dump(mode="json"))
 
-    logger.info(f"Starting news with audio generation for query: '{request.query}'")
 
-    response_data = {
-        "success": False,
-        "query": request.query,
-        "articles_found": 0,
-        "articles_processed": 0,
-        "articles_with_audio": 0,
-        "articles": [],
-        "errors": []
-    }
+@app.post("/news/stream-audio")
+async def stream_news_audio_endpoint(request: NewsWithAudioRequest):
+    """
+    Run the news workflow and stream the narration as MP3 while it is generated
+
+    Unlike /news/generate-with-audio this runs in the request: each summary
+    is streamed from Azure OpenAI and voiced sentence by sentence, so a
+    player can start within a second or two of the first summary token.
+    Articles are still saved to generated_audio/ and stored with embeddings.
+    """
+    from .news_workflow import AudioUnavailableError, stream_news_audio
 
     try:
-        # Step 1 & 2: Search and Extract using Parallel API
-        logger.info("Step 1-2: Searching and extracting articles with Parallel API...")
-
-        parallel_service = ParallelUnifiedService(api_url="http://localhost:8000")
-
-        # For AI/ML/Startup news, we'll use the query with additional search queries
-        search_queries = [
-            request.query,
-            "AI artificial intelligence",
-            "machine learning ML",
-            "startups technology",
-            "agentic AI systems",
-            "MCP model context protocol",
-            "HITL human in the loop",
-            "reinforcement learning RL"
-        ]
-
-        from parallel import Parallel
-        parallel_client = Parallel(api_key=os.environ.get("PARALLEL_API_KEY"))
-
-        # Search
-        search_result = parallel_client.beta.search(
-            objective=request.query,
-            search_queries=search_queries[:4],  # Limit to 4 queries
-            max_results=request.max_articles,
-            excerpts={"max_chars_per_result": 8000}
-        )
+        audio = stream_news_audio(request)
+    except AudioUnavailableError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
+
+    return StreamingResponse(
+        audio,
+        media_type="audio/mpeg",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 
-        response_data["articles_found"] = len(search_result.results)
-        logger.info(f"✓ Found {response_data['articles_found']} articles")
+@app.post(
+    "/articles/batch/jobs",
+    response_model=JobResponse,
+    status_code=status.HTTP_202_ACCEPTED
+)
+async def queue_parallel_extract_batch(batch: ParallelExtractBatch):
+    """
+    Queue a batch of Parallel Extract results for background ingestion
+
+    Same processing as POST /articles/batch/; the BatchProcessResponse is in
+    the job's `result` once it has succeeded.
+    """
+    store = get_job_store()
+    return await asyncio.to_thread(store.enqueue, "ingest_batch", batch.model_dump(mode="json"), 3)
 
-        if not search_result.results:
-            response_data["errors"].append("No articles found")
-            return NewsWithAudioResponse(**response_data)
 
-        # Extract
-        urls = [r.url for r in search_result.results][:request.max_articles]
-        extract_result = parallel_client.beta.extract(
-            urls=urls,
-            objective=f"Extract detailed content for: {request.query}",
-            excerpts={"max_chars_per_result": 50000},
-            full_content=True
+@app.get("/jobs/{job_id}", response_model=JobResponse)
+async def get_job(job_id: int):
+    """
+    Get a background job's status, progress and result
+    """
+    job = await asyncio.to_thread(get_job_store().get, job_id)
+
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job with ID {job_id} not found"
         )
 
-        logger.info(f"✓ Extracted {len(extract_result.results)} articles")
-
-        if not extract_result.results:
-            response_data["errors"].append("No content extracted")
-            return NewsWithAudioResponse(**response_data)
-
-        # Step 3-5: Process each article (Summarize → Audio → Store)
-        summarization_service = get_summarization_service()
-        embedding_service = get_embedding_service()
-
-        output_dir = os.path.join(os.path.dirname(__file__), "..", "generated_audio")
-        os.makedirs(output_dir, exist_ok=True)
-
-        for idx, result in enumerate(extract_result.results):
-            try:
-                # Get full text
-                text_content = None
-                if result.excerpts and len(result.excerpts) > 0:
-                    text_content = result.excerpts[0]
-                elif result.full_content:
-                    text_content = result.full_content[:10000]
-                else:
-                    response_data["errors"].append(f"Article {idx}: No text content")
-                    continue
-
-                # Step 3: Generate 2-minute summary using Azure OpenAI
-                logger.info(f"Generating {request.target_duration_minutes}-minute summary for article {idx+1}...")
-                summary_text = summarization_service.create_audio_summary(
-                    text=text_content,
-                    title=result.title or "",
-                    target_duration_minutes=request.target_duration_minutes
-                )
-
-                if not summary_text:
-                    response_data["errors"].append(f"Article {idx}: Failed to generate summary")
-                    continue
-
-                word_count = len(summary_text.split())
-                logger.info(f"✓ Generated summary with {word_count} words")
-
-                # Step 4: Generate audio from summary using ElevenLabs
-                logger.info(f"Generating audio for article {idx+1}...")
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                audio_filename = f"article_{idx+1}_{timestamp}.mp3"
-
-                audio_path = tts_service.generate_audio_from_text(
-                    text=summary_text,
-                    output_dir=output_dir,
-                    filename=audio_filename,
-                    voice_id=request.voice_id
-                )
-
-                logger.info(f"✓ Generated audio: {audio_filename}")
-
-                # Step 5: Store article in database with embedding
-                logger.info(f"Storing article {idx+1} in database...")
-
-                # Parse publish date
-                date_written = None
-                if result.publish_date:
-                    try:
-                        date_written = datetime.fromisoformat(result.publish_date.replace('Z', '+00:00'))
-                    except Exception as e:
-                        logger.warning(f"Could not parse date: {e}")
-
-                # Generate embedding from original text (not summary)
-                embedding = embedding_service.generate_embedding(text_content)
-
-                # Create article
-                article = Article(
-                    text=text_content,  # Store full text
-                    summary=summary_text,  # Store the 2-minute summary
-                    relevance_score=request.relevance_score,
-                    date_written=date_written,
-                    source=result.url,  # URL stored in source field
-                    category_id=request.category_id,
-                    vector=embedding
-                )
-
-                db.add(article)
-                db.flush()
-
-                logger.info(f"✓ Stored article {article.id} from {result.url}")
-
-                # Add to response
-                response_data["articles"].append({
-                    "article_id": article.id,
-                    "title": result.title or "Untitled",
-                    "source": result.url,
-                    "audio_filename": audio_filename,
-                    "audio_path": audio_path,
-                    "summary_word_count": word_count
-                })
-
-                response_data["articles_with_audio"] += 1
-                response_data["articles_processed"] += 1
-
-            except Exception as e:
-                error_msg = f"Article {idx} ({result.url if hasattr(result, 'url') else 'unknown'}): {str(e)}"
-                response_data["errors"].append(error_msg)
-                logger.error(error_msg)
-
-        # Commit all articles
-        db.commit()
+    return job
 
-        response_data["success"] = response_data["articles_with_audio"] > 0
 
-        logger.info(f"✓ Complete! Processed {response_data['articles_with_audio']} articles with audio")
+@app.get("/jobs/", response_model=List[JobResponse])
+async def list_jobs(
+    status_filter: Optional[str] = Query(None, alias="status", description="queued, running, succeeded or failed"),
+    limit: int = Query(50, ge=1, le=500)
+):
+    """
+    List recent background jobs, newest first
+    """
+    return await asyncio.to_thread(get_job_store().list, status_filter, limit)
 
-        return NewsWithAudioResponse(**response_data)
 
-    except Exception as e:
-        db.rollback()
-        error_msg = f"Workflow error: {str(e)}"
-        response_data["errors"].append(error_msg)
-        logger.error(error_msg, exc_info=True)
+
+@app.get("/workflow-runs/stats", response_model=WorkflowLatencyResponse)
+async def workflow_run_stats(
+    kind: str = Query("news_with_audio"),
+    hours: float = Query(24 * 7, gt=0, description="Include runs started in the last N hours"),
+    db: Session = Depends(get_db)
+):
+    """
+    p50/p95/p99 latency of each workflow stage across stored runs
+    """
+    since = datetime.now(timezone.utc) - timedelta(hours=hours)
+    return await asyncio.to_thread(stage_latency_percentiles, db, kind, since)
+
+
+@app.get("/workflow-runs/{run_id}", response_model=WorkflowRunResponse)
+async def get_workflow_run(run_id: int, db: Session = Depends(get_db)):
+    """
+    Get a stored workflow run with its per-stage and per-article spans
+    """
+    run = db.query(WorkflowRun).filter(WorkflowRun.id == run_id).first()
+
+    if not run:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=str(e)
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Workflow run with ID {run_id} not found"
         )
 
+    return run
+
 
 if __name__ == "__main__":
     import uvicorn
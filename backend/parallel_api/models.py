@@ -1,7 +1,9 @@
 """
 SQLAlchemy models for articles database
 """
-from sqlalchemy import Column, Integer, String, Text, TIMESTAMP, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, TIMESTAMP, ForeignKey, Float, JSON, Index, Boolean
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from pgvector.sqlalchemy import Vector
 from .database import Base
@@ -16,6 +18,14 @@ class Category(Base):
     description = Column(Text)
 
 
+def _canonical_source(context):
+    """Canonical form of the inserted source URL (see sources.canonicalize_url)"""
+    from .sources import canonicalize_url
+
+    source = context.get_current_parameters().get("source")
+    return canonicalize_url(source) if source else None
+
+
 class Article(Base):
     """Article model matching your database schema"""
     __tablename__ = "articles"
@@ -31,9 +41,83 @@ class Article(Base):
         server_default=func.now()
     )
     source = Column(Text, nullable=True)
+    source_canonical = Column(Text, nullable=True, default=_canonical_source)  # Filled from source on insert
     category_id = Column(
         Integer,
         ForeignKey("categories.id", ondelete="SET NULL"),
         nullable=True
     )
     vector = Column(Vector(1536), nullable=True)  # pgvector for embeddings
+
+    __table_args__ = (
+        # Known-source lookups before extracting (see sources.py)
+        Index("idx_articles_source_canonical", "source_canonical"),
+    )
+
+
+class Job(Base):
+    """Background job (news generation, batch ingestion) claimed by worker processes"""
+    __tablename__ = "jobs"
+
+    id = Column(Integer, primary_key=True)
+    kind = Column(String, nullable=False)
+    status = Column(String, nullable=False, default="queued")  # queued, running, succeeded, failed
+    payload = Column(JSON().with_variant(JSONB, "postgresql"), nullable=False)
+    result = Column(JSON().with_variant(JSONB, "postgresql"), nullable=True)
+    error = Column(Text, nullable=True)
+    progress = Column(Float, nullable=False, default=0.0)  # 0-100
+    message = Column(Text, nullable=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=1)
+    worker_id = Column(String, nullable=True)
+    created_at = Column(TIMESTAMP(timezone=True), nullable=False)
+    run_after = Column(TIMESTAMP(timezone=True), nullable=False)
+    started_at = Column(TIMESTAMP(timezone=True), nullable=True)
+    heartbeat_at = Column(TIMESTAMP(timezone=True), nullable=True)
+    finished_at = Column(TIMESTAMP(timezone=True), nullable=True)
+
+    __table_args__ = (
+        # Workers claim the oldest runnable queued job
+        Index("idx_jobs_status_run_after", "status", "run_after", "id"),
+    )
+
+
+class WorkflowRun(Base):
+    """One run of the news-with-audio workflow, with its timing spans"""
+    __tablename__ = "workflow_runs"
+
+    id = Column(Integer, primary_key=True)
+    kind = Column(String, nullable=False)
+    query = Column(Text, nullable=True)
+    success = Column(Boolean, nullable=False, default=False)
+    error = Column(Text, nullable=True)
+    articles_processed = Column(Integer, nullable=False, default=0)
+    started_at = Column(TIMESTAMP(timezone=True), nullable=False)
+    duration_ms = Column(Float, nullable=False)
+
+    spans = relationship("WorkflowSpan", back_populates="run", cascade="all, delete-orphan")
+
+    __table_args__ = (
+        Index("idx_workflow_runs_kind_started_at", "kind", "started_at"),
+    )
+
+
+class WorkflowSpan(Base):
+    """Timing of one workflow stage, for the whole run or a single article"""
+    __tablename__ = "workflow_spans"
+
+    id = Column(Integer, primary_key=True)
+    run_id = Column(Integer, ForeignKey("workflow_runs.id", ondelete="CASCADE"), nullable=False)
+    stage = Column(String, nullable=False)  # search, extract, embed, summarize, audio, store, article
+    article_index = Column(Integer, nullable=True)  # None for run-level stages
+    start_ms = Column(Float, nullable=False)  # Offset from the start of the run
+    duration_ms = Column(Float, nullable=False)
+    error = Column(Text, nullable=True)
+    attributes = Column(JSON().with_variant(JSONB, "postgresql"), nullable=True)  # chars/tokens in and out
+
+    run = relationship("WorkflowRun", back_populates="spans")
+
+    __table_args__ = (
+        # Latency percentiles are computed per stage across runs
+        Index("idx_workflow_spans_stage_run_id", "stage", "run_id"),
+    )
@@ -0,0 +1,548 @@
+"""
+News with audio workflow
+Search → Extract → Summarize → Generate Audio → Store, runnable from a
+background job worker or directly
+"""
+import asyncio
+import logging
+import os
+import sys
+from datetime import datetime
+from typing import AsyncIterator, Callable, Optional
+
+from sqlalchemy.orm import Session
+
+from .async_embedding_service import get_async_embedding_service
+from .async_summarization_service import get_async_summarization_service
+from .database import SessionLocal
+from .ingest import article_text, publish_date
+from .models import Article
+from .pipeline import Stage
+from .schemas import NewsWithAudioRequest, NewsWithAudioResponse
+from .sources import dedupe_urls, extract_new_urls, min_excerpt_chars
+from .speech_stream import stream_summary_speech
+from .workflow_timing import WorkflowTrace, save_workflow_run
+
+# Add parent directory to path to import TTS service from backend
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+# Import TTS service from backend
+try:
+    from services.tts_service import tts_service
+except ImportError:
+    logger = logging.getLogger(__name__)
+    logger.warning("Could not import tts_service from backend. Audio generation will not be available.")
+    tts_service = None
+
+try:
+    from services.async_tts_service import async_tts_service
+except ImportError:
+    logger = logging.getLogger(__name__)
+    logger.warning("Could not import async_tts_service from backend. Audio streaming will not be available.")
+    async_tts_service = None
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Articles voiced at once (summaries are limited by SUMMARY_MAX_IN_FLIGHT)
+AUDIO_CONCURRENCY = int(os.getenv("NEWS_AUDIO_CONCURRENCY", "2"))
+
+# progress(percent, message)
+ProgressCallback = Callable[[float, str], None]
+
+
+class AudioUnavailableError(Exception):
+    """Raised when the text-to-speech service could not be imported"""
+
+
+def _save_run(trace: WorkflowTrace, query: str, response_data: dict, error: Optional[str]) -> int:
+    # Own session, so the run is kept even when the workflow's session rolls back
+    db = SessionLocal()
+    try:
+        return save_workflow_run(
+            db,
+            trace,
+            query=query,
+            success=response_data["success"],
+            error=error,
+            articles_processed=response_data["articles_processed"]
+        )
+    finally:
+        db.close()
+
+
+def _excerpt_chars(results) -> int:
+    return sum(
+        len(getattr(result, "full_content", None) or "")
+        + sum(len(excerpt) for excerpt in (getattr(result, "excerpts", None) or []))
+        for result in results
+    )
+
+
+def _search(parallel_client, request: NewsWithAudioRequest, trace: WorkflowTrace):
+    """Step 1: Parallel Search for the query and a few related topics"""
+    # For AI/ML/Startup news, we'll use the query with additional search queries
+    search_queries = [
+        request.query,
+        "AI artificial intelligence",
+        "machine learning ML",
+        "startups technology",
+        "agentic AI systems",
+        "MCP model context protocol",
+        "HITL human in the loop",
+        "reinforcement learning RL"
+    ]
+
+    with trace.span("search", queries=len(search_queries[:4]), chars_in=len(request.query)) as span:
+        search_result = parallel_client.beta.search(
+            objective=request.query,
+            search_queries=search_queries[:4],  # Limit to 4 queries
+            max_results=request.max_articles,
+            excerpts={"max_chars_per_result": 8000}
+        )
+        span.set(results=len(search_result.results), chars_out=_excerpt_chars(search_result.results))
+
+    return search_result
+
+
+def _extract(parallel_client, request: NewsWithAudioRequest, db: Session, trace: WorkflowTrace, search_result):
+    """Step 2: Parallel Extract for the search results that are not stored yet"""
+    # Extract only URLs we haven't stored yet (the search queries overlap, so dedupe first)
+    urls = dedupe_urls(r.url for r in search_result.results)[:request.max_articles]
+    with trace.span("extract", urls=len(urls)) as span:
+        # Adaptive: search excerpts long enough for the summary skip Extract
+        extract_result = extract_new_urls(
+            parallel_client,
+            urls,
+            objective=f"Extract detailed content for: {request.query}",
+            db=db,
+            search_results=search_result.results if request.adaptive_extract else None,
+            min_search_excerpt_chars=min_excerpt_chars(request.target_duration_minutes) if request.adaptive_extract else 0
+        )
+        span.set(
+            **extract_result.to_dict(),
+            results=len(extract_result.results),
+            chars_out=_excerpt_chars(extract_result.results)
+        )
+
+    return extract_result
+
+
+def _new_article(request: NewsWithAudioRequest, text_content: str, summary_text: str, result, embedding) -> Article:
+    return Article(
+        text=text_content,  # Store full text
+        summary=summary_text,  # Store the 2-minute summary
+        relevance_score=request.relevance_score,
+        date_written=publish_date(result),
+        source=result.url,  # URL stored in source field
+        category_id=request.category_id,
+        vector=embedding
+    )
+
+
+def _store_article(db: Session, article: Article) -> int:
+    """Insert and commit one article; blocking, so the streaming workflow runs it in a thread"""
+    db.add(article)
+    db.commit()
+    return article.id
+
+
+async def run_news_workflow(
+    request: NewsWithAudioRequest,
+    db: Session,
+    progress: Optional[ProgressCallback] = None
+) -> NewsWithAudioResponse:
+    """
+    Complete workflow: Search → Extract → Summarize → Generate Audio → Store
+
+    1. Uses Parallel Search API to find relevant articles
+    2. Uses Parallel Extract API to get full content
+    3. Uses Azure OpenAI to create 2-minute summaries
+    4. Uses ElevenLabs to generate audio for each summary
+    5. Stores articles with embeddings in the database
+
+    Args:
+        request: Query and per-article options
+        db: Database session (committed on success, rolled back on error)
+        progress: Optional callback receiving (percent, message) as stages finish
+
+    Every upstream call is timed (see workflow_timing.py); the spans are
+    returned in `timings` and stored in the workflow_runs table.
+
+    Returns:
+        Article metadata, paths to generated audio files and stage timings
+    """
+    if not tts_service:
+        raise AudioUnavailableError("Text-to-speech service is not available")
+
+    def report(percent: float, message: str) -> None:
+        if progress:
+            progress(round(percent, 1), message)
+
+    logger.info(f"Starting news with audio generation for query: '{request.query}'")
+
+    response_data = {
+        "success": False,
+        "query": request.query,
+        "articles_found": 0,
+        "articles_processed": 0,
+        "articles_with_audio": 0,
+        "articles": [],
+        "errors": []
+    }
+
+    trace = WorkflowTrace("news_with_audio")
+
+    async def record_run(error: Optional[str] = None) -> None:
+        response_data["timings"] = trace.to_dict()
+        try:
+            response_data["run_id"] = await asyncio.to_thread(_save_run, trace, request.query, response_data, error)
+        except Exception as e:
+            logger.warning(f"Could not store workflow run timings: {str(e)}")
+
+    try:
+        # Step 1 & 2: Search and Extract using Parallel API
+        logger.info("Step 1-2: Searching and extracting articles with Parallel API...")
+
+        from parallel import Parallel
+        parallel_client = Parallel(api_key=os.environ.get("PARALLEL_API_KEY"))
+
+        search_result = await asyncio.to_thread(_search, parallel_client, request, trace)
+
+        response_data["articles_found"] = len(search_result.results)
+        logger.info(f"✓ Found {response_data['articles_found']} articles")
+        report(10, f"Found {response_data['articles_found']} articles")
+
+        if not search_result.results:
+            response_data["errors"].append("No articles found")
+            await record_run()
+            return NewsWithAudioResponse(**response_data)
+
+        extract_result = await asyncio.to_thread(_extract, parallel_client, request, db, trace, search_result)
+
+        response_data["articles_skipped"] = extract_result.known
+        response_data["extraction"] = extract_result.to_dict()
+        logger.info(
+            f"✓ Extracted {len(extract_result.results)} articles "
+            f"({extract_result.cached} cached, {extract_result.from_search} from search excerpts, "
+            f"{extract_result.known} already stored)"
+        )
+        report(20, f"Extracted {len(extract_result.results)} articles")
+
+        if not extract_result.results:
+            if extract_result.known:
+                response_data["errors"].append(f"All {extract_result.known} articles found are already stored")
+            else:
+                response_data["errors"].append("No content extracted")
+            await record_run()
+            return NewsWithAudioResponse(**response_data)
+
+        # Step 3-5: Process each article (Summarize → Audio → Store)
+        summarization_service = get_async_summarization_service()
+        embedding_service = get_async_embedding_service()
+
+        output_dir = os.path.join(os.path.dirname(__file__), "..", "generated_audio")
+        os.makedirs(output_dir, exist_ok=True)
+
+        # Get full text for every article
+        results = extract_result.results
+        texts = [article_text(result) for result in results]
+        total = len(results)
+
+        # Embeddings come from the original text (not the summary), so they are
+        # generated in a few batched requests while the summaries are written
+        logger.info(f"Generating embeddings for {sum(1 for t in texts if t)} articles...")
+        async def embed_articles():
+            inputs = [t or "" for t in texts]
+            with trace.span(
+                "embed",
+                texts=sum(1 for t in inputs if t),
+                chars_in=sum(len(t) for t in inputs),
+                tokens_in_estimated=sum(embedding_service.batcher.estimate_tokens(t) for t in inputs if t)
+            ):
+                return await embedding_service.generate_embeddings_batch(inputs)
+
+        embeddings_task = asyncio.create_task(embed_articles())
+
+        summarize_stage = Stage("summarize", summarization_service.max_in_flight)
+        audio_stage = Stage("audio", AUDIO_CONCURRENCY)
+        # The workflow shares one session, so articles are stored one at a time
+        store_stage = Stage("store", 1)
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        articles = [None] * total
+        errors = [None] * total
+        finished = 0
+
+        async def summarize_article(idx: int, text_content: str, title: str) -> Optional[str]:
+            with trace.span("summarize", idx, chars_in=len(text_content)) as span:
+                summary_text, usage = await summarization_service.create_audio_summary_with_usage(
+                    text=text_content,
+                    title=title,
+                    target_duration_minutes=request.target_duration_minutes
+                )
+                span.set(
+                    chars_out=len(summary_text or ""),
+                    tokens_in=usage.get("prompt_tokens"),
+                    tokens_out=usage.get("completion_tokens"),
+                    cached=bool(usage.get("cached"))
+                )
+                if not summary_text:
+                    span.error = "No summary returned"
+            return summary_text
+
+        def generate_audio(idx: int, summary_text: str, audio_filename: str) -> str:
+            # ElevenLabs bills by characters of input text
+            with trace.span("audio", idx, chars_in=len(summary_text)) as span:
+                audio_path = tts_service.generate_audio_from_text(
+                    text=summary_text,
+                    output_dir=output_dir,
+                    filename=audio_filename,
+                    voice_id=request.voice_id
+                )
+                span.set(bytes_out=os.path.getsize(audio_path) if os.path.exists(audio_path) else None)
+            return audio_path
+
+        def store_article(idx: int, text_content: str, summary_text: str, result, embedding) -> int:
+            with trace.span("store", idx, chars_in=len(text_content) + len(summary_text)):
+                return _add_article(text_content, summary_text, result, embedding)
+
+        def _add_article(text_content: str, summary_text: str, result, embedding) -> int:
+            article = _new_article(request, text_content, summary_text, result, embedding)
+            db.add(article)
+            db.flush()
+            return article.id
+
+        async def run_article_stages(idx: int, result) -> None:
+            try:
+                text_content = texts[idx]
+                if not text_content:
+                    errors[idx] = f"Article {idx}: No text content"
+                    return
+
+                # Step 3: Generate 2-minute summary using Azure OpenAI
+                logger.info(f"Generating {request.target_duration_minutes}-minute summary for article {idx+1}...")
+                summary_text = await summarize_stage.run(summarize_article, idx, text_content, result.title or "")
+
+                if not summary_text:
+                    errors[idx] = f"Article {idx}: Failed to generate summary"
+                    return
+
+                word_count = len(summary_text.split())
+                logger.info(f"✓ Generated summary with {word_count} words for article {idx+1}")
+
+                # Step 4: Generate audio from summary using ElevenLabs
+                logger.info(f"Generating audio for article {idx+1}...")
+                audio_filename = f"article_{idx+1}_{timestamp}.mp3"
+
+                audio_path = await audio_stage.run(generate_audio, idx, summary_text, audio_filename)
+
+                logger.info(f"✓ Generated audio: {audio_filename}")
+
+                # Step 5: Store article in database with embedding
+                embeddings = await asyncio.shield(embeddings_task)
+                logger.info(f"Storing article {idx+1} in database...")
+                article_id = await store_stage.run(store_article, idx, text_content, summary_text, result, embeddings[idx])
+
+                logger.info(f"✓ Stored article {article_id} from {result.url}")
+
+                articles[idx] = {
+                    "article_id": article_id,
+                    "title": result.title or "Untitled",
+                    "source": result.url,
+                    "audio_filename": audio_filename,
+                    "audio_path": audio_path,
+                    "summary_word_count": word_count
+                }
+
+            except Exception as e:
+                errors[idx] = f"Article {idx} ({result.url if hasattr(result, 'url') else 'unknown'}): {str(e)}"
+                logger.error(errors[idx])
+
+        async def process_article(idx: int, result) -> None:
+            nonlocal finished
+            try:
+                # End-to-end time for the article, including waits for a free stage slot
+                with trace.span("article", idx) as span:
+                    await run_article_stages(idx, result)
+                    span.error = errors[idx]
+            finally:
+                finished += 1
+                report(25 + 70 * finished / total, f"Processed article {finished}/{total}")
+
+        try:
+            await asyncio.gather(*(process_article(idx, result) for idx, result in enumerate(results)))
+        finally:
+            if not embeddings_task.done():
+                embeddings_task.cancel()
+            # Retrieve the result so a failed batch isn't reported as never awaited
+            await asyncio.gather(embeddings_task, return_exceptions=True)
+
+        # Keep the response in search-result order regardless of finishing order
+        response_data["articles"] = [article for article in articles if article is not None]
+        response_data["errors"].extend(error for error in errors if error is not None)
+        response_data["articles_with_audio"] = len(response_data["articles"])
+        response_data["articles_processed"] = len(response_data["articles"])
+
+        logger.info(
+            "Stage concurrency: "
+            + ", ".join(f"{s['name']} peak {s['peak_in_flight']}/{s['concurrency']}"
+                        for s in (summarize_stage.stats(), audio_stage.stats(), store_stage.stats()))
+        )
+
+        # Commit all articles
+        with trace.span("commit", articles=len(response_data["articles"])):
+            await asyncio.to_thread(db.commit)
+
+        response_data["success"] = response_data["articles_with_audio"] > 0
+
+        logger.info(f"✓ Complete! Processed {response_data['articles_with_audio']} articles with audio")
+
+        await record_run()
+        return NewsWithAudioResponse(**response_data)
+
+    except Exception as e:
+        await asyncio.to_thread(db.rollback)
+        logger.error(f"Workflow error: {str(e)}", exc_info=True)
+        await record_run(error=str(e))
+        raise
+
+
+def stream_news_audio(request: NewsWithAudioRequest) -> AsyncIterator[bytes]:
+    """
+    Streaming variant of the workflow: Search → Extract → Summarize ⇢ Speech → Store
+
+    Articles are narrated one after another as a single MP3 stream. Each
+    summary is streamed from Azure OpenAI, cut into sentences and voiced while
+    it is still being written (see speech_stream.py), so playback can start
+    once the first sentence is synthesized rather than after every summary
+    and audio file is finished. Each article's audio is also written to
+    generated_audio/, and the article is stored with its embedding as soon as
+    its narration is complete. The run is recorded in workflow_runs with a
+    first_audio_ms attribute on each "speech" span.
+
+    Args:
+        request: Query and per-article options
+
+    Returns:
+        Async iterator of MP3 chunks
+
+    Raises:
+        AudioUnavailableError: If the async text-to-speech service could not be imported
+    """
+    if not async_tts_service:
+        raise AudioUnavailableError("Text-to-speech service is not available")
+
+    return _stream_news_audio(request)
+
+
+async def _stream_news_audio(request: NewsWithAudioRequest) -> AsyncIterator[bytes]:
+    logger.info(f"Starting streamed news audio for query: '{request.query}'")
+
+    response_data = {
+        "success": False,
+        "query": request.query,
+        "articles_found": 0,
+        "articles_processed": 0,
+        "articles_with_audio": 0,
+        "articles": [],
+        "errors": []
+    }
+    trace = WorkflowTrace("news_audio_stream")
+    error = None
+
+    # Own session: the response outlives request-scoped dependencies
+    db = SessionLocal()
+    try:
+        from parallel import Parallel
+        parallel_client = Parallel(api_key=os.environ.get("PARALLEL_API_KEY"))
+
+        search_result = await asyncio.to_thread(_search, parallel_client, request, trace)
+        response_data["articles_found"] = len(search_result.results)
+        if not search_result.results:
+            response_data["errors"].append("No articles found")
+            return
+
+        extract_result = await asyncio.to_thread(_extract, parallel_client, request, db, trace, search_result)
+        response_data["articles_skipped"] = extract_result.known
+        response_data["extraction"] = extract_result.to_dict()
+        if not extract_result.results:
+            response_data["errors"].append("No new articles to narrate")
+            return
+
+        summarization_service = get_async_summarization_service()
+        embedding_service = get_async_embedding_service()
+
+        output_dir = os.path.join(os.path.dirname(__file__), "..", "generated_audio")
+        os.makedirs(output_dir, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+        for idx, result in enumerate(extract_result.results):
+            text_content = article_text(result)
+            if not text_content:
+                response_data["errors"].append(f"Article {idx}: No text content")
+                continue
+
+            audio_filename = f"article_{idx+1}_{timestamp}.mp3"
+            audio_path = os.path.join(output_dir, audio_filename)
+            summary_parts = []
+
+            async def summary_chunks() -> AsyncIterator[str]:
+                async for text in summarization_service.stream_audio_summary(
+                    text=text_content,
+                    title=result.title or "",
+                    target_duration_minutes=request.target_duration_minutes
+                ):
+                    summary_parts.append(text)
+                    yield text
+
+            try:
+                with trace.span("speech", idx, chars_in=len(text_content)) as span, open(audio_path, "wb") as audio_file:
+                    bytes_out = 0
+                    async for chunk in stream_summary_speech(summary_chunks(), async_tts_service, request.voice_id):
+                        if not bytes_out:
+                            span.set(first_audio_ms=round(trace.elapsed_ms(), 1))
+                            logger.info(f"First audio for article {idx+1} after {trace.elapsed_ms():.0f} ms")
+                        bytes_out += len(chunk)
+                        audio_file.write(chunk)
+                        yield chunk
+                    summary_text = "".join(summary_parts).strip()
+                    span.set(bytes_out=bytes_out, chars_out=len(summary_text))
+
+                embedding = await embedding_service.generate_embedding(text_content)
+                with trace.span("store", idx, chars_in=len(text_content) + len(summary_text)):
+                    article = _new_article(request, text_content, summary_text, result, embedding)
+                    article_id = await asyncio.to_thread(_store_article, db, article)
+
+                logger.info(f"✓ Narrated and stored article {article_id} from {result.url}")
+                response_data["articles"].append({
+                    "article_id": article_id,
+                    "title": result.title or "Untitled",
+                    "source": result.url,
+                    "audio_filename": audio_filename,
+                    "audio_path": audio_path,
+                    "summary_word_count": len(summary_text.split())
+                })
+
+            except Exception as e:
+                # Skip to the next article; the listener hears a partial narration at worst
+                await asyncio.to_thread(db.rollback)
+                if os.path.exists(audio_path):
+                    os.remove(audio_path)
+                response_data["errors"].append(f"Article {idx} ({result.url}): {str(e)}")
+                logger.error(response_data["errors"][-1])
+
+    except Exception as e:
+        error = str(e)
+        logger.error(f"Streaming workflow error: {error}", exc_info=True)
+        raise
+
+    finally:
+        await asyncio.to_thread(db.close)
+        response_data["articles_processed"] = len(response_data["articles"])
+        response_data["articles_with_audio"] = len(response_data["articles"])
+        response_data["success"] = bool(response_data["articles"])
+        try:
+            await asyncio.to_thread(_save_run, trace, request.query, response_data, error)
+        except Exception as e:
+            logger.warning(f"Could not store workflow run timings: {str(e)}")
@@ -6,9 +6,13 @@ import os
 from parallel import Parallel
 from dotenv import load_dotenv
 import requests
+from requests.adapters import HTTPAdapter
 from typing import List, Optional, Dict
 import logging
 
+from .schemas import ParallelExtractBatch
+from .sources import dedupe_urls, extract_new_urls
+
 load_dotenv()
 
 logging.basicConfig(level=logging.INFO)
@@ -25,18 +29,50 @@ class ParallelUnifiedService:
             query="Find articles about AI",
             max_articles=10
         )
+
+    Without api_url, articles are embedded and stored in this process
+    (ingest.ingest_extract_batch_sync, the same code behind /articles/batch/).
+    With api_url, they are POSTed to that server's /articles/batch/ over a
+    pooled keep-alive session, for use against a remote deployment.
     """
 
-    def __init__(self, api_url: str = "http://localhost:8000"):
+    def __init__(
+        self,
+        api_url: Optional[str] = None,
+        pool_maxsize: int = 10,
+        timeout: float = 600.0
+    ):
         """
         Initialize the unified service
 
         Args:
-            api_url: FastAPI endpoint URL
+            api_url: Remote FastAPI URL; None stores articles in-process
+            pool_maxsize: Keep-alive connections kept to api_url
+            timeout: Seconds to wait for a remote batch request
         """
         self.parallel_client = Parallel(api_key=os.environ["PARALLEL_API_KEY"])
-        self.api_url = api_url
-        logger.info(f"Initialized ParallelUnifiedService with API: {api_url}")
+        self.api_url = api_url.rstrip("/") if api_url else None
+        self.timeout = timeout
+
+        self.session = None
+        if self.api_url:
+            self.session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize)
+            self.session.mount("http://", adapter)
+            self.session.mount("https://", adapter)
+
+        logger.info(f"Initialized ParallelUnifiedService with API: {self.api_url or 'in-process'}")
+
+    def close(self) -> None:
+        """Close pooled HTTP connections"""
+        if self.session is not None:
+            self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
 
     def search_extract_and_store(
         self,
@@ -63,6 +99,7 @@ class ParallelUnifiedService:
                 "query": str,
                 "articles_found": int,
                 "articles_extracted": int,
+                "articles_skipped": int,
                 "articles_stored": int,
                 "article_ids": List[int],
                 "errors": List[str]
@@ -75,6 +112,7 @@ class ParallelUnifiedService:
             "query": query,
             "articles_found": 0,
             "articles_extracted": 0,
+            "articles_skipped": 0,
             "articles_stored": 0,
             "article_ids": [],
             "errors": []
@@ -104,68 +142,56 @@ class ParallelUnifiedService:
                 result["errors"].append("No articles found")
                 return result
 
-            # Extract URLs
-            urls = [r.url for r in search_result.results][:max_articles]
+            # Extract URLs (search queries overlap, so dedupe by canonical URL)
+            urls = dedupe_urls(r.url for r in search_result.results)[:max_articles]
 
             # Step 2: Extract
             logger.info(f"Step 2/3: Extracting content from {len(urls)} articles...")
 
-            extract_result = self.parallel_client.beta.extract(
-                urls=urls,
-                objective=f"Extract detailed content for: {query}",
-                excerpts={
-                    "max_chars_per_result": 50000
-                },
-                full_content=True
-            )
+            # Sources already in the database can only be checked in-process
+            db = None
+            if self.session is None:
+                from .database import SessionLocal
+                db = SessionLocal()
+            try:
+                extract_result = extract_new_urls(
+                    self.parallel_client,
+                    urls,
+                    objective=f"Extract detailed content for: {query}",
+                    db=db
+                )
+            finally:
+                if db is not None:
+                    db.close()
 
             result["articles_extracted"] = len(extract_result.results)
-            logger.info(f"✓ Extracted {result['articles_extracted']} articles")
+            result["articles_skipped"] = extract_result.known
+            logger.info(f"✓ Extracted {result['articles_extracted']} articles ({extract_result.cached} cached)")
 
             if not extract_result.results:
-                result["errors"].append("No content extracted")
+                if extract_result.known:
+                    result["errors"].append(f"All {extract_result.known} articles found are already stored")
+                else:
+                    result["errors"].append("No content extracted")
                 return result
 
             # Step 3: Embed and Store
             logger.info(f"Step 3/3: Generating embeddings and storing in database...")
 
-            # Prepare batch payload
-            results_data = []
-            for r in extract_result.results:
-                results_data.append({
-                    "url": r.url if hasattr(r, 'url') else "",
-                    "title": r.title if hasattr(r, 'title') else None,
-                    "excerpts": r.excerpts if hasattr(r, 'excerpts') else [],
-                    "full_content": r.full_content if hasattr(r, 'full_content') else None,
-                    "publish_date": r.publish_date if hasattr(r, 'publish_date') else None,
-                    "status": r.status if hasattr(r, 'status') else None
-                })
-
-            batch_payload = {
-                "results": results_data,
-                "default_category_id": category_id,
-                "default_relevance_score": relevance_score
-            }
-
-            # Send to FastAPI
-            response = requests.post(
-                f"{self.api_url}/articles/batch/",
-                json=batch_payload
+            batch = ParallelExtractBatch(
+                results=extract_result.results,
+                default_category_id=category_id,
+                default_relevance_score=relevance_score
             )
 
-            if response.status_code == 200:
-                api_result = response.json()
-                result["articles_stored"] = api_result["articles_created"]
-                result["article_ids"] = api_result["article_ids"]
-                result["errors"].extend(api_result.get("errors", []))
-                result["success"] = True
+            stored = self.store_extract_batch(batch)
+            result["articles_stored"] = stored["articles_created"]
+            result["article_ids"] = stored["article_ids"]
+            result["errors"].extend(stored.get("errors", []))
+            result["success"] = True
 
-                logger.info(f"✓ Stored {result['articles_stored']} articles in database")
-                logger.info(f"✓ Article IDs: {result['article_ids']}")
-            else:
-                error_msg = f"API error: {response.status_code} - {response.text}"
-                result["errors"].append(error_msg)
-                logger.error(error_msg)
+            logger.info(f"✓ Stored {result['articles_stored']} articles in database")
+            logger.info(f"✓ Article IDs: {result['article_ids']}")
 
         except Exception as e:
             error_msg = f"Workflow error: {str(e)}"
@@ -174,6 +200,37 @@ class ParallelUnifiedService:
 
         return result
 
+    def store_extract_batch(self, batch: ParallelExtractBatch) -> Dict:
+        """
+        Embed and store extract results, in-process or through api_url
+
+        Args:
+            batch: Extract results plus default category and relevance score
+
+        Returns:
+            BatchProcessResponse as a dict (articles_created, article_ids, errors)
+
+        Raises:
+            RuntimeError: If the remote API returns an error status
+        """
+        if self.session is None:
+            # Imported here so remote-only use doesn't need DATABASE_URL
+            from .database import get_db_context
+            from .ingest import ingest_extract_batch_sync
+
+            with get_db_context() as db:
+                return ingest_extract_batch_sync(batch, db).model_dump()
+
+        response = self.session.post(
+            f"{self.api_url}/articles/batch/",
+            data=batch.model_dump_json(),
+            headers={"Content-Type": "application/json"},
+            timeout=self.timeout
+        )
+        if response.status_code != 200:
+            raise RuntimeError(f"API error: {response.status_code} - {response.text}")
+        return response.json()
+
     def _generate_search_queries(self, query: str) -> List[str]:
         """
         Auto-generate search queries from main query
@@ -0,0 +1,64 @@
+"""
+Per-item pipeline stages
+Each stage is a bounded worker pool: items flow through independently and at
+most `concurrency` of them are inside a stage at once, so a batch finishes in
+about the time of its slowest item instead of the sum of every stage
+"""
+import asyncio
+import inspect
+import threading
+from typing import Any, Callable, Dict
+
+
+class Stage:
+    """A named pipeline step with its own concurrency limit"""
+
+    def __init__(self, name: str, concurrency: int):
+        self.name = name
+        self.concurrency = max(1, concurrency)
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._peak_in_flight = 0
+        self._completed = 0
+        self._failed = 0
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        Run func inside this stage
+
+        Coroutine functions are awaited; blocking functions (the Azure OpenAI
+        and ElevenLabs SDK calls) run in a thread so other items keep moving.
+        """
+        async with self._semaphore:
+            with self._lock:
+                self._in_flight += 1
+                self._peak_in_flight = max(self._peak_in_flight, self._in_flight)
+            try:
+                if inspect.iscoroutinefunction(func):
+                    result = await func(*args, **kwargs)
+                else:
+                    result = await asyncio.to_thread(func, *args, **kwargs)
+            except BaseException:
+                with self._lock:
+                    self._failed += 1
+                raise
+            finally:
+                with self._lock:
+                    self._in_flight -= 1
+
+        with self._lock:
+            self._completed += 1
+        return result
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "name": self.name,
+                "concurrency": self.concurrency,
+                "in_flight": self._in_flight,
+                "peak_in_flight": self._peak_in_flight,
+                "completed": self._completed,
+                "failed": self._failed,
+            }
@@ -0,0 +1,166 @@
+"""
+Token-bucket rate limiting for Azure OpenAI quotas
+Keeps request and token throughput under the deployment's RPM/TPM quota
+"""
+import asyncio
+import random
+import time
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+
+from openai import APIConnectionError, APITimeoutError, InternalServerError, RateLimitError
+
+# Transient Azure OpenAI failures worth retrying after a backoff; anything else
+# (bad request, content filter, auth) fails without retrying
+RETRYABLE_ERRORS = (RateLimitError, APIConnectionError, APITimeoutError, InternalServerError)
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at capacity per period
+
+    A bucket for a per-minute quota holds up to one minute of budget and
+    refills at quota/60 per second. Debits may push the level negative
+    (e.g. when actual usage exceeds the estimate), which delays later callers.
+    """
+
+    def __init__(self, capacity: float, period_seconds: float = 60.0):
+        self.capacity = float(capacity)
+        self.rate = self.capacity / period_seconds
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until amount can be taken (0 if available now)"""
+        self._refill()
+        # Requests larger than the whole bucket are allowed once it is full
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate
+
+    def take(self, amount: float) -> None:
+        self._refill()
+        self.level -= amount
+
+    def adjust(self, amount: float) -> None:
+        """Credit (positive) or debit (negative) the bucket after the fact"""
+        self._refill()
+        self.level = min(self.capacity, self.level + amount)
+
+
+class RateLimiter:
+    """
+    Async limiter combining a requests-per-minute and a tokens-per-minute bucket
+
+    Also holds a shared pause: when the service answers 429 with Retry-After,
+    every caller waits until that deadline instead of each discovering the
+    throttle on its own.
+    """
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, tokens: int) -> float:
+        """
+        Wait until one request of the given token cost fits the quota
+
+        Returns:
+            Seconds spent waiting
+        """
+        started = time.monotonic()
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                wait = max(
+                    self.paused_until - now,
+                    self.requests.wait_time(1),
+                    self.tokens.wait_time(tokens)
+                )
+                if wait <= 0:
+                    self.requests.take(1)
+                    self.tokens.take(tokens)
+                    return time.monotonic() - started
+                await asyncio.sleep(wait)
+
+    def reconcile(self, estimated_tokens: int, actual_tokens: int) -> None:
+        """Correct the token bucket once the response reports real usage"""
+        self.tokens.adjust(estimated_tokens - actual_tokens)
+
+    def pause(self, seconds: float) -> None:
+        """Hold all callers for at least the given number of seconds"""
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+
+def retry_delay(error: Exception, attempt: int) -> float:
+    """Seconds to back off: the server's Retry-After if given, else exponential with jitter"""
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000
+        if headers.get("retry-after"):
+            return float(headers["retry-after"])
+    except ValueError:
+        pass
+    return min(60.0, 2 ** attempt) * (0.5 + random.random() / 2)
+
+
+class ThroughputMeter:
+    """Tracks items and tokens processed, overall and over a sliding window"""
+
+    def __init__(self, window_seconds: float = 60.0):
+        self.window_seconds = window_seconds
+        self.started = time.monotonic()
+        self.items = 0
+        self.tokens = 0
+        self.requests = 0
+        self.throttled = 0
+        self.failed_items = 0
+        self.wait_seconds = 0.0
+        self._window: Deque[Tuple[float, int, int]] = deque()
+
+    def record(self, items: int, tokens: int) -> None:
+        now = time.monotonic()
+        self.items += items
+        self.tokens += tokens
+        self.requests += 1
+        self._window.append((now, items, tokens))
+        self._trim(now)
+
+    def _trim(self, now: float) -> None:
+        while self._window and now - self._window[0][0] > self.window_seconds:
+            self._window.popleft()
+
+    def stats(self, in_flight: Optional[int] = None, concurrency_limit: Optional[int] = None) -> Dict:
+        now = time.monotonic()
+        self._trim(now)
+        elapsed = max(now - self.started, 1e-9)
+        window = min(self.window_seconds, elapsed)
+        window_items = sum(items for _, items, _ in self._window)
+        window_tokens = sum(tokens for _, _, tokens in self._window)
+
+        stats = {
+            "requests": self.requests,
+            "items": self.items,
+            "tokens": self.tokens,
+            "failed_items": self.failed_items,
+            "throttled": self.throttled,
+            "rate_limit_wait_seconds": round(self.wait_seconds, 3),
+            "items_per_second": round(self.items / elapsed, 2),
+            "tokens_per_second": round(self.tokens / elapsed, 2),
+            "recent_items_per_second": round(window_items / window, 2),
+            "recent_tokens_per_second": round(window_tokens / window, 2),
+        }
+        if in_flight is not None:
+            stats["in_flight"] = in_flight
+        if concurrency_limit is not None:
+            stats["concurrency_limit"] = concurrency_limit
+        return stats
@@ -2,7 +2,7 @@
 Pydantic schemas for request/response validation
 """
 from pydantic import BaseModel, Field, HttpUrl
-from typing import Optional, List
+from typing import Any, Dict, Optional, List
 from datetime import datetime
 
 
@@ -74,6 +74,53 @@ class NewsWithAudioRequest(BaseModel):
     relevance_score: int = Field(8, ge=1, le=10, description="Relevance score")
     target_duration_minutes: int = Field(2, ge=1, le=5, description="Target audio duration per article")
     voice_id: Optional[str] = Field(None, description="Optional ElevenLabs voice ID")
+    adaptive_extract: bool = Field(
+        True,
+        description="Use search excerpts long enough for the summary instead of extracting the full page"
+    )
+
+
+class ExtractionStats(BaseModel):
+    """How the workflow's article text was obtained"""
+    duplicates: int = Field(0, description="Search results with the same canonical URL as an earlier one")
+    known: int = Field(0, description="URLs skipped because they are already stored")
+    cached: int = Field(0, description="URLs served from the extract cache")
+    from_search: int = Field(0, description="URLs whose search excerpts were used instead of extracting")
+    extracted: int = Field(0, description="URLs sent to Parallel Extract")
+    extract_ms: float = 0.0
+    extract_call_skipped: bool = False
+    estimated_latency_saved_ms: Optional[float] = Field(
+        None, description="Recent average extract latency, when the extract call was skipped"
+    )
+
+
+class TimingSpan(BaseModel):
+    """Duration of one workflow stage, for the whole run or one article"""
+    stage: str = Field(..., description="search, extract, embed, summarize, audio, store, commit or article")
+    article_index: Optional[int] = None
+    start_ms: float = Field(..., description="Offset from the start of the run")
+    duration_ms: float
+    error: Optional[str] = None
+    attributes: Optional[Dict[str, Any]] = Field(None, description="Character and token counts")
+
+    class Config:
+        from_attributes = True
+
+
+class StageTiming(BaseModel):
+    """Totals for one stage within a run"""
+    stage: str
+    count: int
+    total_ms: float
+    max_ms: float
+    errors: int
+
+
+class WorkflowTimings(BaseModel):
+    """Timing breakdown of a workflow run"""
+    total_ms: float
+    stages: List[StageTiming]
+    spans: List[TimingSpan]
 
 
 class NewsWithAudioResponse(BaseModel):
@@ -83,5 +130,63 @@ class NewsWithAudioResponse(BaseModel):
     articles_found: int
     articles_processed: int
     articles_with_audio: int
+    articles_skipped: int = Field(0, description="Search results skipped because their source is already stored")
     articles: List[ArticleAudioInfo]
     errors: List[str] = []
+    extraction: Optional[ExtractionStats] = None
+    run_id: Optional[int] = Field(None, description="workflow_runs row holding these timings")
+    timings: Optional[WorkflowTimings] = None
+
+
+class JobResponse(BaseModel):
+    """Status of a background job"""
+    id: int
+    kind: str
+    status: str = Field(..., description="queued, running, succeeded or failed")
+    progress: float = Field(..., description="Percent complete (0-100)")
+    message: Optional[str] = None
+    result: Optional[Dict[str, Any]] = Field(None, description="Job output once succeeded")
+    error: Optional[str] = None
+    attempts: int
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class WorkflowRunResponse(BaseModel):
+    """A stored workflow run with its timing spans"""
+    id: int
+    kind: str
+    query: Optional[str] = None
+    success: bool
+    error: Optional[str] = None
+    articles_processed: int
+    started_at: datetime
+    duration_ms: float
+    spans: List[TimingSpan]
+
+    class Config:
+        from_attributes = True
+
+
+class StageLatency(BaseModel):
+    """Latency percentiles of one stage across runs"""
+    stage: str
+    count: int
+    errors: int = 0
+    p50_ms: Optional[float] = None
+    p95_ms: Optional[float] = None
+    p99_ms: Optional[float] = None
+    max_ms: Optional[float] = None
+
+
+class WorkflowLatencyResponse(BaseModel):
+    """Stage latency percentiles for stored workflow runs"""
+    kind: str
+    since: datetime
+    runs: int
+    total: StageLatency
+    stages: List[StageLatency]
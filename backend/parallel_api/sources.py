@@ -0,0 +1,435 @@
+"""
+Source URL handling for Parallel search/extract
+Canonicalizes and dedupes URLs, skips sources that are already stored as
+articles, and caches extract results for a while, so Parallel Extract is only
+called for URLs we don't already have
+"""
+import logging
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from .models import Article
+from .schemas import ParallelExtractResult
+from .summary_planner import MAX_INPUT_CHARS, WORDS_PER_MINUTE
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Query parameters that only track where a click came from
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "gbraid", "wbraid", "msclkid", "yclid", "twclid", "igshid",
+    "mc_cid", "mc_eid", "_ga", "_gl", "_hsenc", "_hsmi", "mkt_tok", "ref", "ref_src",
+    "ref_url", "cmpid", "spm", "ncid", "sr_share", "s_cid", "oly_enc_id", "oly_anon_id",
+}
+TRACKING_PREFIXES = ("utm_", "pk_", "hsa_", "vero_", "__s")
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Canonical form of a URL, used to recognise the same article across runs
+
+    Lowercases the scheme and host, drops "www.", default ports, fragments,
+    tracking parameters and trailing slashes, and sorts the remaining query.
+    """
+    url = (url or "").strip()
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        return url
+    if not parts.scheme or not parts.hostname:
+        return url
+
+    scheme = parts.scheme.lower()
+    host = parts.hostname.lower().rstrip(".")
+    if host.startswith("www."):
+        host = host[4:]
+    if port and port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{port}"
+
+    path = parts.path.rstrip("/")
+
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)
+    )
+
+    return urlunsplit((scheme, host, path, urlencode(query), ""))
+
+
+def dedupe_urls(urls: Iterable[str]) -> List[str]:
+    """First URL seen for each canonical form, in order"""
+    seen = set()
+    unique = []
+    for url in urls:
+        key = canonicalize_url(url)
+        if url and key not in seen:
+            seen.add(key)
+            unique.append(url)
+    return unique
+
+
+def to_extract_result(result) -> ParallelExtractResult:
+    """Convert a Parallel SDK extract result to our schema"""
+    return ParallelExtractResult(
+        url=result.url if hasattr(result, 'url') else "",
+        title=result.title if hasattr(result, 'title') else None,
+        excerpts=(result.excerpts if hasattr(result, 'excerpts') else None) or [],
+        full_content=result.full_content if hasattr(result, 'full_content') else None,
+        publish_date=result.publish_date if hasattr(result, 'publish_date') else None,
+        status=result.status if hasattr(result, 'status') else None
+    )
+
+
+def ensure_source_index(engine, batch_size: int = 1000) -> None:
+    """
+    Add and index articles.source_canonical for known-source lookups
+
+    create_all neither adds columns to existing tables nor builds indexes on
+    them, so existing databases get the column and index here, and rows stored
+    before it existed are backfilled in batches.
+    """
+    with engine.begin() as conn:
+        conn.execute(text("ALTER TABLE articles ADD COLUMN IF NOT EXISTS source_canonical TEXT"))
+        conn.execute(text("CREATE INDEX IF NOT EXISTS idx_articles_source_canonical ON articles (source_canonical)"))
+        # Superseded by the canonical index
+        conn.execute(text("DROP INDEX IF EXISTS idx_articles_source"))
+
+    backfilled = 0
+    while True:
+        with engine.begin() as conn:
+            rows = conn.execute(
+                text(
+                    "SELECT id, source FROM articles "
+                    "WHERE source_canonical IS NULL AND source IS NOT NULL AND source <> '' "
+                    "LIMIT :limit"
+                ),
+                {"limit": batch_size}
+            ).all()
+            if not rows:
+                break
+            conn.execute(
+                text("UPDATE articles SET source_canonical = :canonical WHERE id = :id"),
+                [{"id": article_id, "canonical": canonicalize_url(source)} for article_id, source in rows]
+            )
+            backfilled += len(rows)
+
+    if backfilled:
+        logger.info(f"Backfilled source_canonical for {backfilled} articles")
+
+
+def find_known_sources(db: Session, urls: Iterable[str]) -> Set[str]:
+    """
+    Canonical URLs among urls that are already stored as articles
+
+    Looks the canonical form of every URL up in articles.source_canonical
+    (an indexed IN query), so a stored URL matches whatever tracking
+    parameters, host case or trailing slash it was stored with.
+    """
+    candidates = list({canonicalize_url(url) for url in urls if url})
+    if not candidates:
+        return set()
+
+    known = set()
+    for start in range(0, len(candidates), 1000):
+        rows = db.query(Article.source_canonical).filter(
+            Article.source_canonical.in_(candidates[start:start + 1000])
+        ).all()
+        known.update(source for source, in rows)
+    return known
+
+
+class ExtractCache:
+    """
+    TTL cache of Parallel Extract results in a SQLite file, keyed by canonical URL
+
+    Shared by the API and worker processes on one host. Expired rows are
+    removed on write.
+    """
+
+    def __init__(self, path: str, ttl_seconds: float = 86400):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS extract_results (
+                url TEXT PRIMARY KEY,
+                result TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_extract_results_expires_at ON extract_results(expires_at)")
+        self._conn.commit()
+
+    def get_many(self, urls: Iterable[str]) -> Dict[str, ParallelExtractResult]:
+        """Unexpired results by canonical URL"""
+        keys = list({canonicalize_url(url) for url in urls})
+        found = {}
+        now = time.time()
+
+        with self._lock:
+            # Stay under SQLite's bound-parameter limit
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT url, result FROM extract_results WHERE url IN ({placeholders}) AND expires_at > ?",
+                    chunk + [now]
+                ).fetchall()
+                found.update((url, ParallelExtractResult.model_validate_json(result)) for url, result in rows)
+
+            self._hits += len(found)
+            self._misses += len(keys) - len(found)
+
+        return found
+
+    def put_many(self, results: Iterable[ParallelExtractResult]) -> None:
+        now = time.time()
+        entries = [
+            (canonicalize_url(result.url), result.model_dump_json(), now + self.ttl_seconds)
+            for result in results
+            if result.url
+        ]
+
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO extract_results (url, result, expires_at) VALUES (?, ?, ?)",
+                entries
+            )
+            self._conn.execute("DELETE FROM extract_results WHERE expires_at <= ?", (now,))
+            self._conn.commit()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": self._conn.execute("SELECT COUNT(*) FROM extract_results").fetchone()[0],
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+_extract_cache: Optional[ExtractCache] = None
+_extract_cache_created = False
+
+
+def get_extract_cache() -> Optional[ExtractCache]:
+    """
+    Get or create the extract cache singleton
+
+    EXTRACT_CACHE_ENABLED (default true), EXTRACT_CACHE_PATH and
+    EXTRACT_CACHE_TTL_SECONDS (default one day).
+
+    Returns:
+        ExtractCache, or None when caching is disabled
+    """
+    global _extract_cache, _extract_cache_created
+
+    if not _extract_cache_created:
+        _extract_cache_created = True
+        if os.getenv("EXTRACT_CACHE_ENABLED", "true").lower() in ("1", "true", "yes"):
+            _extract_cache = ExtractCache(
+                os.getenv("EXTRACT_CACHE_PATH", os.path.join(os.path.dirname(__file__), "extract_cache.sqlite3")),
+                ttl_seconds=float(os.getenv("EXTRACT_CACHE_TTL_SECONDS", "86400"))
+            )
+
+    return _extract_cache
+
+
+# Source characters wanted per word of summary before a search excerpt is
+# used instead of extracting the full page
+ADAPTIVE_EXTRACT_CHARS_PER_WORD = float(os.getenv("ADAPTIVE_EXTRACT_CHARS_PER_WORD", "10"))
+
+
+def min_excerpt_chars(target_duration_minutes: int) -> int:
+    """
+    Search excerpt length that is enough to summarize without extracting
+
+    Capped at the summarizer's input limit, since anything longer is
+    truncated anyway.
+    """
+    target_words = target_duration_minutes * WORDS_PER_MINUTE
+    return int(min(MAX_INPUT_CHARS, target_words * ADAPTIVE_EXTRACT_CHARS_PER_WORD))
+
+
+def from_search_result(result) -> ParallelExtractResult:
+    """Use a search result's excerpts as the article text"""
+    excerpts = getattr(result, "excerpts", None) or []
+    return ParallelExtractResult(
+        url=result.url,
+        title=getattr(result, "title", None),
+        # article_text() takes the first excerpt, so keep them together
+        excerpts=["\n\n".join(excerpts)] if excerpts else [],
+        publish_date=getattr(result, "publish_date", None)
+    )
+
+
+def _excerpt_length(result) -> int:
+    return sum(len(excerpt) for excerpt in (getattr(result, "excerpts", None) or []))
+
+
+class _LatencyEstimate:
+    """Moving average of Parallel Extract call latency, to estimate time saved by skipping it"""
+
+    def __init__(self, alpha: float = 0.2):
+        self.alpha = alpha
+        self._lock = threading.Lock()
+        self._value: Optional[float] = None
+
+    def update(self, duration_ms: float) -> None:
+        with self._lock:
+            if self._value is None:
+                self._value = duration_ms
+            else:
+                self._value += self.alpha * (duration_ms - self._value)
+
+    def get(self) -> Optional[float]:
+        with self._lock:
+            return self._value
+
+
+_extract_latency = _LatencyEstimate()
+
+
+@dataclass
+class ExtractOutcome:
+    """Extract results for new URLs, plus what was skipped or served from cache"""
+    results: List[ParallelExtractResult] = field(default_factory=list)
+    duplicates: int = 0
+    known: int = 0
+    cached: int = 0
+    from_search: int = 0
+    extracted: int = 0
+    extract_ms: float = 0.0
+    extract_call_skipped: bool = False
+    estimated_latency_saved_ms: Optional[float] = None
+
+    def to_dict(self) -> Dict:
+        return {
+            "duplicates": self.duplicates,
+            "known": self.known,
+            "cached": self.cached,
+            "from_search": self.from_search,
+            "extracted": self.extracted,
+            "extract_ms": round(self.extract_ms, 1),
+            "extract_call_skipped": self.extract_call_skipped,
+            "estimated_latency_saved_ms": (
+                round(self.estimated_latency_saved_ms, 1) if self.estimated_latency_saved_ms is not None else None
+            ),
+        }
+
+
+def extract_new_urls(
+    parallel_client,
+    urls: List[str],
+    objective: str,
+    db: Optional[Session] = None,
+    max_chars_per_result: int = 50000,
+    search_results: Optional[List] = None,
+    min_search_excerpt_chars: int = 0
+) -> ExtractOutcome:
+    """
+    Extract full content for the URLs we don't already have
+
+    URLs are deduped by canonical form; URLs already stored as articles are
+    dropped (when db is given); cached extract results are reused; only the
+    remaining URLs are sent to Parallel Extract, and their results cached.
+
+    With search_results and min_search_excerpt_chars (adaptive extraction),
+    URLs whose search excerpts are at least that long use the excerpts as
+    their text, so only thin results are extracted. When no URL is left to
+    extract, the saved time is estimated from recent extract calls.
+
+    Args:
+        parallel_client: Parallel SDK client
+        urls: Candidate URLs (e.g. from search results), in priority order
+        objective: Extract objective
+        db: Session for the known-source lookup; None skips it
+        max_chars_per_result: Excerpt size requested from Parallel
+        search_results: Search results for urls, to reuse their excerpts
+        min_search_excerpt_chars: Excerpt length that makes extraction unnecessary; 0 disables
+
+    Returns:
+        ExtractOutcome with results in the order of urls
+    """
+    outcome = ExtractOutcome()
+
+    unique = dedupe_urls(urls)
+    outcome.duplicates = len(urls) - len(unique)
+
+    if db is not None and unique:
+        known = find_known_sources(db, unique)
+        new = [url for url in unique if canonicalize_url(url) not in known]
+        outcome.known = len(unique) - len(new)
+        unique = new
+
+    cache = get_extract_cache()
+    cached = cache.get_many(unique) if cache and unique else {}
+    outcome.cached = len(cached)
+
+    sufficient = {}
+    if search_results and min_search_excerpt_chars > 0:
+        wanted = {canonicalize_url(url) for url in unique} - cached.keys()
+        for result in search_results:
+            key = canonicalize_url(result.url)
+            if key in wanted and key not in sufficient and _excerpt_length(result) >= min_search_excerpt_chars:
+                sufficient[key] = from_search_result(result)
+        outcome.from_search = len(sufficient)
+
+    to_extract = [url for url in unique if canonicalize_url(url) not in cached and canonicalize_url(url) not in sufficient]
+    extracted = {}
+    if to_extract:
+        started = time.perf_counter()
+        response = parallel_client.beta.extract(
+            urls=to_extract,
+            objective=objective,
+            excerpts={"max_chars_per_result": max_chars_per_result},
+            full_content=True
+        )
+        outcome.extract_ms = (time.perf_counter() - started) * 1000
+        _extract_latency.update(outcome.extract_ms)
+
+        results = [to_extract_result(r) for r in response.results]
+        outcome.extracted = len(results)
+        if cache:
+            cache.put_many(results)
+        extracted = {canonicalize_url(result.url): result for result in results}
+
+    for url in unique:
+        key = canonicalize_url(url)
+        result = cached.get(key) or sufficient.get(key) or extracted.pop(key, None)
+        if result is not None:
+            outcome.results.append(result)
+    # Results whose URL changed during extraction (redirects) go last
+    outcome.results.extend(extracted.values())
+
+    if unique and not to_extract:
+        outcome.extract_call_skipped = True
+        outcome.estimated_latency_saved_ms = _extract_latency.get()
+
+    logger.info(
+        f"Extract: {len(urls)} URLs, {outcome.duplicates} duplicates, {outcome.known} already stored, "
+        f"{outcome.cached} cached, {outcome.from_search} from search excerpts, {outcome.extracted} extracted"
+    )
+    return outcome
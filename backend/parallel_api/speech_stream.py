@@ -0,0 +1,160 @@
+"""
+Streaming summary-to-speech
+Voices a summary while the model is still writing it: complete sentences are
+cut from the token stream and sent to text-to-speech one chunk at a time, so
+the first audio arrives after the first sentence instead of after the whole
+summary and its synthesis
+"""
+import asyncio
+import logging
+import os
+import re
+from typing import AsyncIterator, List, Optional
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Characters gathered per text-to-speech request after the first sentence
+# (the first sentence is voiced alone so playback starts as early as possible)
+STREAM_TTS_CHUNK_CHARS = int(os.getenv("STREAM_TTS_CHUNK_CHARS", "200"))
+
+# Sentence end followed by whitespace (so "3.5" or "U.S." mid-token never splits)
+SENTENCE_END_RE = re.compile(r"[.!?]+[\"”’')\]]*(?=\s)")
+LAST_WORD_RE = re.compile(r"([\w.]+)\.[\"”’')\]]*$")
+
+ABBREVIATIONS = frozenset({
+    "mr", "mrs", "ms", "dr", "prof", "sr", "jr", "st", "vs", "etc", "inc", "ltd", "co", "corp",
+    "no", "gov", "sen", "rep", "gen", "lt", "col", "u.s", "u.k", "e.g", "i.e", "a.m", "p.m",
+    "jan", "feb", "mar", "apr", "jun", "jul", "aug", "sep", "sept", "oct", "nov", "dec"
+})
+
+_END = object()
+
+
+class SentenceSegmenter:
+    """
+    Splits streamed text into chunks of complete sentences
+
+    The first complete sentence is emitted on its own; later sentences are
+    gathered until a chunk holds at least min_chars, which keeps intonation
+    natural and the number of text-to-speech requests low.
+    """
+
+    def __init__(self, min_chars: int = STREAM_TTS_CHUNK_CHARS):
+        self.min_chars = min_chars
+        self._buffer = ""
+        self._pending: List[str] = []
+        self._emitted = 0
+
+    def _is_abbreviation(self, sentence: str) -> bool:
+        match = LAST_WORD_RE.search(sentence)
+        if not match:
+            return False
+        word = match.group(1).lower()
+        # Single letters are initials ("J. Smith")
+        return word in ABBREVIATIONS or (len(word) == 1 and word.isalpha())
+
+    def feed(self, text: str) -> List[str]:
+        """Add streamed text; returns the chunks that are now complete"""
+        self._buffer += text
+
+        start = 0
+        for match in SENTENCE_END_RE.finditer(self._buffer):
+            candidate = self._buffer[start:match.end()]
+            if self._is_abbreviation(candidate):
+                continue
+            if candidate.strip():
+                self._pending.append(candidate.strip())
+            start = match.end()
+        self._buffer = self._buffer[start:]
+
+        chunks = []
+        if self._pending and self._emitted == 0:
+            chunks.append(self._pending.pop(0))
+            self._emitted += 1
+
+        chunk = " ".join(self._pending)
+        if self._pending and len(chunk) >= self.min_chars:
+            self._pending = []
+            self._emitted += 1
+            chunks.append(chunk)
+        return chunks
+
+    def flush(self) -> Optional[str]:
+        """Everything not emitted yet, once the stream has ended"""
+        rest = " ".join(self._pending + [self._buffer.strip()]).strip()
+        self._pending = []
+        self._buffer = ""
+        return rest or None
+
+
+async def stream_summary_speech(
+    summary_chunks: AsyncIterator[str],
+    tts,
+    voice_id: Optional[str] = None,
+    min_chars: int = STREAM_TTS_CHUNK_CHARS
+) -> AsyncIterator[bytes]:
+    """
+    Voice a streamed summary sentence by sentence
+
+    The summary is read into a queue by a background task, so the model keeps
+    writing while earlier sentences are synthesized. A second task voices the
+    chunks in order, each with the previous chunk as context for intonation,
+    and buffers the audio in another queue. Both queues are unbounded, so the
+    summarization slot and the ElevenLabs bulkhead are released at upstream
+    speed rather than at the speed of a slow listener (the buffer holds at
+    most one narration's audio).
+
+    Args:
+        summary_chunks: Summary text as it is generated
+        tts: Text-to-speech service with stream_audio_from_text (AsyncTTSService)
+        voice_id: Optional ElevenLabs voice ID
+        min_chars: Characters gathered per text-to-speech request after the first sentence
+
+    Yields:
+        MP3 audio chunks in order
+    """
+    sentences: asyncio.Queue = asyncio.Queue()
+    audio: asyncio.Queue = asyncio.Queue()
+
+    async def read_summary() -> None:
+        segmenter = SentenceSegmenter(min_chars)
+        try:
+            async for text in summary_chunks:
+                for chunk in segmenter.feed(text):
+                    await sentences.put(chunk)
+            rest = segmenter.flush()
+            if rest:
+                await sentences.put(rest)
+            await sentences.put(_END)
+        except Exception as e:
+            await sentences.put(e)
+
+    async def synthesize() -> None:
+        previous_text = None
+        try:
+            while True:
+                item = await sentences.get()
+                if item is _END or isinstance(item, Exception):
+                    await audio.put(item)
+                    return
+                async for chunk in tts.stream_audio_from_text(item, voice_id=voice_id, previous_text=previous_text):
+                    await audio.put(chunk)
+                previous_text = item
+        except Exception as e:
+            await audio.put(e)
+
+    tasks = [asyncio.create_task(read_summary()), asyncio.create_task(synthesize())]
+    try:
+        while True:
+            item = await audio.get()
+            if item is _END:
+                break
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
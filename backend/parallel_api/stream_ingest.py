@@ -0,0 +1,216 @@
+"""
+Streaming NDJSON ingestion
+Runs newline-delimited Parallel Extract results through bounded
+parse → embed → insert stages, so memory stays flat regardless of batch size
+"""
+import asyncio
+import json
+import logging
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from pydantic import ValidationError
+
+from .async_embedding_service import get_async_embedding_service
+from .bulk_ingest import bulk_insert_articles
+from .database import SessionLocal
+from .ingest import article_text, publish_date
+from .schemas import ParallelExtractResult
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Sentinel passed down the pipeline when a stage is done
+_DONE = None
+
+# (line number, result, text content, date written)
+Record = Tuple[int, ParallelExtractResult, str, Optional[datetime]]
+
+
+async def read_lines(chunks: AsyncIterator[bytes], max_line_bytes: int) -> AsyncIterator[Tuple[int, Optional[bytes]]]:
+    """
+    Split a byte stream into numbered lines
+
+    Lines longer than max_line_bytes are yielded as None (and skipped) rather
+    than buffered, so one oversized record can't exhaust memory.
+    """
+    buffer = bytearray()
+    line_number = 0
+    oversized = False
+
+    async for chunk in chunks:
+        buffer.extend(chunk)
+        while True:
+            newline = buffer.find(b"\n")
+            if newline < 0:
+                if len(buffer) > max_line_bytes:
+                    oversized = True
+                    buffer.clear()
+                break
+
+            line = bytes(buffer[:newline])
+            del buffer[:newline + 1]
+            line_number += 1
+            if oversized:
+                oversized = False
+                yield line_number, None
+            elif line.strip():
+                yield line_number, line
+
+    if oversized:
+        yield line_number + 1, None
+    elif buffer.strip():
+        yield line_number + 1, bytes(buffer)
+
+
+def _insert_and_commit(db, rows: List[Dict]) -> List[Tuple[Optional[int], Optional[str]]]:
+    try:
+        results = bulk_insert_articles(db, rows)
+        db.commit()
+        return results
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Stream batch insert failed: {str(e)}")
+        return [(None, f"Insert failed: {str(e)}")] * len(rows)
+
+
+async def ingest_ndjson(
+    chunks: AsyncIterator[bytes],
+    category_id: Optional[int] = None,
+    relevance_score: Optional[int] = 5,
+    batch_size: int = 64,
+    max_pending_batches: int = 2,
+    max_line_bytes: int = 16 * 1024 * 1024
+) -> AsyncIterator[bytes]:
+    """
+    Ingest NDJSON ParallelExtractResult records and stream back per-record results
+
+    Records are parsed, embedded batch_size at a time, and written with one
+    COPY per batch, committed as they go. Every queue between stages is
+    bounded, so when embedding or inserting falls behind the reader stops
+    pulling from the request body and the client is slowed down instead of
+    the server buffering the upload.
+
+    Args:
+        chunks: Request body byte stream
+        category_id: Category for every article
+        relevance_score: Relevance score for every article
+        batch_size: Records embedded and inserted together
+        max_pending_batches: Batches allowed to wait between stages
+        max_line_bytes: Longest accepted record
+
+    Yields:
+        One JSON line per record ({"line", "url", "article_id", "error"}),
+        a line with only "error" if reading the body or inserting stopped
+        early, then a final {"summary": {"articles_created", "errors",
+        "stream_errors"}} line (errors counts failed records)
+    """
+    to_embed: asyncio.Queue = asyncio.Queue(maxsize=max_pending_batches)
+    to_insert: asyncio.Queue = asyncio.Queue(maxsize=max_pending_batches)
+    results: asyncio.Queue = asyncio.Queue(maxsize=batch_size * max_pending_batches)
+
+    # Reading and inserting report a failure that stops them as a result line
+    # without "line" and then close the next queue; on cancellation (client
+    # gone) every stage just stops.
+    async def parse():
+        batch: List[Record] = []
+        try:
+            async for line_number, line in read_lines(chunks, max_line_bytes):
+                if line is None:
+                    await results.put({"line": line_number, "error": f"Record exceeds {max_line_bytes} bytes"})
+                    continue
+
+                try:
+                    result = ParallelExtractResult.model_validate(json.loads(line))
+                except (ValueError, ValidationError) as e:
+                    await results.put({"line": line_number, "error": f"Invalid record: {str(e)}"})
+                    continue
+
+                text_content = article_text(result)
+                if not text_content:
+                    await results.put({"line": line_number, "url": result.url, "error": "No text content available"})
+                    continue
+
+                batch.append((line_number, result, text_content, publish_date(result)))
+                if len(batch) >= batch_size:
+                    await to_embed.put(batch)
+                    batch = []
+
+            if batch:
+                await to_embed.put(batch)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Stream read failed: {str(e)}")
+            await results.put({"error": f"Stream read failed: {str(e)}"})
+        await to_embed.put(_DONE)
+
+    async def embed():
+        embedding_service = get_async_embedding_service()
+        # A failed batch fails only its own records; keep draining so the
+        # reader is never blocked and every record gets a result line
+        while (batch := await to_embed.get()) is not _DONE:
+            try:
+                embeddings = await embedding_service.generate_embeddings_batch([text for _, _, text, _ in batch])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Stream embedding failed for {len(batch)} records: {str(e)}")
+                for line_number, result, _, _ in batch:
+                    await results.put({"line": line_number, "url": result.url, "error": f"Embedding failed: {str(e)}"})
+                continue
+            await to_insert.put((batch, embeddings))
+        await to_insert.put(_DONE)
+
+    async def insert():
+        db = SessionLocal()
+        try:
+            while (item := await to_insert.get()) is not _DONE:
+                batch, embeddings = item
+                rows = [
+                    {
+                        "text": text_content,
+                        "summary": result.title,  # Use title as summary
+                        "relevance_score": relevance_score,
+                        "date_written": date_written,
+                        "source": result.url,
+                        "category_id": category_id,
+                        "vector": embedding
+                    }
+                    for (_, result, text_content, date_written), embedding in zip(batch, embeddings)
+                ]
+                inserted = await asyncio.to_thread(_insert_and_commit, db, rows)
+                for (line_number, result, _, _), (article_id, error) in zip(batch, inserted):
+                    await results.put({"line": line_number, "url": result.url, "article_id": article_id, "error": error})
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Stream insert failed: {str(e)}")
+            await results.put({"error": f"Insert failed: {str(e)}"})
+        finally:
+            db.close()
+        await results.put(_DONE)
+
+    stages = [asyncio.create_task(stage()) for stage in (parse, embed, insert)]
+    created = 0
+    failed = 0
+    stream_errors = 0
+
+    try:
+        while (record := await results.get()) is not _DONE:
+            if record.get("article_id") is not None:
+                created += 1
+            elif "line" in record:
+                failed += 1
+            else:
+                stream_errors += 1
+            yield (json.dumps(record) + "\n").encode("utf-8")
+
+        logger.info(f"Stream ingest complete: {created} articles created, {failed} errors, {stream_errors} stream errors")
+        summary = {"articles_created": created, "errors": failed, "stream_errors": stream_errors}
+        yield (json.dumps({"summary": summary}) + "\n").encode("utf-8")
+
+    finally:
+        # Client disconnected or we finished: stop any stage still running
+        for stage in stages:
+            stage.cancel()
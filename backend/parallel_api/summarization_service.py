@@ -6,7 +6,10 @@ import os
 from openai import AzureOpenAI
 from dotenv import load_dotenv
 import logging
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from .summary_planner import MAX_COMPLETION_TOKENS, SummaryPlanner
 
 load_dotenv()
 
@@ -25,11 +28,12 @@ class SummarizationService:
             azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT")
         )
 
-        # Use GPT-4 or GPT-3.5 for summarization
-        self.model = os.getenv(
-            "AZURE_OPENAI_CHAT_DEPLOYMENT",
-            "gpt-4"  # Fallback to gpt-4
-        )
+        # Prompts, pack planning and the summary cache
+        self.planner = SummaryPlanner()
+        self.model = self.planner.model
+
+        # Articles summarized at once by create_batch_summaries
+        self.max_in_flight = int(os.getenv("SUMMARY_MAX_IN_FLIGHT", "4"))
 
         logger.info(f"Initialized SummarizationService with model: {self.model}")
 
@@ -53,95 +57,155 @@ class SummarizationService:
         Returns:
             Summary text optimized for audio narration, or None if error
         """
-        if not text or not text.strip():
-            logger.warning("Empty text provided for summarization")
-            return None
+        summary, _ = self.create_audio_summary_with_usage(text, title, target_duration_minutes)
+        return summary
 
-        try:
-            # Calculate target word count (150 words per minute)
-            target_words = target_duration_minutes * 150
-
-            # Create the summarization prompt
-            system_prompt = (
-                "You are an expert news summarizer creating content for audio podcasts. "
-                "Create engaging, natural-sounding summaries that work well when read aloud. "
-                "Use clear, conversational language. Avoid complex formatting or special characters."
-            )
+    def create_audio_summary_with_usage(
+        self,
+        text: str,
+        title: str = "",
+        target_duration_minutes: int = 2
+    ) -> Tuple[Optional[str], Dict[str, int]]:
+        """
+        Create an audio summary and report the chat completion's token usage
 
-            user_prompt = (
-                f"Summarize the following article in approximately {target_words} words "
-                f"(for a {target_duration_minutes}-minute audio narration at 150 words per minute).\n\n"
-                "Requirements:\n"
-                "- Make it engaging and natural for audio listening\n"
-                "- Use conversational language\n"
-                "- Include key facts and insights\n"
-                "- Start with a brief hook\n"
-                "- End with a conclusion or key takeaway\n"
-                "- Avoid bullet points, use flowing prose\n\n"
-            )
+        Args:
+            text: Full article text to summarize
+            title: Article title (optional, for context)
+            target_duration_minutes: Target duration in minutes (default: 2)
 
-            if title:
-                user_prompt += f"Article Title: {title}\n\n"
+        Returns:
+            Tuple of (summary text or None if error, {"prompt_tokens",
+            "completion_tokens"} as reported by Azure OpenAI, empty if unknown;
+            {"cached": 1} when the summary came from the summary cache)
+        """
+        if not text or not text.strip():
+            logger.warning("Empty text provided for summarization")
+            return None, {}
 
-            user_prompt += f"Article Text:\n{text[:8000]}"  # Limit input to prevent token overflow
+        cached = self.planner.cached_summary(text, title, target_duration_minutes)
+        if cached is not None:
+            return cached, {"cached": 1}
 
+        return self._generate_summary(text, title, target_duration_minutes)
+
+    def _generate_summary(self, text: str, title: str, target_duration_minutes: int) -> Tuple[Optional[str], Dict[str, int]]:
+        """Request one summary from Azure OpenAI and add it to the summary cache"""
+        try:
             # Call Azure OpenAI
             response = self.client.chat.completions.create(
                 model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
+                messages=self.planner.build_messages(text, title, target_duration_minutes),
                 temperature=0.7,
-                max_tokens=500  # ~300-400 words
+                max_tokens=MAX_COMPLETION_TOKENS
             )
 
-            summary = response.choices[0].message.content.strip()
+            summary, usage = self.planner.parse_response(response, target_duration_minutes)
 
-            # Log word count
-            word_count = len(summary.split())
-            logger.info(f"Generated summary with {word_count} words (target: {target_words})")
+        except Exception as e:
+            logger.error(f"Error generating summary: {str(e)}")
+            return None, {}
+
+        self.planner.store_summary(text, title, target_duration_minutes, summary)
+        return summary, usage
 
-            return summary
+    def _generate_packed_summaries(
+        self,
+        pack: List[Tuple[str, str, str]],
+        target_duration_minutes: int
+    ) -> Dict[str, str]:
+        """
+        Request summaries for several (id, text, title) articles in one chat completion
 
+        Returns:
+            {article id: summary} for the articles the response covered
+            (empty if the request or its JSON failed)
+        """
+        article_ids = [article_id for article_id, _, _ in pack]
+        try:
+            response = self.client.chat.completions.create(
+                model=self.model,
+                messages=self.planner.build_packed_messages(pack, target_duration_minutes),
+                temperature=0.7,
+                max_tokens=self.planner.completion_tokens_per_summary(target_duration_minutes) * len(pack),
+                response_format={"type": "json_object"}
+            )
+            summaries, _ = self.planner.parse_packed_response(response, article_ids, target_duration_minutes)
         except Exception as e:
-            logger.error(f"Error generating summary: {str(e)}")
-            return None
+            logger.error(f"Error generating packed summaries: {str(e)}")
+            return {}
+
+        logger.info(f"Generated {len(summaries)}/{len(pack)} summaries in one packed request")
+        for article_id, text, title in pack:
+            self.planner.store_summary(text, title, target_duration_minutes, summaries.get(article_id))
+        return summaries
+
+    def cache_stats(self) -> Optional[Dict]:
+        """Summary cache hit/miss counters, or None when caching is disabled"""
+        return self.planner.cache_stats()
 
     def create_batch_summaries(
         self,
         articles: list[dict],
-        target_duration_minutes: int = 2
+        target_duration_minutes: int = 2,
+        packed: Optional[bool] = None
     ) -> list[Optional[str]]:
         """
         Create summaries for multiple articles
 
+        Articles already in the summary cache are returned without a
+        request. In packed mode short articles share a request (see
+        SummaryPlanner.plan_packs), and any article a packed response misses is retried
+        on its own. Up to SUMMARY_MAX_IN_FLIGHT requests run at once in
+        threads (the client retries transient errors itself). Async callers
+        should use AsyncSummarizationService, which also keeps to the
+        deployment's RPM/TPM quota.
+
         Args:
             articles: List of article dicts with 'text' and optionally 'title'
             target_duration_minutes: Target duration per summary
+            packed: Pack short articles into shared requests (default: SUMMARY_PACK_ENABLED)
 
         Returns:
-            List of summaries (or None for failed items)
+            List of summaries in input order (or None for failed items)
         """
-        summaries = []
-
-        for idx, article in enumerate(articles):
+        if not articles:
+            return []
+        if packed is None:
+            packed = self.planner.pack_enabled
+
+        items = self.planner.batch_items(articles)
+        summaries: List[Optional[str]] = [None] * len(items)
+        pending = []
+        for idx, (text, title) in enumerate(items):
+            if not text.strip():
+                logger.warning(f"Empty text provided for article {idx}")
+                continue
+            summaries[idx] = self.planner.cached_summary(text, title, target_duration_minutes)
+            if summaries[idx] is None:
+                pending.append(idx)
+
+        def summarize(idx: int) -> None:
             try:
-                text = article.get('text', '')
-                title = article.get('title') or article.get('summary', '')
-
-                summary = self.create_audio_summary(
-                    text=text,
-                    title=title,
-                    target_duration_minutes=target_duration_minutes
-                )
-
-                summaries.append(summary)
+                text, title = items[idx]
+                summaries[idx], _ = self._generate_summary(text, title, target_duration_minutes)
                 logger.info(f"Generated summary {idx+1}/{len(articles)}")
-
             except Exception as e:
                 logger.error(f"Error generating summary for article {idx}: {str(e)}")
-                summaries.append(None)
+
+        def summarize_unit(unit: List[int]) -> None:
+            if len(unit) > 1:
+                pack = [(str(idx), items[idx][0], items[idx][1]) for idx in unit]
+                for article_id, summary in self._generate_packed_summaries(pack, target_duration_minutes).items():
+                    summaries[int(article_id)] = summary
+            for idx in unit:
+                if summaries[idx] is None:
+                    summarize(idx)
+
+        units = self.planner.plan_packs(items, pending, target_duration_minutes) if packed else [[idx] for idx in pending]
+        if units:
+            with ThreadPoolExecutor(max_workers=max(1, min(self.max_in_flight, len(units)))) as executor:
+                list(executor.map(summarize_unit, units))
 
         return summaries
 
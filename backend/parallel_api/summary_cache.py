@@ -0,0 +1,54 @@
+"""
+Persistent summary cache
+Stores audio summaries keyed by a hash of exactly what was sent to the model
+(article text, title, target duration, model and prompt version), so an
+article that was summarized before costs no LLM call
+"""
+import hashlib
+import os
+from typing import Optional
+
+from .kv_cache import PostgresStore, SQLiteStore, TwoTierCache
+
+
+def summary_key(model: str, prompt_version: str, text: str, title: str, target_duration_minutes: int) -> str:
+    """SHA-256 of every input that affects the summary"""
+    parts = (model, prompt_version, str(target_duration_minutes), title or "", text)
+    return hashlib.sha256("\x00".join(parts).encode("utf-8")).hexdigest()
+
+
+def create_summary_cache() -> Optional[TwoTierCache]:
+    """
+    Build the summary cache from environment settings
+
+    SUMMARY_CACHE_ENABLED (default true), SUMMARY_CACHE_PATH,
+    SUMMARY_CACHE_MAX_ENTRIES and SUMMARY_CACHE_POSTGRES (default false;
+    uses DATABASE_URL and SUMMARY_CACHE_POSTGRES_MAX_ENTRIES).
+
+    Returns:
+        TwoTierCache of summary text, or None when caching is disabled
+    """
+    if os.getenv("SUMMARY_CACHE_ENABLED", "true").lower() not in ("1", "true", "yes"):
+        return None
+
+    local = SQLiteStore(
+        os.getenv("SUMMARY_CACHE_PATH", os.path.join(os.path.dirname(__file__), "summary_cache.sqlite3")),
+        table="summaries",
+        value_column="summary",
+        value_type="TEXT",
+        max_entries=int(os.getenv("SUMMARY_CACHE_MAX_ENTRIES", "20000"))
+    )
+
+    shared = None
+    if os.getenv("SUMMARY_CACHE_POSTGRES", "false").lower() in ("1", "true", "yes"):
+        from .database import engine
+
+        shared = PostgresStore(
+            engine,
+            table="summary_cache",
+            value_column="summary",
+            value_type="TEXT",
+            max_entries=int(os.getenv("SUMMARY_CACHE_POSTGRES_MAX_ENTRIES", "200000"))
+        )
+
+    return TwoTierCache(local, shared, name="summary")
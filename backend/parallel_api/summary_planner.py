@@ -0,0 +1,249 @@
+"""
+Summary request planning shared by the sync and async summarization services
+Builds prompts, plans packed requests, parses responses and reads and writes
+the summary cache; holds no client, so each service only adds its own way
+of sending the requests
+"""
+import json
+import logging
+import os
+from typing import Dict, List, Optional, Tuple
+
+from .summary_cache import create_summary_cache, summary_key
+from .text_compression import compress_text
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Narration speed used to size summaries
+WORDS_PER_MINUTE = 150
+
+# Article text sent to the model when compression is off; anything longer is truncated
+MAX_INPUT_CHARS = 8000
+
+# Completion budget per summary (~300-400 words)
+MAX_COMPLETION_TOKENS = 500
+
+SYSTEM_PROMPT = (
+    "You are an expert news summarizer creating content for audio podcasts. "
+    "Create engaging, natural-sounding summaries that work well when read aloud. "
+    "Use clear, conversational language. Avoid complex formatting or special characters."
+)
+
+SUMMARY_REQUIREMENTS = (
+    "- Make it engaging and natural for audio listening\n"
+    "- Use conversational language\n"
+    "- Include key facts and insights\n"
+    "- Start with a brief hook\n"
+    "- End with a conclusion or key takeaway\n"
+    "- Avoid bullet points, use flowing prose\n"
+)
+
+# Prompt overhead of a packed request (system prompt, instructions, JSON framing)
+PACK_OVERHEAD_TOKENS = 400
+
+# Part of every summary cache key; bump when the prompt changes so old summaries are not reused
+PROMPT_VERSION = "1"
+
+
+def _usage(response) -> Dict[str, int]:
+    if not getattr(response, "usage", None):
+        return {}
+    return {
+        "prompt_tokens": response.usage.prompt_tokens,
+        "completion_tokens": response.usage.completion_tokens
+    }
+
+
+class SummaryPlanner:
+    """Prompts, packing and caching for one chat deployment"""
+
+    def __init__(self):
+        # Use GPT-4 or GPT-3.5 for summarization
+        self.model = os.getenv(
+            "AZURE_OPENAI_CHAT_DEPLOYMENT",
+            "gpt-4"  # Fallback to gpt-4
+        )
+
+        # Extractive pre-pass: send the article's most informative sentences
+        # within SUMMARY_INPUT_MAX_TOKENS instead of its first MAX_INPUT_CHARS
+        self.compress_input = os.getenv("SUMMARY_COMPRESSION_ENABLED", "true").lower() in ("1", "true", "yes")
+        self.input_max_tokens = int(os.getenv("SUMMARY_INPUT_MAX_TOKENS", "1500"))
+
+        # Packed mode: create_batch_summaries sends several short articles per
+        # request. Off by default: it uses JSON mode, which older deployments
+        # such as the default gpt-4 reject
+        self.pack_enabled = os.getenv("SUMMARY_PACK_ENABLED", "false").lower() in ("1", "true", "yes")
+        self.pack_max_article_chars = int(os.getenv("SUMMARY_PACK_MAX_ARTICLE_CHARS", "3000"))
+        self.pack_max_items = int(os.getenv("SUMMARY_PACK_MAX_ITEMS", "8"))
+        self.pack_max_tokens = int(os.getenv("SUMMARY_PACK_MAX_TOKENS", "8000"))
+
+        # Persistent cache so an article that was summarized before costs no LLM call
+        self.cache = create_summary_cache()
+
+    def prepare_text(self, text: str) -> str:
+        """Article text as sent to the model"""
+        if self.compress_input:
+            return compress_text(text, self.input_max_tokens)
+        return text[:MAX_INPUT_CHARS]
+
+    def build_messages(self, text: str, title: str, target_duration_minutes: int) -> List[Dict[str, str]]:
+        """Chat messages asking for a summary sized for the target narration time"""
+        # Calculate target word count (150 words per minute)
+        target_words = target_duration_minutes * WORDS_PER_MINUTE
+
+        # Create the summarization prompt
+        user_prompt = (
+            f"Summarize the following article in approximately {target_words} words "
+            f"(for a {target_duration_minutes}-minute audio narration at 150 words per minute).\n\n"
+            "Requirements:\n"
+            f"{SUMMARY_REQUIREMENTS}\n"
+        )
+
+        if title:
+            user_prompt += f"Article Title: {title}\n\n"
+
+        user_prompt += f"Article Text:\n{self.prepare_text(text)}"  # Limit input to prevent token overflow
+
+        return [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": user_prompt}
+        ]
+
+    def build_packed_messages(self, pack: List[Tuple[str, str, str]], target_duration_minutes: int) -> List[Dict[str, str]]:
+        """Chat messages asking for one summary per (id, text, title) in a single JSON object"""
+        target_words = target_duration_minutes * WORDS_PER_MINUTE
+
+        user_prompt = (
+            f"Summarize each of the following {len(pack)} articles separately, each in approximately "
+            f"{target_words} words (for a {target_duration_minutes}-minute audio narration at 150 words per minute).\n\n"
+            "Requirements for every summary:\n"
+            f"{SUMMARY_REQUIREMENTS}"
+            "- Cover only its own article; never mix facts between articles\n\n"
+            'Respond with only a JSON object of the form {"summaries": [{"id": "<article id>", "summary": "<summary>"}]} '
+            "containing exactly one entry for every article id below.\n"
+        )
+
+        for article_id, text, title in pack:
+            user_prompt += f"\n=== Article ID: {article_id} ===\n"
+            if title:
+                user_prompt += f"Article Title: {title}\n"
+            user_prompt += f"Article Text:\n{self.prepare_text(text)}\n"
+
+        return [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": user_prompt}
+        ]
+
+    def completion_tokens_per_summary(self, target_duration_minutes: int) -> int:
+        """Completion budget for one summary (~1.7 tokens per target word, at least MAX_COMPLETION_TOKENS)"""
+        return max(MAX_COMPLETION_TOKENS, target_duration_minutes * WORDS_PER_MINUTE * 5 // 3)
+
+    def batch_items(self, articles: List[dict]) -> List[Tuple[str, str]]:
+        """(text, title) of every article in a create_batch_summaries call"""
+        return [(article.get('text') or '', article.get('title') or article.get('summary', '')) for article in articles]
+
+    def plan_packs(self, items: List[Tuple[str, str]], pending: List[int], target_duration_minutes: int) -> List[List[int]]:
+        """
+        Group pending articles into requests
+
+        Articles whose prepared text is up to SUMMARY_PACK_MAX_ARTICLE_CHARS
+        are packed greedily while the pack stays within SUMMARY_PACK_MAX_ITEMS
+        articles and SUMMARY_PACK_MAX_TOKENS estimated prompt + completion
+        tokens (~3 chars per token). Longer articles, and packs that end up
+        with a single article, get a request of their own.
+
+        Args:
+            items: (text, title) of every article in the batch
+            pending: Indexes of the articles that still need a summary
+            target_duration_minutes: Target duration per summary
+
+        Returns:
+            Lists of article indexes, one per request
+        """
+        completion_tokens = self.completion_tokens_per_summary(target_duration_minutes)
+        units: List[List[int]] = []
+        pack: List[int] = []
+        pack_tokens = PACK_OVERHEAD_TOKENS
+
+        for idx in pending:
+            text, title = items[idx]
+            text = self.prepare_text(text)
+            if len(text) > self.pack_max_article_chars:
+                units.append([idx])
+                continue
+
+            tokens = (len(text) + len(title)) // 3 + 20 + completion_tokens
+            if pack and (len(pack) >= self.pack_max_items or pack_tokens + tokens > self.pack_max_tokens):
+                units.append(pack)
+                pack, pack_tokens = [], PACK_OVERHEAD_TOKENS
+            pack.append(idx)
+            pack_tokens += tokens
+
+        if pack:
+            units.append(pack)
+        return units
+
+    def parse_response(self, response, target_duration_minutes: int) -> Tuple[str, Dict[str, int]]:
+        """Summary text and token usage of a single-article response"""
+        summary = response.choices[0].message.content.strip()
+
+        # Log word count
+        word_count = len(summary.split())
+        logger.info(f"Generated summary with {word_count} words (target: {target_duration_minutes * WORDS_PER_MINUTE})")
+
+        return summary, _usage(response)
+
+    def parse_packed_response(
+        self,
+        response,
+        article_ids: List[str],
+        target_duration_minutes: int
+    ) -> Tuple[Dict[str, str], Dict[str, int]]:
+        """
+        Split a packed response into summaries by article id
+
+        Entries for unknown ids, duplicates and summaries shorter than a
+        quarter of the target length are dropped, so those articles fall
+        back to a request of their own.
+
+        Returns:
+            Tuple of ({article id: summary}, token usage)
+        """
+        data = json.loads(response.choices[0].message.content)
+        entries = data.get("summaries") if isinstance(data, dict) else None
+        if not isinstance(entries, list):
+            raise ValueError("packed response has no 'summaries' list")
+
+        min_words = target_duration_minutes * WORDS_PER_MINUTE // 4
+        summaries = {}
+        for entry in entries:
+            if not isinstance(entry, dict):
+                continue
+            article_id = str(entry.get("id", ""))
+            summary = entry.get("summary")
+            if article_id not in article_ids or article_id in summaries or not isinstance(summary, str):
+                continue
+            if len(summary.split()) < min_words:
+                logger.warning(f"Packed summary for article {article_id} is too short, summarizing it on its own")
+                continue
+            summaries[article_id] = summary.strip()
+
+        return summaries, _usage(response)
+
+    def cache_key(self, text: str, title: str, target_duration_minutes: int) -> str:
+        """Cache key covering exactly what build_messages sends to the model"""
+        return summary_key(self.model, PROMPT_VERSION, self.prepare_text(text), title, target_duration_minutes)
+
+    def cached_summary(self, text: str, title: str, target_duration_minutes: int) -> Optional[str]:
+        if self.cache is None:
+            return None
+        return self.cache.get(self.cache_key(text, title, target_duration_minutes))
+
+    def store_summary(self, text: str, title: str, target_duration_minutes: int, summary: Optional[str]) -> None:
+        if self.cache is not None and summary:
+            self.cache.put(self.cache_key(text, title, target_duration_minutes), summary)
+
+    def cache_stats(self) -> Optional[Dict]:
+        """Summary cache hit/miss counters, or None when caching is disabled"""
+        return self.cache.stats() if self.cache is not None else None
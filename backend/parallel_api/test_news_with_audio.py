@@ -10,12 +10,31 @@ This will:
 """
 import requests
 import json
+import time
 from datetime import datetime
 
 # API endpoint
 API_URL = "http://localhost:8001"  # parallel_api runs on 8001
 ENDPOINT = f"{API_URL}/news/generate-with-audio"
 
+def wait_for_job(job_id, timeout=600, poll_interval=2):
+    """Poll a background job until it finishes, printing progress"""
+    deadline = time.time() + timeout
+    last_message = None
+
+    while time.time() < deadline:
+        job = requests.get(f"{API_URL}/jobs/{job_id}", timeout=30).json()
+        message = f"  [{job['progress']:5.1f}%] {job['status']}: {job['message']}"
+        if message != last_message:
+            print(message)
+            last_message = message
+        if job["status"] in ("succeeded", "failed"):
+            return job
+        time.sleep(poll_interval)
+
+    raise TimeoutError(f"Job {job_id} did not finish within {timeout} seconds")
+
+
 def test_news_with_audio():
     """Test the complete news with audio workflow"""
 
@@ -42,10 +61,14 @@ def test_news_with_audio():
     print("This will take a few minutes (searching, extracting, summarizing, generating audio)...\n")
 
     try:
-        response = requests.post(ENDPOINT, json=payload, timeout=600)  # 10 min timeout
+        response = requests.post(ENDPOINT, json=payload, timeout=30)
 
-        if response.status_code == 200:
-            result = response.json()
+        if response.status_code == 202:
+            job = wait_for_job(response.json()["id"])
+            if job["status"] != "succeeded":
+                print(f"\n✗ Job {job['id']} failed: {job['error']}")
+                return
+            result = job["result"]
 
             print("\n" + "="*80)
             print("SUCCESS!")
@@ -84,8 +107,8 @@ def test_news_with_audio():
             print(f"\n✗ Error: {response.status_code}")
             print(f"Response: {response.text}")
 
-    except requests.exceptions.Timeout:
-        print("\n✗ Request timed out (took longer than 10 minutes)")
+    except TimeoutError as e:
+        print(f"\n✗ {str(e)}")
     except Exception as e:
         print(f"\n✗ Error: {str(e)}")
 
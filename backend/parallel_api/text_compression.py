@@ -0,0 +1,198 @@
+"""
+Extractive pre-compression for summarization
+Strips scraped-page boilerplate and keeps the most informative sentences of the
+whole article within a token budget, so the summarizer sees the end of long
+articles instead of only their first 8000 characters
+"""
+import re
+from functools import lru_cache
+from typing import List, Tuple
+
+import numpy as np
+
+# Same conservative estimate as the embedding service (~3 chars per token)
+CHARS_PER_TOKEN = 3
+
+# Text beyond this is ignored before scoring (keeps the similarity matrix small)
+MAX_SOURCE_CHARS = 100_000
+
+# TextRank damping and iterations
+DAMPING = 0.85
+MAX_ITERATIONS = 50
+TOLERANCE = 1e-6
+
+# News leads with the key facts, so early sentences get a boost (added to a
+# TextRank score normalized to mean 1, decaying with 1/sqrt(position))
+LEAD_WEIGHT = 1.0
+
+BOILERPLATE_RE = re.compile(
+    r"cookie|subscribe|newsletter|sign up|sign in|log in|advertisement|all rights reserved|"
+    r"copyright|©|share this|follow us|read more|related articles|recommended for you|"
+    r"click here|privacy policy|terms of (use|service)|skip to (main )?content|accept all",
+    re.IGNORECASE
+)
+MARKDOWN_IMAGE_RE = re.compile(r"!\[[^\]]*\]\([^)]*\)")
+MARKDOWN_LINK_RE = re.compile(r"\[([^\]]*)\]\([^)]*\)")
+URL_RE = re.compile(r"https?://\S+")
+SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?])\s+(?=[\"“‘(\[]?[A-Z0-9])")
+WORD_RE = re.compile(r"[a-z0-9][a-z0-9'’-]+")
+
+STOPWORDS = frozenset("""
+a about above after again against all also am an and any are as at be because been before being below
+between both but by can could did do does doing down during each few for from further had has have having
+he her here hers herself him himself his how i if in into is it its itself just me more most my myself no
+nor not now of off on once only or other our ours ourselves out over own said same says she should so some
+such than that the their theirs them themselves then there these they this those through to too under
+until up very was we were what when where which while who whom why will with would you your yours
+yourself yourselves
+""".split())
+
+
+def strip_boilerplate(text: str) -> str:
+    """
+    Remove navigation, cookie banners, share links and similar lines from scraped text
+
+    Markdown images and bare URLs are dropped and links keep only their text.
+    A line is removed when it repeats an earlier line, matches a boilerplate
+    phrase while being short, or is a short fragment without sentence
+    punctuation (menus, bylines, captions).
+    """
+    kept = []
+    seen = set()
+    for line in text.splitlines():
+        line = MARKDOWN_IMAGE_RE.sub("", line)
+        line = MARKDOWN_LINK_RE.sub(r"\1", line)
+        line = URL_RE.sub("", line)
+        line = line.strip(" \t#*>-|")
+        if not line:
+            continue
+
+        key = line.lower()
+        words = len(WORD_RE.findall(key))
+        if key in seen:
+            continue
+        if words < 25 and BOILERPLATE_RE.search(line):
+            continue
+        if words < 6 and not line.endswith((".", "!", "?", '"', "”")):
+            continue
+
+        seen.add(key)
+        kept.append(line)
+
+    return "\n\n".join(kept)
+
+
+def split_sentences(text: str) -> List[Tuple[int, str]]:
+    """(paragraph index, sentence) pairs in reading order"""
+    sentences = []
+    for paragraph, block in enumerate(re.split(r"\n\s*\n", text)):
+        for sentence in SENTENCE_SPLIT_RE.split(" ".join(block.split())):
+            if sentence:
+                sentences.append((paragraph, sentence))
+    return sentences
+
+
+def score_sentences(sentences: List[str]) -> np.ndarray:
+    """
+    TextRank over TF-IDF sentence similarity, with a lead bias
+
+    Sentences are documents; terms that occur in only one sentence cannot
+    link sentences and are left out of the matrix.
+
+    Returns:
+        One score per sentence (higher is more central to the article)
+    """
+    count = len(sentences)
+    if count == 0:
+        return np.zeros(0)
+
+    tokenized = [[word for word in WORD_RE.findall(sentence.lower()) if word not in STOPWORDS] for sentence in sentences]
+
+    document_frequency = {}
+    for words in tokenized:
+        for word in set(words):
+            document_frequency[word] = document_frequency.get(word, 0) + 1
+    vocabulary = {word: column for column, word in enumerate(w for w, df in document_frequency.items() if df > 1)}
+
+    lead_bonus = LEAD_WEIGHT / np.sqrt(np.arange(1, count + 1))
+    if not vocabulary:
+        return 1 + lead_bonus
+
+    rows, columns = [], []
+    for row, words in enumerate(tokenized):
+        for word in words:
+            column = vocabulary.get(word)
+            if column is not None:
+                rows.append(row)
+                columns.append(column)
+
+    term_counts = np.zeros((count, len(vocabulary)), dtype=np.float32)
+    np.add.at(term_counts, (rows, columns), 1.0)
+
+    idf = np.log((1 + count) / (1 + np.array([document_frequency[word] for word in vocabulary], dtype=np.float32))) + 1
+    tfidf = term_counts * idf
+    norms = np.linalg.norm(tfidf, axis=1, keepdims=True)
+    tfidf /= np.where(norms == 0, 1, norms)
+
+    similarity = tfidf @ tfidf.T
+    np.fill_diagonal(similarity, 0)
+    out_weight = similarity.sum(axis=1, keepdims=True)
+    transition = np.divide(similarity, out_weight, out=np.zeros_like(similarity), where=out_weight > 0)
+
+    rank = np.full(count, 1.0 / count, dtype=np.float32)
+    for _ in range(MAX_ITERATIONS):
+        updated = (1 - DAMPING) / count + DAMPING * (transition.T @ rank)
+        converged = np.abs(updated - rank).sum() < TOLERANCE
+        rank = updated
+        if converged:
+            break
+
+    return rank / rank.mean() + lead_bonus
+
+
+@lru_cache(maxsize=256)
+def compress_text(text: str, max_tokens: int) -> str:
+    """
+    Compress article text to about max_tokens for the summarizer
+
+    Boilerplate is stripped first; if the rest still exceeds the budget the
+    highest-scoring sentences from the whole article are kept, in their
+    original order and paragraphs.
+
+    Args:
+        text: Article text (scraped page or search excerpts)
+        max_tokens: Input budget (estimated at CHARS_PER_TOKEN chars per token)
+
+    Returns:
+        Compressed text (the original text if stripping removed everything)
+    """
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    text = text[:MAX_SOURCE_CHARS]
+    cleaned = strip_boilerplate(text) or text
+    if len(cleaned) <= max_chars:
+        return cleaned
+
+    sentences = split_sentences(cleaned)
+    scores = score_sentences([sentence for _, sentence in sentences])
+
+    chosen = []
+    used = 0
+    for index in np.argsort(-scores, kind="stable"):
+        length = len(sentences[index][1]) + 2
+        if used + length > max_chars:
+            continue
+        chosen.append(int(index))
+        used += length
+
+    if not chosen:
+        return cleaned[:max_chars]
+
+    parts = []
+    previous_paragraph = None
+    for index in sorted(chosen):
+        paragraph, sentence = sentences[index]
+        if previous_paragraph is not None:
+            parts.append("\n\n" if paragraph != previous_paragraph else " ")
+        parts.append(sentence)
+        previous_paragraph = paragraph
+    return "".join(parts)
@@ -0,0 +1,178 @@
+"""
+Background job worker
+Claims jobs from the job store and runs them, so long workflows don't live
+inside HTTP requests. Scale workers independently of the API.
+
+Usage:
+    python -m parallel_api.worker [--processes 2] [--concurrency 1]
+"""
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import traceback
+from typing import Any, Awaitable, Callable, Dict
+
+from .database import get_db_context
+from .ingest import ingest_extract_batch
+from .jobs import JobStore, get_job_store
+from .news_workflow import run_news_workflow
+from .schemas import NewsWithAudioRequest, ParallelExtractBatch
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "1.0"))
+HEARTBEAT_INTERVAL = float(os.getenv("JOB_HEARTBEAT_INTERVAL", "15"))
+STALE_AFTER = float(os.getenv("JOB_STALE_AFTER", "300"))
+
+# handler(payload, progress) -> JSON-serializable result
+JobHandler = Callable[[Dict[str, Any], Callable[[float, str], None]], Awaitable[Dict[str, Any]]]
+
+
+async def run_news_job(payload: Dict[str, Any], progress: Callable[[float, str], None]) -> Dict[str, Any]:
+    request = NewsWithAudioRequest(**payload)
+    with get_db_context() as db:
+        response = await run_news_workflow(request, db, progress)
+    return response.model_dump(mode="json")
+
+
+async def run_ingest_job(payload: Dict[str, Any], progress: Callable[[float, str], None]) -> Dict[str, Any]:
+    batch = ParallelExtractBatch(**payload)
+    progress(5, f"Ingesting {len(batch.results)} results")
+    with get_db_context() as db:
+        response = await ingest_extract_batch(batch, db)
+    return response.model_dump(mode="json")
+
+
+HANDLERS: Dict[str, JobHandler] = {
+    "news_with_audio": run_news_job,
+    "ingest_batch": run_ingest_job,
+}
+
+
+async def run_job(store: JobStore, job, worker_id: str) -> None:
+    handler = HANDLERS.get(job.kind)
+    if handler is None:
+        await asyncio.to_thread(store.fail, job.id, worker_id, f"Unknown job kind {job.kind!r}")
+        return
+
+    logger.info(f"[{worker_id}] Running job {job.id} ({job.kind}, attempt {job.attempts}/{job.max_attempts})")
+
+    async def heartbeat():
+        while True:
+            await asyncio.sleep(HEARTBEAT_INTERVAL)
+            await asyncio.to_thread(store.heartbeat, job.id, worker_id)
+
+    # Handlers report progress synchronously from the event loop; the writes
+    # happen in a thread, and only the newest of several waiting updates is kept
+    updates: asyncio.Queue = asyncio.Queue()
+
+    async def write_progress():
+        while True:
+            percent, message = await updates.get()
+            while not updates.empty():
+                percent, message = updates.get_nowait()
+            await asyncio.to_thread(store.set_progress, job.id, worker_id, percent, message)
+
+    def progress(percent: float, message: str) -> None:
+        updates.put_nowait((percent, message))
+
+    tasks = [asyncio.create_task(heartbeat()), asyncio.create_task(write_progress())]
+    try:
+        result = await handler(job.payload, progress)
+        if await asyncio.to_thread(store.complete, job.id, worker_id, result):
+            logger.info(f"[{worker_id}] ✓ Job {job.id} succeeded")
+    except Exception as e:
+        logger.error(f"[{worker_id}] Job {job.id} failed: {str(e)}", exc_info=True)
+        status = await asyncio.to_thread(store.fail, job.id, worker_id, f"{str(e)}\n{traceback.format_exc()}")
+        logger.info(f"[{worker_id}] Job {job.id} is now {status}")
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def worker_loop(worker_id: str, concurrency: int, stop: asyncio.Event) -> None:
+    """Claim and run jobs, up to `concurrency` at a time, until stop is set"""
+    store = get_job_store()
+    running = set()
+    last_stale_check = 0.0
+    loop = asyncio.get_running_loop()
+
+    logger.info(f"Worker {worker_id} started (concurrency={concurrency})")
+
+    while not stop.is_set():
+        if loop.time() - last_stale_check > STALE_AFTER / 2:
+            await asyncio.to_thread(store.requeue_stale, STALE_AFTER)
+            last_stale_check = loop.time()
+
+        job = None
+        if len(running) < concurrency:
+            job = await asyncio.to_thread(store.claim, worker_id)
+
+        if job is not None:
+            task = asyncio.create_task(run_job(store, job, worker_id))
+            running.add(task)
+            task.add_done_callback(running.discard)
+            continue
+
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=POLL_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
+
+    # Let in-flight jobs finish before exiting
+    if running:
+        logger.info(f"Worker {worker_id} waiting for {len(running)} running job(s)...")
+        await asyncio.gather(*running, return_exceptions=True)
+    logger.info(f"Worker {worker_id} stopped")
+
+
+def run_worker(index: int, concurrency: int) -> None:
+    worker_id = f"{socket.gethostname()}:{os.getpid()}:{index}"
+
+    async def main():
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(sig, stop.set)
+        await worker_loop(worker_id, concurrency, stop)
+
+    asyncio.run(main())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--processes", type=int, default=int(os.getenv("JOB_WORKER_PROCESSES", "1")))
+    parser.add_argument("--concurrency", type=int, default=int(os.getenv("JOB_WORKER_CONCURRENCY", "1")),
+                        help="Jobs each process runs at once")
+    args = parser.parse_args()
+
+    if args.processes <= 1:
+        run_worker(0, args.concurrency)
+        return
+
+    context = multiprocessing.get_context("spawn")
+    processes = [
+        context.Process(target=run_worker, args=(i, args.concurrency), name=f"job-worker-{i}")
+        for i in range(args.processes)
+    ]
+    for process in processes:
+        process.start()
+
+    def shutdown(signum, frame):
+        for process in processes:
+            process.terminate()
+
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+
+    for process in processes:
+        process.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+"""
+Workflow timing spans
+Records how long each stage of a workflow run took (per run and per article),
+with character and token counts for every upstream call, and stores runs so
+stage latency percentiles can be compared across runs
+"""
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from .models import WorkflowRun, WorkflowSpan
+
+class Span:
+    """Timing of one stage; attributes hold counts such as chars_in or tokens_out"""
+
+    def __init__(self, stage: str, article_index: Optional[int], start_ms: float, attributes: Dict[str, Any]):
+        self.stage = stage
+        self.article_index = article_index
+        self.start_ms = start_ms
+        self.duration_ms = 0.0
+        self.error: Optional[str] = None
+        self.attributes = {key: value for key, value in attributes.items() if value is not None}
+
+    def set(self, **attributes) -> None:
+        """Add counts once they are known (e.g. tokens from the API response)"""
+        self.attributes.update((key, value) for key, value in attributes.items() if value is not None)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "stage": self.stage,
+            "article_index": self.article_index,
+            "start_ms": round(self.start_ms, 1),
+            "duration_ms": round(self.duration_ms, 1),
+            "error": self.error,
+            "attributes": self.attributes,
+        }
+
+
+class WorkflowTrace:
+    """
+    Collects spans for one workflow run
+
+    Spans may be opened from the event loop or from worker threads (the
+    blocking SDK calls), so recording is guarded by a lock.
+    """
+
+    def __init__(self, kind: str):
+        self.kind = kind
+        self.started_at = datetime.now(timezone.utc)
+        self._started = time.perf_counter()
+        self._lock = threading.Lock()
+        self.spans: List[Span] = []
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self._started) * 1000
+
+    @contextmanager
+    def span(self, stage: str, article_index: Optional[int] = None, **attributes) -> Iterator[Span]:
+        """Time the enclosed block; an exception is recorded on the span and re-raised"""
+        span = Span(stage, article_index, self.elapsed_ms(), attributes)
+        started = time.perf_counter()
+        try:
+            yield span
+        except BaseException as e:
+            span.error = str(e) or type(e).__name__
+            raise
+        finally:
+            span.duration_ms = (time.perf_counter() - started) * 1000
+            with self._lock:
+                self.spans.append(span)
+
+    def snapshot(self) -> List[Span]:
+        """Spans recorded so far, in start order"""
+        with self._lock:
+            return sorted(self.spans, key=lambda span: span.start_ms)
+
+    def stage_totals(self) -> List[Dict[str, Any]]:
+        """Count, total and slowest duration for each stage, in the order stages first ran"""
+        totals: Dict[str, Dict[str, Any]] = {}
+        for span in self.snapshot():
+            entry = totals.setdefault(span.stage, {"stage": span.stage, "count": 0, "total_ms": 0.0, "max_ms": 0.0, "errors": 0})
+            entry["count"] += 1
+            entry["total_ms"] += span.duration_ms
+            entry["max_ms"] = max(entry["max_ms"], span.duration_ms)
+            entry["errors"] += span.error is not None
+        for entry in totals.values():
+            entry["total_ms"] = round(entry["total_ms"], 1)
+            entry["max_ms"] = round(entry["max_ms"], 1)
+        return list(totals.values())
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "total_ms": round(self.elapsed_ms(), 1),
+            "stages": self.stage_totals(),
+            "spans": [span.to_dict() for span in self.snapshot()],
+        }
+
+
+def save_workflow_run(
+    db: Session,
+    trace: WorkflowTrace,
+    query: Optional[str] = None,
+    success: bool = False,
+    error: Optional[str] = None,
+    articles_processed: int = 0
+) -> int:
+    """
+    Store a finished run and its spans
+
+    Args:
+        db: Database session (committed here)
+        trace: Spans collected during the run
+        query: The workflow's search query
+        success: Whether the run produced any output
+        error: Error that stopped the run, if any
+        articles_processed: Articles stored by the run
+
+    Returns:
+        The workflow run's id
+    """
+    run = WorkflowRun(
+        kind=trace.kind,
+        query=query,
+        success=success,
+        error=error,
+        articles_processed=articles_processed,
+        started_at=trace.started_at,
+        duration_ms=trace.elapsed_ms(),
+        spans=[
+            WorkflowSpan(
+                stage=span.stage,
+                article_index=span.article_index,
+                start_ms=span.start_ms,
+                duration_ms=span.duration_ms,
+                error=span.error,
+                attributes=span.attributes or None
+            )
+            for span in trace.snapshot()
+        ]
+    )
+    db.add(run)
+    db.commit()
+    return run.id
+
+
+def stage_latency_percentiles(db: Session, kind: str, since: Optional[datetime] = None) -> Dict[str, Any]:
+    """
+    p50/p95/p99 duration of each stage across stored runs
+
+    Args:
+        db: Database session
+        kind: Workflow kind (e.g. "news_with_audio")
+        since: Only include runs started at or after this time (default: last 7 days)
+
+    Returns:
+        Run count, total-duration percentiles and per-stage percentiles
+    """
+    if since is None:
+        since = datetime.now(timezone.utc) - timedelta(days=7)
+
+    def percentiles(column):
+        return [
+            func.percentile_cont(fraction).within_group(column).label(label)
+            for fraction, label in ((0.5, "p50_ms"), (0.95, "p95_ms"), (0.99, "p99_ms"))
+        ]
+
+    runs = db.query(
+        func.count(WorkflowRun.id).label("runs"),
+        *percentiles(WorkflowRun.duration_ms),
+        func.max(WorkflowRun.duration_ms).label("max_ms")
+    ).filter(WorkflowRun.kind == kind, WorkflowRun.started_at >= since).one()
+
+    stages = (
+        db.query(
+            WorkflowSpan.stage,
+            func.count(WorkflowSpan.id).label("count"),
+            func.count(WorkflowSpan.error).label("errors"),
+            *percentiles(WorkflowSpan.duration_ms),
+            func.max(WorkflowSpan.duration_ms).label("max_ms")
+        )
+        .join(WorkflowRun, WorkflowSpan.run_id == WorkflowRun.id)
+        .filter(WorkflowRun.kind == kind, WorkflowRun.started_at >= since)
+        .group_by(WorkflowSpan.stage)
+        .order_by(WorkflowSpan.stage)
+        .all()
+    )
+
+    def rounded(value):
+        return round(value, 1) if value is not None else None
+
+    return {
+        "kind": kind,
+        "since": since,
+        "runs": runs.runs,
+        "total": {
+            "stage": "total",
+            "count": runs.runs,
+            "p50_ms": rounded(runs.p50_ms),
+            "p95_ms": rounded(runs.p95_ms),
+            "p99_ms": rounded(runs.p99_ms),
+            "max_ms": rounded(runs.max_ms),
+        },
+        "stages": [
+            {
+                "stage": row.stage,
+                "count": row.count,
+                "errors": row.errors,
+                "p50_ms": rounded(row.p50_ms),
+                "p95_ms": rounded(row.p95_ms),
+                "p99_ms": rounded(row.p99_ms),
+                "max_ms": rounded(row.max_ms),
+            }
+            for row in stages
+        ],
+    }
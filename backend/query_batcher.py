@@ -0,0 +1,166 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+# Upper bounds of the batch size histogram buckets
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128)
+
+
+class _Request:
+    __slots__ = ("text", "future", "enqueued_at")
+
+    def __init__(self, text: str):
+        self.text = text
+        self.future: Future = Future()
+        self.enqueued_at = time.monotonic()
+
+
+class QueryBatcher:
+    """
+    Dynamic micro-batcher for query encoding.
+
+    Concurrent callers submit single queries; a background thread gathers
+    them for up to max_wait_ms (or until max_batch_size is reached), runs one
+    batched forward pass and resolves each caller's future with its row of
+    the result. Identical texts within a batch are encoded once.
+    """
+
+    def __init__(
+        self,
+        encode_batch: Callable[[List[str]], np.ndarray],
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0
+    ):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+
+        self.encode_batch = encode_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+
+        self._queue: "queue.Queue[Optional[_Request]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._closed = False
+
+        # Metrics
+        self._batches = 0
+        self._items = 0
+        self._max_batch = 0
+        self._histogram = [0] * (len(BATCH_SIZE_BUCKETS) + 1)
+        self._queue_wait_total = 0.0
+        self._queue_wait_max = 0.0
+        self._forward_time_total = 0.0
+        self._errors = 0
+
+    def _ensure_started(self) -> None:
+        if self._thread is None:
+            with self._start_lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="query-batcher", daemon=True)
+                    self._thread.start()
+
+    def submit(self, text: str) -> Future:
+        """Queue a query for the next batch and return a future for its embedding."""
+        if self._closed:
+            raise RuntimeError("QueryBatcher is closed")
+        self._ensure_started()
+        request = _Request(text)
+        self._queue.put(request)
+        return request.future
+
+    def encode(self, text: str, timeout: Optional[float] = None) -> np.ndarray:
+        """Encode one query, blocking until its batch has run."""
+        return self.submit(text).result(timeout=timeout)
+
+    def encode_many(self, texts: Sequence[str], timeout: Optional[float] = None) -> np.ndarray:
+        """Encode several queries through the batcher, preserving order."""
+        futures = [self.submit(text) for text in texts]
+        return np.stack([future.result(timeout=timeout) for future in futures])
+
+    def _collect(self, first: _Request) -> List[_Request]:
+        batch = [first]
+        deadline = first.enqueued_at + self.max_wait_ms / 1000
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                request = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if request is None:
+                # Shutdown sentinel; finish this batch first
+                self._queue.put(None)
+                break
+            batch.append(request)
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+
+            batch = self._collect(first)
+            started = time.monotonic()
+
+            # Encode each distinct text once
+            unique_texts = list(dict.fromkeys(request.text for request in batch))
+            try:
+                embeddings = self.encode_batch(unique_texts)
+                rows = {text: embeddings[i] for i, text in enumerate(unique_texts)}
+                for request in batch:
+                    request.future.set_result(rows[request.text])
+                failed = False
+            except Exception as e:
+                for request in batch:
+                    request.future.set_exception(e)
+                failed = True
+
+            self._record(batch, started, time.monotonic() - started, failed)
+
+    def _record(self, batch: List[_Request], started: float, forward_time: float, failed: bool) -> None:
+        size = len(batch)
+        bucket = next((i for i, bound in enumerate(BATCH_SIZE_BUCKETS) if size <= bound), len(BATCH_SIZE_BUCKETS))
+        waits = [started - request.enqueued_at for request in batch]
+        with self._stats_lock:
+            self._batches += 1
+            self._items += size
+            self._max_batch = max(self._max_batch, size)
+            self._histogram[bucket] += 1
+            self._queue_wait_total += sum(waits)
+            self._queue_wait_max = max(self._queue_wait_max, max(waits))
+            self._forward_time_total += forward_time
+            if failed:
+                self._errors += 1
+
+    def close(self) -> None:
+        """Stop the worker thread after pending requests are processed."""
+        self._closed = True
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Return batch size and queue wait metrics."""
+        with self._stats_lock:
+            labels = [f"<={bound}" for bound in BATCH_SIZE_BUCKETS] + [f">{BATCH_SIZE_BUCKETS[-1]}"]
+            return {
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": self.max_wait_ms,
+                "queue_depth": self._queue.qsize(),
+                "batches": self._batches,
+                "items": self._items,
+                "errors": self._errors,
+                "batch_size_avg": round(self._items / self._batches, 3) if self._batches else 0.0,
+                "batch_size_max": self._max_batch,
+                "batch_size_histogram": dict(zip(labels, self._histogram)),
+                "queue_wait_avg_ms": round(self._queue_wait_total * 1000 / self._items, 3) if self._items else 0.0,
+                "queue_wait_max_ms": round(self._queue_wait_max * 1000, 3),
+                "forward_pass_avg_ms": round(self._forward_time_total * 1000 / self._batches, 3) if self._batches else 0.0,
+            }
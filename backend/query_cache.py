@@ -0,0 +1,228 @@
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+# A disk trim evicts down to this fraction of disk_max_entries, so the next one is many writes away
+DISK_TRIM_TO = 0.9
+
+
+def normalize_query(text: str) -> str:
+    """Normalize query text so trivially different spellings share a cache entry."""
+    return " ".join(text.lower().split())
+
+
+class QueryEmbeddingCache:
+    """
+    Bounded LRU + TTL cache for query embeddings.
+
+    Entries are keyed by model id and normalized query text. The in-memory
+    tier evicts the least recently used entry once max_entries is reached;
+    the optional SQLite tier keeps embeddings across restarts. Its rows carry
+    last_used (set on write and on disk hits), and a row counter triggers an
+    expiry sweep plus a least-recently-used trim only once it passes
+    disk_max_entries. Both tiers honour the same TTL.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: float = 3600.0,
+        disk_path: Optional[str] = None,
+        disk_max_entries: int = 100_000
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.disk_path = disk_path
+        self.disk_max_entries = disk_max_entries
+
+        # key -> (embedding, expires_at)
+        self._entries: "OrderedDict[str, Tuple[np.ndarray, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_lock = threading.Lock()
+        self._disk: Optional[sqlite3.Connection] = None
+        self._disk_count = 0
+
+        # Metrics
+        self._hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+        if disk_path:
+            self._disk = sqlite3.connect(disk_path, check_same_thread=False)
+            self._disk.execute("PRAGMA journal_mode=WAL")
+            self._disk.execute("""
+                CREATE TABLE IF NOT EXISTS query_embeddings (
+                    key TEXT PRIMARY KEY,
+                    embedding BLOB NOT NULL,
+                    dtype TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used REAL NOT NULL
+                )
+            """)
+            columns = {row[1] for row in self._disk.execute("PRAGMA table_info(query_embeddings)")}
+            if "last_used" not in columns:
+                # Caches written before last_used existed start from their creation time
+                self._disk.execute("ALTER TABLE query_embeddings ADD COLUMN last_used REAL NOT NULL DEFAULT 0")
+                self._disk.execute("UPDATE query_embeddings SET last_used = created_at")
+            self._disk.execute("DROP INDEX IF EXISTS idx_query_embeddings_created")
+            self._disk.execute("CREATE INDEX IF NOT EXISTS idx_query_embeddings_last_used ON query_embeddings(last_used)")
+            self._disk.commit()
+            self._disk_count = self._disk.execute("SELECT COUNT(*) FROM query_embeddings").fetchone()[0]
+
+    @staticmethod
+    def make_key(model_id: str, text: str) -> str:
+        return hashlib.sha256(f"{model_id}\x00{normalize_query(text)}".encode("utf-8")).hexdigest()
+
+    def get(self, model_id: str, text: str, memory_only: bool = False) -> Optional[np.ndarray]:
+        """
+        Look up a cached embedding
+
+        Args:
+            model_id: Embedding model identifier
+            text: Raw query text
+            memory_only: Skip the disk tier (safe to call from an event loop)
+
+        Returns:
+            The cached embedding, or None on a miss
+        """
+        key = self.make_key(model_id, text)
+        now = time.time()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                embedding, expires_at = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return embedding
+                del self._entries[key]
+                self._expirations += 1
+
+        if memory_only or self._disk is None:
+            if not memory_only:
+                with self._lock:
+                    self._misses += 1
+            return None
+
+        embedding = self._disk_get(key, now)
+        with self._lock:
+            if embedding is None:
+                self._misses += 1
+                return None
+            self._disk_hits += 1
+        self._memory_put(key, embedding, now)
+        return embedding
+
+    def put(self, model_id: str, text: str, embedding: np.ndarray) -> None:
+        """Store an embedding in both tiers."""
+        key = self.make_key(model_id, text)
+        now = time.time()
+        embedding = np.asarray(embedding)
+        self._memory_put(key, embedding, now)
+        if self._disk is not None:
+            self._disk_put(key, embedding, now)
+
+    def get_or_compute(
+        self,
+        model_id: str,
+        text: str,
+        compute: Callable[[str], np.ndarray]
+    ) -> np.ndarray:
+        """Return the cached embedding for text, computing and caching it on a miss."""
+        embedding = self.get(model_id, text)
+        if embedding is None:
+            embedding = compute(text)
+            self.put(model_id, text, embedding)
+        return embedding
+
+    def _memory_put(self, key: str, embedding: np.ndarray, now: float) -> None:
+        with self._lock:
+            self._entries[key] = (embedding, now + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def _disk_get(self, key: str, now: float) -> Optional[np.ndarray]:
+        with self._disk_lock:
+            row = self._disk.execute(
+                "SELECT embedding, dtype, created_at FROM query_embeddings WHERE key = ?",
+                (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            blob, dtype, created_at = row
+            expired = created_at + self.ttl_seconds <= now
+            if expired:
+                self._disk.execute("DELETE FROM query_embeddings WHERE key = ?", (key,))
+                self._disk_count -= 1
+            else:
+                # Disk hits are promoted to memory, so a key is touched here once per memory eviction
+                self._disk.execute("UPDATE query_embeddings SET last_used = ? WHERE key = ?", (now, key))
+            self._disk.commit()
+        if expired:
+            return None
+        return np.frombuffer(blob, dtype=dtype).copy()
+
+    def _disk_put(self, key: str, embedding: np.ndarray, now: float) -> None:
+        with self._disk_lock:
+            self._disk.execute(
+                "INSERT OR REPLACE INTO query_embeddings (key, embedding, dtype, created_at, last_used) VALUES (?, ?, ?, ?, ?)",
+                (key, embedding.tobytes(), embedding.dtype.str, now, now)
+            )
+            # Replacements count too, so the counter can only run ahead of the table
+            self._disk_count += 1
+            if self._disk_count > self.disk_max_entries:
+                self._disk_trim(now)
+            self._disk.commit()
+
+    def _disk_trim(self, now: float) -> None:
+        """Drop expired rows, then the least recently used ones down to DISK_TRIM_TO of the bound."""
+        self._disk.execute(
+            "DELETE FROM query_embeddings WHERE created_at <= ?",
+            (now - self.ttl_seconds,)
+        )
+        self._disk.execute(
+            """
+            DELETE FROM query_embeddings WHERE key IN (
+                SELECT key FROM query_embeddings ORDER BY last_used DESC LIMIT -1 OFFSET ?
+            )
+            """,
+            (int(self.disk_max_entries * DISK_TRIM_TO),)
+        )
+        self._disk_count = self._disk.execute("SELECT COUNT(*) FROM query_embeddings").fetchone()[0]
+
+    def clear(self) -> None:
+        """Drop every entry from both tiers."""
+        with self._lock:
+            self._entries.clear()
+        if self._disk is not None:
+            with self._disk_lock:
+                self._disk.execute("DELETE FROM query_embeddings")
+                self._disk.commit()
+                self._disk_count = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache size and hit/miss counters."""
+        with self._lock:
+            lookups = self._hits + self._disk_hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self._hits,
+                "disk_hits": self._disk_hits,
+                "misses": self._misses,
+                "hit_rate": round((self._hits + self._disk_hits) / lookups, 4) if lookups else 0.0,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "disk_enabled": self._disk is not None,
+            }
@@ -1,6 +1,9 @@
-from typing import List, Optional, Dict, Any
+import itertools
+import re
+from typing import List, Optional, Dict, Any, Tuple
 from database import db
-from embeddings import model
+from embeddings import encode_query
+from vector_index import apply_search_params
 
 
 class ArticleService:
@@ -113,11 +116,69 @@ class ArticleService:
             cursor.execute(query, (article_ids,))
             return cursor.fetchall()
 
+    @staticmethod
+    def build_search_query(
+        query_embedding: List[float],
+        limit: int = 10,
+        category_ids: Optional[List[int]] = None,
+        numbered: bool = False
+    ) -> Tuple[str, tuple]:
+        """
+        Build the vector search SQL used by search_articles_by_text.
+
+        Results are ordered by the raw cosine distance operator so the planner
+        can satisfy ORDER BY ... LIMIT with the HNSW/IVFFlat index on
+        articles.vector; ordering by a derived score or adding secondary sort
+        keys forces a sequential scan. With category_ids, apply the search
+        settings with filtered=True so the filter does not starve the index
+        scan (see vector_index.search_settings).
+
+        Args:
+            query_embedding: Query vector
+            limit: Maximum number of articles to return
+            category_ids: Optional list of category IDs to filter by
+            numbered: Use $1, $2, ... placeholders (asyncpg) instead of %s (psycopg2)
+
+        Returns:
+            Tuple of (SQL, parameters)
+        """
+        category_filter = "WHERE a.category_id = ANY(%s::int[])" if category_ids else ""
+
+        query = f"""
+            SELECT
+                a.id,
+                a.text,
+                a.summary,
+                a.relevance_score,
+                a.date_written,
+                a.source,
+                c.name as category_name,
+                1 - (a.vector <=> %s::vector) as similarity_score
+            FROM articles a
+            LEFT JOIN categories c ON a.category_id = c.id
+            {category_filter}
+            ORDER BY a.vector <=> %s::vector
+            LIMIT %s;
+        """
+
+        if category_ids:
+            params = (query_embedding, category_ids, query_embedding, limit)
+        else:
+            params = (query_embedding, query_embedding, limit)
+
+        if numbered:
+            position = itertools.count(1)
+            query = re.sub(r"%s", lambda _: f"${next(position)}", query)
+
+        return query, params
+
     @staticmethod
     def search_articles_by_text(
         query_text: str,
         limit: int = 10,
-        category_ids: Optional[List[int]] = None
+        category_ids: Optional[List[int]] = None,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None
     ) -> List[Dict[str, Any]]:
         """
         Search articles using vector similarity to a query text.
@@ -126,50 +187,19 @@ class ArticleService:
             query_text: The search query
             limit: Maximum number of articles to return
             category_ids: Optional list of category IDs to filter by
+            ef_search: Optional HNSW candidate list size for this query
+            probes: Optional number of IVFFlat lists to probe for this query
 
         Returns:
             List of article dictionaries with similarity scores
         """
-        # Generate embedding for the query text
-        query_embedding = model.encode_queries([query_text])[0].tolist()
+        # Generate embedding for the query text (cached for repeated queries)
+        query_embedding = encode_query(query_text).tolist()
 
-        if category_ids:
-            query = """
-                SELECT
-                    a.id,
-                    a.text,
-                    a.summary,
-                    a.relevance_score,
-                    a.date_written,
-                    a.source,
-                    c.name as category_name,
-                    1 - (a.vector <=> %s::vector) as similarity_score
-                FROM articles a
-                LEFT JOIN categories c ON a.category_id = c.id
-                WHERE a.category_id = ANY(%s)
-                ORDER BY similarity_score DESC, a.date_written DESC
-                LIMIT %s;
-            """
-            params = (query_embedding, category_ids, limit)
-        else:
-            query = """
-                SELECT
-                    a.id,
-                    a.text,
-                    a.summary,
-                    a.relevance_score,
-                    a.date_written,
-                    a.source,
-                    c.name as category_name,
-                    1 - (a.vector <=> %s::vector) as similarity_score
-                FROM articles a
-                LEFT JOIN categories c ON a.category_id = c.id
-                ORDER BY similarity_score DESC, a.date_written DESC
-                LIMIT %s;
-            """
-            params = (query_embedding, limit)
+        query, params = ArticleService.build_search_query(query_embedding, limit, category_ids)
 
         with db.get_cursor() as cursor:
+            apply_search_params(cursor, ef_search=ef_search, probes=probes, filtered=bool(category_ids))
             cursor.execute(query, params)
             return cursor.fetchall()
 
@@ -0,0 +1,194 @@
+from typing import List, Optional, Dict, Any
+from async_database import async_db
+from embeddings import CACHE_MODEL_ID, encode_query, query_cache
+from services.article_service import ArticleService
+from services.concurrency import embedding_bulkhead
+from vector_index import PGVECTOR_VERSION_SQL, cached_iterative_scan, search_settings, set_pgvector_version
+
+
+class AsyncArticleService:
+    """Async service for retrieving articles from the vector database without blocking the event loop."""
+
+    @staticmethod
+    async def get_articles_by_user_preferences(
+        user_id: int,
+        limit: int = 10,
+        similarity_threshold: float = 0.7
+    ) -> List[Dict[str, Any]]:
+        """
+        Retrieve articles based on user preferences using vector similarity.
+
+        Args:
+            user_id: The user ID to get preferences for
+            limit: Maximum number of articles to return
+            similarity_threshold: Minimum cosine similarity score (0-1)
+
+        Returns:
+            List of article dictionaries with metadata
+        """
+        query = """
+            SELECT
+                a.id,
+                a.text,
+                a.summary,
+                a.relevance_score,
+                a.date_written,
+                a.source,
+                c.name as category_name,
+                1 - (a.vector <=> s.preference_vector) as similarity_score
+            FROM articles a
+            LEFT JOIN categories c ON a.category_id = c.id
+            CROSS JOIN settings s
+            WHERE s.user_id = $1
+                AND s.preference_vector IS NOT NULL
+                AND 1 - (a.vector <=> s.preference_vector) >= $2
+            ORDER BY similarity_score DESC, a.date_written DESC
+            LIMIT $3;
+        """
+
+        return await async_db.fetch(query, user_id, similarity_threshold, limit)
+
+    @staticmethod
+    async def get_articles_by_category(
+        category_ids: List[int],
+        limit: int = 10
+    ) -> List[Dict[str, Any]]:
+        """
+        Retrieve recent articles by category IDs.
+
+        Args:
+            category_ids: List of category IDs to filter by
+            limit: Maximum number of articles to return
+
+        Returns:
+            List of article dictionaries
+        """
+        query = """
+            SELECT
+                a.id,
+                a.text,
+                a.summary,
+                a.relevance_score,
+                a.date_written,
+                a.source,
+                c.name as category_name
+            FROM articles a
+            LEFT JOIN categories c ON a.category_id = c.id
+            WHERE a.category_id = ANY($1::int[])
+            ORDER BY a.date_written DESC, a.relevance_score DESC
+            LIMIT $2;
+        """
+
+        return await async_db.fetch(query, category_ids, limit)
+
+    @staticmethod
+    async def get_articles_by_ids(article_ids: List[int]) -> List[Dict[str, Any]]:
+        """
+        Retrieve specific articles by their IDs.
+
+        Args:
+            article_ids: List of article IDs to retrieve
+
+        Returns:
+            List of article dictionaries
+        """
+        query = """
+            SELECT
+                a.id,
+                a.text,
+                a.summary,
+                a.relevance_score,
+                a.date_written,
+                a.source,
+                c.name as category_name
+            FROM articles a
+            LEFT JOIN categories c ON a.category_id = c.id
+            WHERE a.id = ANY($1::int[])
+            ORDER BY a.date_written DESC;
+        """
+
+        return await async_db.fetch(query, article_ids)
+
+    @staticmethod
+    async def encode_query(query_text: str):
+        """
+        Encode a search query on the embedding executor.
+
+        Hot queries are answered from the in-memory cache without leaving the
+        event loop; everything else (disk tier and inference) runs on the
+        embedding executor.
+
+        Args:
+            query_text: The search query
+
+        Returns:
+            Query embedding as a NumPy array
+        """
+        cached = query_cache.get(CACHE_MODEL_ID, query_text, memory_only=True)
+        if cached is not None:
+            return cached
+        return await embedding_bulkhead.run(encode_query, query_text)
+
+    @staticmethod
+    async def search_articles_by_text(
+        query_text: str,
+        limit: int = 10,
+        category_ids: Optional[List[int]] = None,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Search articles using vector similarity to a query text.
+
+        Args:
+            query_text: The search query
+            limit: Maximum number of articles to return
+            category_ids: Optional list of category IDs to filter by
+            ef_search: Optional HNSW candidate list size for this query
+            probes: Optional number of IVFFlat lists to probe for this query
+
+        Returns:
+            List of article dictionaries with similarity scores
+        """
+        query_embedding = await AsyncArticleService.encode_query(query_text)
+
+        query, args = ArticleService.build_search_query(query_embedding, limit, category_ids, numbered=True)
+
+        # get_connection runs in a transaction, so the set_config(..., true) settings apply to the search
+        async with async_db.get_connection() as conn:
+            for name, value in await AsyncArticleService._search_settings(conn, ef_search, probes, bool(category_ids)):
+                await conn.execute("SELECT set_config($1, $2, true)", name, value)
+            rows = await conn.fetch(query, *args)
+            return [dict(row) for row in rows]
+
+    @staticmethod
+    async def _search_settings(conn, ef_search: Optional[int], probes: Optional[int], filtered: bool):
+        """Search settings for this query (see vector_index.search_settings)."""
+        iterative_scan = cached_iterative_scan()
+        if filtered and iterative_scan is None:
+            iterative_scan = set_pgvector_version(await conn.fetchval(PGVECTOR_VERSION_SQL))
+        return search_settings(ef_search, probes, filtered, bool(iterative_scan))
+
+    @staticmethod
+    async def get_user_settings(user_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Retrieve user settings including category preferences.
+
+        Args:
+            user_id: The user ID
+
+        Returns:
+            User settings dictionary or None if not found
+        """
+        query = """
+            SELECT
+                id,
+                user_id,
+                category_ids,
+                created_at,
+                updated_at
+            FROM settings
+            WHERE user_id = $1;
+        """
+
+        return await async_db.fetchrow(query, user_id)
@@ -0,0 +1,47 @@
+from typing import Optional
+from async_database import async_db
+
+
+class AsyncPodcastService:
+    @staticmethod
+    async def create_podcast_record(
+        user_id: int,
+        script: str,
+        s3_link: str,
+        spotify_link: Optional[str] = None
+    ) -> int:
+        return await async_db.fetchval(
+            """
+            INSERT INTO podcasts (user_id, script, s3_link, spotify_link)
+            VALUES ($1, $2, $3, $4)
+            RETURNING id
+            """,
+            user_id, script, s3_link, spotify_link
+        )
+
+    @staticmethod
+    async def get_podcast_by_id(podcast_id: int):
+        return await async_db.fetchrow(
+            """
+            SELECT id, script, spotify_link, s3_link, date_created, user_id
+            FROM podcasts
+            WHERE id = $1
+            """,
+            podcast_id
+        )
+
+    @staticmethod
+    async def get_user_podcasts(user_id: int, limit: int = 10):
+        return await async_db.fetch(
+            """
+            SELECT id, script, spotify_link, s3_link, date_created, user_id
+            FROM podcasts
+            WHERE user_id = $1
+            ORDER BY date_created DESC
+            LIMIT $2
+            """,
+            user_id, limit
+        )
+
+
+async_podcast_service = AsyncPodcastService()
@@ -0,0 +1,54 @@
+import threading
+from datetime import datetime
+from typing import Optional
+from config import settings
+from startup_profile import startup_profile
+from services.concurrency import s3_bulkhead
+
+
+class AsyncS3Service:
+    """S3 uploads that run on a bounded executor so they never block the event loop."""
+
+    def __init__(self):
+        self.bucket_name = settings.aws_s3_bucket
+        self._s3_client = None
+        self._client_lock = threading.Lock()
+
+    @property
+    def s3_client(self):
+        """boto3 S3 client, built on first use. boto3 clients are thread-safe once created."""
+        if self._s3_client is None:
+            with self._client_lock:
+                if self._s3_client is None:
+                    with startup_profile.phase("async_s3_service.client"):
+                        import boto3
+
+                        self._s3_client = boto3.client(
+                            's3',
+                            aws_access_key_id=settings.aws_s3_access_key,
+                            aws_secret_access_key=settings.aws_s3_secret_access_key,
+                            region_name=settings.aws_s3_region
+                        )
+        return self._s3_client
+
+    async def upload_podcast(self, file_path: str, article_id: Optional[int] = None) -> str:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+        if article_id:
+            s3_key = f"podcasts/article_{article_id}_{timestamp}.mp3"
+        else:
+            s3_key = f"podcasts/podcast_{timestamp}.mp3"
+
+        await s3_bulkhead.run(
+            self.s3_client.upload_file,
+            file_path,
+            self.bucket_name,
+            s3_key,
+            ExtraArgs={'ContentType': 'audio/mpeg'}
+        )
+
+        s3_url = f"https://{self.bucket_name}.s3.{settings.aws_s3_region}.amazonaws.com/{s3_key}"
+        return s3_url
+
+
+async_s3_service = AsyncS3Service()
@@ -0,0 +1,162 @@
+import asyncio
+import os
+import threading
+from datetime import datetime
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple
+
+from config import settings
+from startup_profile import startup_profile
+from services.concurrency import elevenlabs_bulkhead
+from services.tts_service import create_podcast_script
+
+
+def _write_audio(output_path: str, chunks: List[bytes]) -> None:
+    with open(output_path, 'wb') as f:
+        for chunk in chunks:
+            f.write(chunk)
+
+
+class AsyncTTSService:
+    """Async text-to-speech service using the ElevenLabs async HTTP client."""
+
+    def __init__(self):
+        self.voice_id = settings.elevenlabs_voice_id
+        self._client = None
+        self._client_lock = threading.Lock()
+
+    @property
+    def client(self):
+        """Async ElevenLabs client, built on first use."""
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    with startup_profile.phase("async_tts_service.client"):
+                        from elevenlabs.client import AsyncElevenLabs
+
+                        self._client = AsyncElevenLabs(api_key=settings.elevenlabs_api_key)
+        return self._client
+
+    async def _synthesize(self, text: str, voice_id: str, output_path: str) -> None:
+        """Stream synthesized audio from ElevenLabs and write it to output_path."""
+        async with elevenlabs_bulkhead.limit():
+            chunks = [
+                chunk
+                async for chunk in self.client.text_to_speech.convert(
+                    voice_id=voice_id,
+                    text=text,
+                    model_id="eleven_multilingual_v2"
+                )
+            ]
+
+        await asyncio.to_thread(_write_audio, output_path, chunks)
+
+    async def generate_audio_from_articles(
+        self,
+        articles: List[Dict[str, Any]],
+        output_dir: str = "generated_audio",
+        voice_id: Optional[str] = None
+    ) -> Tuple[str, str]:
+        """
+        Generate audio from a list of articles and combine them into a podcast-style audio.
+
+        Args:
+            articles: List of article dictionaries with 'text' or 'summary' fields
+            output_dir: Directory to save the generated audio file
+            voice_id: Optional custom voice ID (uses default if not provided)
+
+        Returns:
+            Tuple of (audio file path, script text)
+        """
+        voice = voice_id or self.voice_id
+        os.makedirs(output_dir, exist_ok=True)
+
+        script = create_podcast_script(articles)
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        output_path = os.path.join(output_dir, f"podcast_{timestamp}.mp3")
+
+        await self._synthesize(script, voice, output_path)
+
+        return output_path, script
+
+    async def generate_audio_from_text(
+        self,
+        text: str,
+        output_dir: str = "generated_audio",
+        filename: Optional[str] = None,
+        voice_id: Optional[str] = None
+    ) -> str:
+        """
+        Generate audio from raw text.
+
+        Args:
+            text: The text to convert to speech
+            output_dir: Directory to save the generated audio file
+            filename: Optional custom filename (auto-generated if not provided)
+            voice_id: Optional custom voice ID (uses default if not provided)
+
+        Returns:
+            Path to the generated audio file
+        """
+        voice = voice_id or self.voice_id
+        os.makedirs(output_dir, exist_ok=True)
+
+        if not filename:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filename = f"audio_{timestamp}.mp3"
+
+        output_path = os.path.join(output_dir, filename)
+
+        await self._synthesize(text, voice, output_path)
+
+        return output_path
+
+    async def stream_audio_from_text(
+        self,
+        text: str,
+        voice_id: Optional[str] = None,
+        previous_text: Optional[str] = None
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream audio for text as ElevenLabs synthesizes it.
+
+        Args:
+            text: The text to convert to speech (typically a few sentences)
+            voice_id: Optional custom voice ID (uses default if not provided)
+            previous_text: Text voiced just before, so intonation carries across calls
+
+        Yields:
+            MP3 audio chunks in order
+        """
+        options = {"previous_text": previous_text} if previous_text else {}
+
+        async with elevenlabs_bulkhead.limit():
+            async for chunk in self.client.text_to_speech.stream(
+                voice_id=voice_id or self.voice_id,
+                text=text,
+                model_id="eleven_multilingual_v2",
+                **options
+            ):
+                yield chunk
+
+    async def get_available_voices(self) -> List[Dict[str, Any]]:
+        """
+        Get list of available voices from ElevenLabs.
+
+        Returns:
+            List of voice dictionaries with id and name
+        """
+        async with elevenlabs_bulkhead.limit():
+            voices = await self.client.voices.get_all()
+        return [
+            {
+                "id": voice.voice_id,
+                "name": voice.name,
+                "category": voice.category if hasattr(voice, 'category') else None
+            }
+            for voice in voices.voices
+        ]
+
+
+# Global async TTS service instance
+async_tts_service = AsyncTTSService()
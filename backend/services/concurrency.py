@@ -0,0 +1,129 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from functools import partial
+from typing import Any, AsyncGenerator, Callable, Dict, Optional
+
+from config import settings
+
+
+class BulkheadFullError(Exception):
+    """Raised when an upstream's concurrency limit stays saturated past its timeout."""
+
+
+class Bulkhead:
+    """
+    Per-upstream concurrency limit for async code.
+
+    Each upstream (Postgres, ElevenLabs, S3, the embedding model) gets its own
+    semaphore, and blocking calls into that upstream run on its own bounded
+    executor, so a slow dependency can only tie up its own slots instead of
+    every request on the worker.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_concurrency: int,
+        acquire_timeout: float = 30.0,
+        executor_workers: Optional[int] = None
+    ):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.acquire_timeout = acquire_timeout
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._executor_workers = executor_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+        # Metrics
+        self._in_flight = 0
+        self._calls = 0
+        self._rejected = 0
+        self._wait_time_total = 0.0
+        self._wait_time_max = 0.0
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._executor_workers or self.max_concurrency,
+                thread_name_prefix=f"bulkhead-{self.name}"
+            )
+        return self._executor
+
+    @asynccontextmanager
+    async def limit(self) -> AsyncGenerator[None, None]:
+        """Hold one of this upstream's concurrency slots."""
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=self.acquire_timeout)
+        except asyncio.TimeoutError:
+            self._rejected += 1
+            raise BulkheadFullError(
+                f"{self.name} is at its concurrency limit ({self.max_concurrency}); "
+                f"gave up after {self.acquire_timeout}s"
+            )
+
+        wait_time = time.monotonic() - started
+        self._calls += 1
+        self._wait_time_total += wait_time
+        self._wait_time_max = max(self._wait_time_max, wait_time)
+        self._in_flight += 1
+        try:
+            yield
+        finally:
+            self._in_flight -= 1
+            self._semaphore.release()
+
+    async def run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run a blocking callable on this upstream's executor within its limit."""
+        async with self.limit():
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, partial(func, *args, **kwargs))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self._in_flight,
+            "calls": self._calls,
+            "rejected": self._rejected,
+            "wait_time_avg_ms": round(self._wait_time_total * 1000 / self._calls, 3) if self._calls else 0.0,
+            "wait_time_max_ms": round(self._wait_time_max * 1000, 3),
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+# Global per-upstream bulkheads
+postgres_bulkhead = Bulkhead(
+    "postgres",
+    settings.postgres_max_concurrency,
+    acquire_timeout=settings.bulkhead_acquire_timeout
+)
+elevenlabs_bulkhead = Bulkhead(
+    "elevenlabs",
+    settings.elevenlabs_max_concurrency,
+    acquire_timeout=settings.bulkhead_acquire_timeout
+)
+s3_bulkhead = Bulkhead(
+    "s3",
+    settings.s3_max_concurrency,
+    acquire_timeout=settings.bulkhead_acquire_timeout
+)
+embedding_bulkhead = Bulkhead(
+    "embedding",
+    settings.embedding_max_concurrency,
+    acquire_timeout=settings.bulkhead_acquire_timeout
+)
+
+
+def bulkhead_stats() -> Dict[str, Dict[str, Any]]:
+    """Return metrics for every upstream bulkhead."""
+    return {
+        bulkhead.name: bulkhead.stats()
+        for bulkhead in (postgres_bulkhead, elevenlabs_bulkhead, s3_bulkhead, embedding_bulkhead)
+    }
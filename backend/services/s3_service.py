@@ -1,18 +1,32 @@
-import boto3
+import threading
 from datetime import datetime
 from typing import Optional
 from config import settings
+from startup_profile import startup_profile
 
 
 class S3Service:
     def __init__(self):
-        self.s3_client = boto3.client(
-            's3',
-            aws_access_key_id=settings.aws_s3_access_key,
-            aws_secret_access_key=settings.aws_s3_secret_access_key,
-            region_name=settings.aws_s3_region
-        )
         self.bucket_name = settings.aws_s3_bucket
+        self._s3_client = None
+        self._client_lock = threading.Lock()
+
+    @property
+    def s3_client(self):
+        """boto3 S3 client, built on first use. boto3 clients are thread-safe once created."""
+        if self._s3_client is None:
+            with self._client_lock:
+                if self._s3_client is None:
+                    with startup_profile.phase("s3_service.client"):
+                        import boto3
+
+                        self._s3_client = boto3.client(
+                            's3',
+                            aws_access_key_id=settings.aws_s3_access_key,
+                            aws_secret_access_key=settings.aws_s3_secret_access_key,
+                            region_name=settings.aws_s3_region
+                        )
+        return self._s3_client
 
     def upload_podcast(self, file_path: str, article_id: Optional[int] = None) -> str:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
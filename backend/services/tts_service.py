@@ -1,16 +1,75 @@
 from typing import List, Dict, Any, Optional, Tuple
-from elevenlabs import ElevenLabs, save
 from config import settings
+from startup_profile import startup_profile
 import os
+import threading
 from datetime import datetime
 
 
+def create_podcast_script(articles: List[Dict[str, Any]]) -> str:
+    """
+    Create a podcast-style script from articles.
+
+    Args:
+        articles: List of article dictionaries
+
+    Returns:
+        Formatted script text
+    """
+    script_parts = []
+
+    # Introduction
+    script_parts.append(
+        "Welcome to your personalized news podcast. "
+        f"Here are the top {len(articles)} stories for you today.\n\n"
+    )
+
+    # Process each article
+    for idx, article in enumerate(articles, 1):
+        # Use summary if available, otherwise use truncated text
+        content = article.get('summary') or article.get('text', '')
+
+        # Truncate very long content
+        if len(content) > 1000:
+            content = content[:1000] + "..."
+
+        # Add article to script
+        category = article.get('category_name', 'General')
+        source = article.get('source', 'Unknown source')
+
+        script_parts.append(
+            f"Story {idx}: {category}\n"
+            f"{content}\n"
+            f"Source: {source}\n\n"
+        )
+
+    # Conclusion
+    script_parts.append(
+        "That's all for today's news. Thank you for listening!"
+    )
+
+    return "".join(script_parts)
+
+
 class TTSService:
     """Service for text-to-speech conversion using ElevenLabs API."""
 
     def __init__(self):
-        self.client = ElevenLabs(api_key=settings.elevenlabs_api_key)
         self.voice_id = settings.elevenlabs_voice_id
+        self._client = None
+        self._client_lock = threading.Lock()
+
+    @property
+    def client(self):
+        """ElevenLabs client, built on first use."""
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    with startup_profile.phase("tts_service.client"):
+                        from elevenlabs import ElevenLabs
+
+                        self._client = ElevenLabs(api_key=settings.elevenlabs_api_key)
+        return self._client
 
     def generate_audio_from_articles(
         self,
@@ -113,39 +172,7 @@ class TTSService:
         Returns:
             Formatted script text
         """
-        script_parts = []
-
-        # Introduction
-        script_parts.append(
-            "Welcome to your personalized news podcast. "
-            f"Here are the top {len(articles)} stories for you today.\n\n"
-        )
-
-        # Process each article
-        for idx, article in enumerate(articles, 1):
-            # Use summary if available, otherwise use truncated text
-            content = article.get('summary') or article.get('text', '')
-
-            # Truncate very long content
-            if len(content) > 1000:
-                content = content[:1000] + "..."
-
-            # Add article to script
-            category = article.get('category_name', 'General')
-            source = article.get('source', 'Unknown source')
-
-            script_parts.append(
-                f"Story {idx}: {category}\n"
-                f"{content}\n"
-                f"Source: {source}\n\n"
-            )
-
-        # Conclusion
-        script_parts.append(
-            "That's all for today's news. Thank you for listening!"
-        )
-
-        return "".join(script_parts)
+        return create_podcast_script(articles)
 
     def get_available_voices(self) -> List[Dict[str, Any]]:
         """
@@ -0,0 +1,62 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Generator
+
+# Captured when this module is first imported, which main.py does first
+PROCESS_START = time.monotonic()
+
+
+class StartupProfile:
+    """
+    Records how long each import and initialization phase takes.
+
+    Phases are keyed by name: a phase that runs again (e.g. a repeated
+    warmup) overwrites its entry and bumps its run count, so the profile
+    stays bounded.
+    """
+
+    def __init__(self):
+        self._phases: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._ready_at = None
+
+    @contextmanager
+    def phase(self, name: str) -> Generator[None, None, None]:
+        """Time a named phase, e.g. an import block or a lazy client build."""
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            finished = time.monotonic()
+            with self._lock:
+                previous = self._phases.get(name)
+                self._phases[name] = {
+                    "phase": name,
+                    "started_ms": round((started - PROCESS_START) * 1000, 3),
+                    "duration_ms": round((finished - started) * 1000, 3),
+                    "runs": previous["runs"] + 1 if previous else 1,
+                }
+
+    def mark_ready(self) -> None:
+        with self._lock:
+            if self._ready_at is None:
+                self._ready_at = time.monotonic()
+
+    @property
+    def ready(self) -> bool:
+        return self._ready_at is not None
+
+    def report(self) -> Dict[str, Any]:
+        """Return every recorded phase plus time-to-ready."""
+        with self._lock:
+            return {
+                "ready": self._ready_at is not None,
+                "time_to_ready_ms": round((self._ready_at - PROCESS_START) * 1000, 3) if self._ready_at else None,
+                "uptime_ms": round((time.monotonic() - PROCESS_START) * 1000, 3),
+                "phases": list(self._phases.values()),
+            }
+
+
+# Global startup profile
+startup_profile = StartupProfile()
@@ -0,0 +1,59 @@
+import asyncio
+from types import SimpleNamespace
+
+import openai
+import pytest
+
+from parallel_api import async_embedding_service as module
+from parallel_api.async_embedding_service import AsyncEmbeddingService
+
+
+class FakeEmbeddings:
+    def __init__(self, errors=(), reject=(), bad_request=None):
+        self.errors = list(errors)
+        self.reject = set(reject)
+        self.bad_request = bad_request
+        self.calls = []
+
+    async def create(self, input, model):
+        self.calls.append(list(input))
+        if self.errors:
+            raise self.errors.pop(0)
+        if self.reject & set(input):
+            raise self.bad_request
+        return SimpleNamespace(usage=None, data=[
+            SimpleNamespace(index=index, embedding=[float(len(text))]) for index, text in enumerate(input)
+        ])
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(module, "retry_delay", lambda error, attempt: 0.0)
+    service = AsyncEmbeddingService()
+    service.max_retries = 2
+    return service
+
+
+def embed(service, fake, texts):
+    service.client = SimpleNamespace(embeddings=fake)
+    return asyncio.run(service.generate_embeddings_batch(texts))
+
+
+def test_throttling_and_server_errors_are_retried(service, rate_limited, server_error):
+    fake = FakeEmbeddings(errors=[rate_limited, server_error])
+
+    assert embed(service, fake, ["a", "bb"]) == [[1.0], [2.0]]
+    assert fake.calls == [["a", "bb"]] * 3
+    assert service.meter.throttled == 1
+
+
+def test_bad_request_splits_down_to_the_bad_item(service, bad_request):
+    fake = FakeEmbeddings(reject={"bad"}, bad_request=bad_request)
+
+    assert embed(service, fake, ["a", "bad", "ccc"]) == [[1.0], None, [3.0]]
+    assert service.meter.failed_items == 1
+
+
+def test_other_errors_are_raised(service, auth_error):
+    with pytest.raises(openai.AuthenticationError):
+        embed(service, FakeEmbeddings(errors=[auth_error]), ["a", "bb"])
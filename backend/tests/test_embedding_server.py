@@ -0,0 +1,61 @@
+import os
+import stat
+import threading
+
+import pytest
+
+from embedding_server import (
+    EmbeddingServerError,
+    RemoteEmbeddingModel,
+    _handle_connection,
+    authkey_path,
+    create_authkey,
+    listen,
+    read_authkey,
+)
+
+
+def mode(path):
+    return stat.S_IMODE(os.stat(path).st_mode)
+
+
+def test_generated_key_is_private_and_readable_by_clients(tmp_path):
+    socket_path = str(tmp_path / "embed.sock")
+
+    key = create_authkey(socket_path)
+
+    assert len(key) == 32
+    assert mode(authkey_path(socket_path)) == 0o600
+    assert read_authkey(socket_path) == key
+    assert create_authkey(socket_path) != key
+
+
+def test_configured_key_wins(tmp_path):
+    socket_path = str(tmp_path / "embed.sock")
+
+    assert create_authkey(socket_path, "secret") == b"secret"
+    assert read_authkey(socket_path, "secret") == b"secret"
+    assert not os.path.exists(authkey_path(socket_path))
+
+
+def test_missing_key_file_is_reported(tmp_path):
+    with pytest.raises(EmbeddingServerError):
+        read_authkey(str(tmp_path / "embed.sock"))
+
+
+def test_socket_is_owner_only_and_checks_the_key(tmp_path):
+    socket_path = str(tmp_path / "embed.sock")
+    key = create_authkey(socket_path)
+    listener = listen(socket_path, key)
+
+    def accept():
+        _handle_connection(listener.accept(), model=None, query_batcher=None)
+
+    server = threading.Thread(target=accept, daemon=True)
+    server.start()
+    try:
+        assert mode(socket_path) == 0o600
+        assert RemoteEmbeddingModel(socket_path).ping()
+    finally:
+        listener.close()
+        server.join(timeout=5)
@@ -0,0 +1,65 @@
+from types import SimpleNamespace
+
+import openai
+import pytest
+
+from parallel_api import embedding_service as module
+from parallel_api.embedding_service import EmbeddingService
+
+
+class FakeEmbeddings:
+    def __init__(self, errors=(), reject=()):
+        self.errors = list(errors)
+        self.reject = set(reject)
+        self.calls = []
+
+    def create(self, input, model):
+        self.calls.append(list(input))
+        if self.errors:
+            raise self.errors.pop(0)
+        if self.reject & set(input):
+            raise self.bad_request
+        return SimpleNamespace(data=[
+            SimpleNamespace(index=index, embedding=[float(len(text))]) for index, text in enumerate(input)
+        ])
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(module.time, "sleep", lambda seconds: None)
+    service = EmbeddingService()
+    service.max_retries = 2
+    return service
+
+
+def with_fake(service, fake):
+    service.client = SimpleNamespace(embeddings=fake)
+    return fake
+
+
+def test_transient_errors_are_retried_without_splitting(service, server_error):
+    fake = with_fake(service, FakeEmbeddings(errors=[server_error, server_error]))
+
+    assert service.generate_embeddings_batch(["a", "bb", "ccc"]) == [[1.0], [2.0], [3.0]]
+    assert fake.calls == [["a", "bb", "ccc"]] * 3
+
+
+def test_exhausted_retries_fail_the_batch(service, server_error):
+    fake = with_fake(service, FakeEmbeddings(errors=[server_error] * 3))
+
+    assert service.generate_embeddings_batch(["a", "bb"]) == [None, None]
+    assert len(fake.calls) == 3
+
+
+def test_bad_request_splits_down_to_the_bad_item(service, bad_request):
+    fake = with_fake(service, FakeEmbeddings(reject={"bad"}))
+    fake.bad_request = bad_request
+
+    assert service.generate_embeddings_batch(["a", "bad", "ccc", "dddd"]) == [[1.0], None, [3.0], [4.0]]
+
+
+def test_other_errors_are_raised(service, auth_error):
+    with_fake(service, FakeEmbeddings(errors=[auth_error]))
+
+    with pytest.raises(openai.AuthenticationError):
+        service.generate_embeddings_batch(["a", "bb"])
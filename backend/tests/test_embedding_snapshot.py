@@ -0,0 +1,92 @@
+import numpy as np
+
+from embedding_snapshot import EmbeddingSnapshot
+
+
+class FakeCursor:
+    """Answers the three queries refresh() issues against an in-memory articles table"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self._result = []
+
+    def execute(self, sql, params):
+        committed = sorted(self.rows.items())
+        if "ANY" in sql:
+            wanted = set(params[0])
+            self._result = [{"id": i, "vector": v} for i, v in committed if i in wanted]
+        elif "LIMIT" in sql:
+            after, limit = params
+            self._result = [{"id": i, "vector": v} for i, v in committed if i > after][:limit]
+        else:
+            low, high = params
+            self._result = [{"id": i} for i, _ in committed if low < i <= high]
+
+    def fetchall(self):
+        return self._result
+
+
+def unit(index, dim=4):
+    vector = [0.0] * dim
+    vector[index % dim] = 1.0
+    return vector
+
+
+def test_search_returns_most_similar_first(tmp_path):
+    snapshot = EmbeddingSnapshot(str(tmp_path), dim=3)
+    snapshot.upsert([1, 2, 3], [[1, 0, 0], [0.6, 0.8, 0], [0, 0, 1]])
+
+    hits = snapshot.search([1, 0, 0], top_k=2)
+
+    assert [article_id for article_id, _ in hits] == [1, 2]
+    assert np.isclose(hits[1][1], 0.6)
+    assert snapshot.search([1, 0, 0], top_k=5, candidate_ids=[3, 99]) == [(3, 0.0)]
+
+
+def test_refresh_pages_by_id(tmp_path):
+    cursor = FakeCursor({i: unit(i) for i in range(1, 8)})
+    snapshot = EmbeddingSnapshot(str(tmp_path), dim=4, initial_capacity=2)
+
+    assert snapshot.refresh(cursor, batch_size=3) == 7
+    assert len(snapshot) == 7
+    assert snapshot.stats()["watermark_id"] == 7
+    assert snapshot.refresh(cursor, batch_size=3) == 0
+
+
+def test_refresh_picks_up_late_commit_below_watermark(tmp_path):
+    # Id 3 belongs to a transaction that committed after ids 4-5 were read
+    rows = {1: unit(1), 2: unit(2), 4: unit(4), 5: unit(5)}
+    cursor = FakeCursor(rows)
+    snapshot = EmbeddingSnapshot(str(tmp_path), dim=4)
+    snapshot.refresh(cursor)
+
+    rows[3] = unit(3)
+    rows[6] = unit(6)
+
+    assert snapshot.refresh(cursor) == 2
+    assert len(snapshot) == 6
+    assert sorted(int(i) for i in snapshot._ids[:len(snapshot)]) == [1, 2, 3, 4, 5, 6]
+
+
+def test_refresh_overlap_bounds_the_rescan(tmp_path):
+    rows = {1: unit(1), 10: unit(10)}
+    cursor = FakeCursor(rows)
+    snapshot = EmbeddingSnapshot(str(tmp_path), dim=4, refresh_overlap=5)
+    snapshot.refresh(cursor)
+
+    rows[2] = unit(2)
+    rows[7] = unit(7)
+
+    assert snapshot.refresh(cursor) == 1
+    assert 7 in snapshot._id_to_row and 2 not in snapshot._id_to_row
+
+
+def test_reopen_keeps_vectors_and_watermark(tmp_path):
+    cursor = FakeCursor({i: unit(i) for i in range(1, 5)})
+    EmbeddingSnapshot(str(tmp_path), dim=4).refresh(cursor)
+
+    reopened = EmbeddingSnapshot(str(tmp_path), dim=4)
+
+    assert len(reopened) == 4
+    assert reopened.stats()["watermark_id"] == 4
+    assert reopened.search(unit(2), top_k=1)[0] == (2, 1.0)
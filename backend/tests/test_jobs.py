@@ -0,0 +1,80 @@
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import create_engine, update
+
+from parallel_api.jobs import JobStore, _now
+from parallel_api.models import Job
+
+
+@pytest.fixture
+def store(tmp_path):
+    return JobStore(create_engine(f"sqlite:///{tmp_path / 'jobs.sqlite3'}"))
+
+
+def make_stale(store, job_id):
+    with store.Session() as session:
+        session.execute(update(Job).where(Job.id == job_id).values(heartbeat_at=_now() - timedelta(hours=1)))
+        session.commit()
+
+
+def test_claim_takes_oldest_runnable_job_once(store):
+    first = store.enqueue("ingest_batch", {"n": 1})
+    store.enqueue("ingest_batch", {"n": 2})
+
+    claimed = store.claim("worker-a")
+
+    assert claimed.id == first.id
+    assert (claimed.status, claimed.worker_id, claimed.attempts) == ("running", "worker-a", 1)
+    assert store.claim("worker-b").payload == {"n": 2}
+    assert store.claim("worker-c") is None
+
+
+def test_claim_skips_jobs_waiting_to_retry(store):
+    job = store.enqueue("ingest_batch", {}, max_attempts=2)
+    store.claim("worker-a")
+
+    assert store.fail(job.id, "worker-a", "boom", retry_delay_seconds=60) == "queued"
+    assert store.claim("worker-a") is None
+
+
+def test_only_the_holding_worker_can_report(store):
+    job = store.enqueue("ingest_batch", {})
+    store.claim("worker-a")
+
+    assert not store.set_progress(job.id, "worker-b", 50, "not mine")
+    assert not store.complete(job.id, "worker-b", {"ok": False})
+    assert store.fail(job.id, "worker-b", "not mine") == "running"
+
+    assert store.set_progress(job.id, "worker-a", 50, "halfway")
+    assert store.complete(job.id, "worker-a", {"ok": True})
+    finished = store.get(job.id)
+    assert (finished.status, finished.result, finished.progress) == ("succeeded", {"ok": True}, 100.0)
+    assert not store.set_progress(job.id, "worker-a", 60, "late update")
+
+
+def test_requeue_stale_requeues_and_fences_the_old_worker(store):
+    job = store.enqueue("news_with_audio", {}, max_attempts=2)
+    store.claim("worker-a")
+    make_stale(store, job.id)
+
+    assert store.requeue_stale(stale_after_seconds=60) == 1
+    assert store.get(job.id).status == "queued"
+
+    reclaimed = store.claim("worker-b")
+    assert (reclaimed.id, reclaimed.attempts) == (job.id, 2)
+
+    # The first worker comes back: none of its writes land
+    assert not store.complete(job.id, "worker-a", {"stale": True})
+    assert store.fail(job.id, "worker-a", "late failure") == "running"
+    assert store.get(job.id).worker_id == "worker-b"
+
+
+def test_requeue_stale_fails_jobs_out_of_attempts(store):
+    job = store.enqueue("news_with_audio", {})
+    store.claim("worker-a")
+    make_stale(store, job.id)
+
+    assert store.requeue_stale(stale_after_seconds=60) == 1
+    assert store.get(job.id).status == "failed"
+    assert store.requeue_stale(stale_after_seconds=60) == 0
@@ -0,0 +1,99 @@
+import pytest
+
+from parallel_api.kv_cache import SQLiteStore, TwoTierCache
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SQLiteStore(str(tmp_path / "cache.sqlite3"), table="items", value_column="value", value_type="TEXT", max_entries=10)
+
+
+def last_used(store, key):
+    return store._conn.execute("SELECT last_used FROM items WHERE key = ?", (key,)).fetchone()[0]
+
+
+def test_hit_does_not_write_until_last_used_is_stale(store):
+    store.put_many({"a": "1"})
+    changes = store._conn.total_changes
+
+    assert store.get_many(["a", "missing"]) == {"a": "1"}
+    assert store._conn.total_changes == changes
+
+    store._conn.execute("UPDATE items SET last_used = 0 WHERE key = 'a'")
+    store.get_many(["a"])
+    assert last_used(store, "a") > 0
+
+
+def test_trim_runs_only_over_the_bound_and_keeps_recent_rows(store):
+    for i in range(10):
+        assert store.put_many({f"k{i}": str(i)}) == 0
+        store._conn.execute("UPDATE items SET last_used = ? WHERE key = ?", (i, f"k{i}"))
+
+    evicted = store.put_many({"new": "x"})
+
+    assert evicted == 2
+    assert store.count() == 9
+    assert store.get_many(["k0", "k1", "k2", "new"]).keys() == {"k2", "new"}
+
+
+def test_counter_starts_from_existing_rows(tmp_path, store):
+    store.put_many({f"k{i}": str(i) for i in range(8)})
+
+    reopened = SQLiteStore(store.path, table="items", value_column="value", value_type="TEXT", max_entries=10)
+
+    assert reopened._count == 8
+
+
+class FakeShared:
+    def __init__(self, rows):
+        self.rows = rows
+        self.writes = []
+
+    def get_many(self, keys):
+        return {key: self.rows[key] for key in keys if key in self.rows}
+
+    def put_many(self, entries):
+        self.writes.append(entries)
+        return 0
+
+
+def test_two_tier_copies_shared_hits_locally_and_counts_them(store):
+    shared = FakeShared({"b": "2"})
+    cache = TwoTierCache(store, shared, encode=str, decode=int)
+    cache.put("a", 1)
+
+    assert cache.get_many(["a", "b", "c"]) == {"a": 1, "b": 2}
+    assert store.get_many(["b"]) == {"b": "2"}
+    assert shared.writes == [{"a": "1"}]
+    assert cache.get("c") is None
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["shared_hits"], stats["misses"]) == (1, 1, 2)
+
+
+def test_two_tier_survives_shared_failures(store):
+    class Broken:
+        def get_many(self, keys):
+            raise RuntimeError("down")
+
+        def put_many(self, entries):
+            raise RuntimeError("down")
+
+    cache = TwoTierCache(store, Broken())
+    cache.put_many({"a": "1", "skip": None})
+
+    assert cache.get_many(["a", "b"]) == {"a": "1"}
+    assert store.count() == 1
+
+
+def test_embedding_cache_round_trips_float32(tmp_path):
+    from parallel_api.embedding_cache import EmbeddingCache, content_key
+
+    local = SQLiteStore(str(tmp_path / "embeddings.sqlite3"), table="embeddings", value_column="embedding")
+    cache = EmbeddingCache("model", local)
+    key = content_key("model", "  Some   text ")
+    cache.put_many({key: [0.5, -1.0, 0.25], "failed": None})
+
+    assert key == content_key("model", "Some text")
+    assert cache.get_many([key, "failed"]) == {key: [0.5, -1.0, 0.25]}
+    assert cache.stats()["model"] == "model"
@@ -0,0 +1,112 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from query_batcher import QueryBatcher
+
+
+class RecordingEncoder:
+    """Encodes each text as [len(text)]; the first call can be held to let requests queue up"""
+
+    def __init__(self, hold_first: bool = False):
+        self.batches = []
+        self.release = threading.Event()
+        self.started = threading.Event()
+        if not hold_first:
+            self.release.set()
+
+    def __call__(self, texts):
+        self.batches.append(list(texts))
+        self.started.set()
+        self.release.wait(timeout=5)
+        return np.array([[float(len(text))] for text in texts])
+
+
+def test_queued_requests_coalesce_up_to_max_batch_size():
+    encoder = RecordingEncoder(hold_first=True)
+    batcher = QueryBatcher(encoder, max_batch_size=3, max_wait_ms=50)
+    first = batcher.submit("warm")
+    assert encoder.started.wait(timeout=5)
+
+    futures = [batcher.submit("x" * n) for n in range(1, 6)]
+    encoder.release.set()
+
+    assert [future.result(timeout=5)[0] for future in futures] == [1.0, 2.0, 3.0, 4.0, 5.0]
+    assert first.result(timeout=5)[0] == 4.0
+    assert encoder.batches == [["warm"], ["x", "xx", "xxx"], ["xxxx", "xxxxx"]]
+    assert batcher.stats()["batch_size_max"] == 3
+    batcher.close()
+
+
+def test_batch_closes_after_max_wait_ms():
+    encoder = RecordingEncoder()
+    batcher = QueryBatcher(encoder, max_batch_size=32, max_wait_ms=20)
+
+    started = time.monotonic()
+    assert batcher.encode("a", timeout=5)[0] == 1.0
+    assert time.monotonic() - started < 1.0
+
+    time.sleep(0.05)
+    batcher.encode("bb", timeout=5)
+
+    assert encoder.batches == [["a"], ["bb"]]
+    batcher.close()
+
+
+def test_identical_texts_are_encoded_once_and_results_keep_order():
+    encoder = RecordingEncoder(hold_first=True)
+    batcher = QueryBatcher(encoder, max_batch_size=10, max_wait_ms=50)
+    batcher.submit("warm")
+    assert encoder.started.wait(timeout=5)
+
+    futures = [batcher.submit(text) for text in ["aa", "b", "aa", "ccc", "b"]]
+    encoder.release.set()
+
+    assert [future.result(timeout=5)[0] for future in futures] == [2.0, 1.0, 2.0, 3.0, 1.0]
+    assert encoder.batches[1] == ["aa", "b", "ccc"]
+    batcher.close()
+
+
+def test_encode_error_reaches_every_future_in_the_batch():
+    gate = threading.Event()
+    calls = []
+
+    def encode_batch(texts):
+        calls.append(list(texts))
+        if len(calls) == 1:
+            gate.wait(timeout=5)
+            return np.zeros((len(texts), 1))
+        raise RuntimeError("model failed")
+
+    batcher = QueryBatcher(encode_batch, max_batch_size=10, max_wait_ms=50)
+    batcher.submit("warm")
+    while not calls:
+        time.sleep(0.001)
+    futures = [batcher.submit(text) for text in ["a", "b", "c"]]
+    gate.set()
+
+    for future in futures:
+        with pytest.raises(RuntimeError, match="model failed"):
+            future.result(timeout=5)
+    assert batcher.stats()["errors"] == 1
+    batcher.close()
+
+
+def test_close_drains_pending_requests_then_rejects_new_ones():
+    encoder = RecordingEncoder(hold_first=True)
+    batcher = QueryBatcher(encoder, max_batch_size=2, max_wait_ms=50)
+    batcher.submit("warm")
+    assert encoder.started.wait(timeout=5)
+    futures = [batcher.submit(text) for text in ["a", "bb", "ccc"]]
+
+    closer = threading.Thread(target=batcher.close)
+    closer.start()
+    encoder.release.set()
+    closer.join(timeout=5)
+
+    assert not closer.is_alive()
+    assert [future.result(timeout=0)[0] for future in futures] == [1.0, 2.0, 3.0]
+    with pytest.raises(RuntimeError, match="closed"):
+        batcher.submit("late")
@@ -0,0 +1,68 @@
+import sqlite3
+
+import numpy as np
+
+from query_cache import QueryEmbeddingCache
+
+
+def disk_keys(cache):
+    return {key for key, in cache._disk.execute("SELECT key FROM query_embeddings")}
+
+
+def test_memory_tier_is_lru_and_shares_normalized_queries():
+    cache = QueryEmbeddingCache(max_entries=2)
+    cache.put("m", "Alpha", np.ones(2))
+    cache.put("m", "beta", np.zeros(2))
+
+    assert cache.get("m", "  ALPHA ") is not None
+    cache.put("m", "gamma", np.ones(2))
+
+    assert cache.get("m", "beta", memory_only=True) is None
+    assert cache.get("m", "alpha", memory_only=True) is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_disk_put_trims_only_over_capacity_by_last_used(tmp_path):
+    cache = QueryEmbeddingCache(max_entries=1, disk_path=str(tmp_path / "q.sqlite3"), disk_max_entries=10)
+    for i in range(10):
+        cache.put("m", f"q{i}", np.full(2, i, dtype=np.float32))
+        cache._disk.execute("UPDATE query_embeddings SET last_used = ? WHERE key = ?", (i, cache.make_key("m", f"q{i}")))
+    assert len(disk_keys(cache)) == 10
+
+    # Reading q0 from disk makes it recently used, so it survives the trim
+    cache._entries.clear()
+    assert cache.get("m", "q0") is not None
+    cache.put("m", "q10", np.zeros(2, dtype=np.float32))
+
+    assert len(disk_keys(cache)) == 9
+    assert cache.make_key("m", "q0") in disk_keys(cache)
+    assert cache.make_key("m", "q1") not in disk_keys(cache)
+
+
+def test_disk_tier_survives_restart_and_expires(tmp_path):
+    path = str(tmp_path / "q.sqlite3")
+    QueryEmbeddingCache(disk_path=path).put("m", "query", np.arange(3, dtype=np.float32))
+
+    reopened = QueryEmbeddingCache(disk_path=path)
+    np.testing.assert_array_equal(reopened.get("m", "query"), np.arange(3, dtype=np.float32))
+    assert reopened.stats()["disk_hits"] == 1
+
+    expired = QueryEmbeddingCache(disk_path=path, ttl_seconds=0)
+    assert expired.get("m", "query") is None
+    assert expired._disk_count == 0
+
+
+def test_old_disk_cache_gets_last_used(tmp_path):
+    path = str(tmp_path / "q.sqlite3")
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE query_embeddings (key TEXT PRIMARY KEY, embedding BLOB NOT NULL, dtype TEXT NOT NULL, created_at REAL NOT NULL)"
+    )
+    conn.execute("INSERT INTO query_embeddings VALUES ('k', ?, '<f4', 123.0)", (np.zeros(2, dtype=np.float32).tobytes(),))
+    conn.commit()
+    conn.close()
+
+    cache = QueryEmbeddingCache(disk_path=path)
+
+    assert cache._disk.execute("SELECT last_used FROM query_embeddings").fetchone()[0] == 123.0
+    assert cache._disk_count == 1
@@ -0,0 +1,66 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from parallel_api.bulk_ingest import COLUMNS, _row_values
+from parallel_api.models import Article, Category
+from parallel_api.sources import canonicalize_url, dedupe_urls, find_known_sources
+
+
+@pytest.mark.parametrize("url, expected", [
+    ("https://www.Example.com/news/story/", "https://example.com/news/story"),
+    ("HTTPS://example.com:443/a?b=2&a=1#comments", "https://example.com/a?a=1&b=2"),
+    ("http://example.com:8080/a", "http://example.com:8080/a"),
+    ("https://example.com/a?utm_source=x&id=7&fbclid=y&pk_campaign=z", "https://example.com/a?id=7"),
+    ("https://example.com/a?ref=home&q=", "https://example.com/a?q="),
+    ("https://example.com./", "https://example.com"),
+    ("  https://example.com/a  ", "https://example.com/a"),
+])
+def test_canonicalize_url(url, expected):
+    assert canonicalize_url(url) == expected
+
+
+@pytest.mark.parametrize("url", ["", "not a url", "/relative/path", "http://[::1"])
+def test_canonicalize_url_leaves_non_urls_alone(url):
+    assert canonicalize_url(url) == url.strip()
+
+
+def test_dedupe_urls_keeps_first_spelling():
+    urls = ["https://example.com/a?utm_medium=email", "https://www.example.com/a/", "", "https://example.com/b"]
+
+    assert dedupe_urls(urls) == ["https://example.com/a?utm_medium=email", "https://example.com/b"]
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'articles.sqlite3'}")
+    Category.__table__.create(bind=engine)
+    Article.__table__.create(bind=engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+def test_insert_stores_canonical_source(db):
+    db.add(Article(text="body", source="https://WWW.example.com/story/?utm_source=feed"))
+    db.add(Article(text="no source"))
+    db.commit()
+
+    assert [a.source_canonical for a in db.query(Article).order_by(Article.id)] == ["https://example.com/story", None]
+
+
+def test_find_known_sources_matches_any_spelling(db):
+    db.add(Article(text="body", source="https://www.example.com/story/?utm_source=feed"))
+    db.commit()
+
+    known = find_known_sources(db, ["https://example.com/story#top", "https://example.com/other", ""])
+
+    assert known == {"https://example.com/story"}
+
+
+def test_bulk_rows_carry_canonical_source():
+    values = dict(zip(COLUMNS, _row_values(7, {"text": "body", "source": "https://www.example.com/a/"})))
+
+    assert values["id"] == 7
+    assert values["source_canonical"] == "https://example.com/a"
+    assert dict(zip(COLUMNS, _row_values(8, {"text": "body"})))["source_canonical"] is None
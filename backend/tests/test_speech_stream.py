@@ -0,0 +1,99 @@
+import asyncio
+
+import pytest
+
+from parallel_api.speech_stream import SentenceSegmenter, stream_summary_speech
+
+
+def test_first_sentence_is_emitted_alone():
+    segmenter = SentenceSegmenter(min_chars=200)
+
+    chunks = segmenter.feed("Markets rose today. Tech led the gains. Oil fell. ")
+
+    assert chunks == ["Markets rose today."]
+    assert segmenter.flush() == "Tech led the gains. Oil fell."
+
+
+def test_later_sentences_are_gathered_to_min_chars():
+    segmenter = SentenceSegmenter(min_chars=30)
+
+    assert segmenter.feed("First one. ") == ["First one."]
+    assert segmenter.feed("Short. ") == []
+    assert segmenter.feed("Now this makes it long enough. ") == ["Short. Now this makes it long enough."]
+    assert segmenter.flush() is None
+
+
+def test_sentences_split_across_deltas():
+    segmenter = SentenceSegmenter(min_chars=10)
+
+    assert segmenter.feed("The fund ra") == []
+    assert segmenter.feed("ised $3.5 billion") == []
+    assert segmenter.feed(".") == []
+    assert segmenter.feed(" More follows") == ["The fund raised $3.5 billion."]
+    assert segmenter.flush() == "More follows"
+
+
+def test_abbreviations_and_initials_do_not_split():
+    segmenter = SentenceSegmenter(min_chars=10)
+
+    chunks = segmenter.feed("Dr. Smith met J. Doe in the U.S. on Monday. ")
+
+    assert chunks == ["Dr. Smith met J. Doe in the U.S. on Monday."]
+
+
+class FakeTTS:
+    def __init__(self, fail_on=None):
+        self.calls = []
+        self.fail_on = fail_on
+
+    async def stream_audio_from_text(self, text, voice_id=None, previous_text=None):
+        self.calls.append((text, previous_text))
+        if text == self.fail_on:
+            raise RuntimeError("synthesis failed")
+        for word in text.split():
+            yield word.encode()
+
+
+async def deltas(*parts):
+    for part in parts:
+        await asyncio.sleep(0)
+        yield part
+
+
+async def collect(stream):
+    return [chunk async for chunk in stream]
+
+
+def test_stream_voices_chunks_in_order_with_previous_text():
+    tts = FakeTTS()
+
+    audio = asyncio.run(collect(stream_summary_speech(deltas("One. Two", " here. Three."), tts, min_chars=5)))
+
+    assert b" ".join(audio) == b"One. Two here. Three."
+    assert tts.calls == [("One.", None), ("Two here.", "One."), ("Three.", "Two here.")]
+
+
+def test_synthesis_does_not_wait_for_the_listener():
+    tts = FakeTTS()
+
+    async def run():
+        stream = stream_summary_speech(deltas("One. Two here. Three."), tts, min_chars=5)
+        first = await stream.__anext__()
+        # A slow listener: the rest of the summary is still voiced meanwhile
+        await asyncio.sleep(0.05)
+        synthesized = list(tts.calls)
+        rest = await collect(stream)
+        return first, synthesized, rest
+
+    first, synthesized, rest = asyncio.run(run())
+
+    assert first == b"One."
+    assert [text for text, _ in synthesized] == ["One.", "Two here.", "Three."]
+    assert rest == [b"Two", b"here.", b"Three."]
+
+
+def test_errors_reach_the_listener():
+    tts = FakeTTS(fail_on="Two.")
+
+    with pytest.raises(RuntimeError, match="synthesis failed"):
+        asyncio.run(collect(stream_summary_speech(deltas("One. Two. "), tts, min_chars=1)))
@@ -0,0 +1,27 @@
+from startup_profile import StartupProfile
+
+
+def test_repeated_phase_overwrites_its_entry():
+    profile = StartupProfile()
+    for _ in range(3):
+        with profile.phase("warmup.total"):
+            pass
+    with profile.phase("warmup.database"):
+        pass
+
+    phases = profile.report()["phases"]
+
+    assert [p["phase"] for p in phases] == ["warmup.total", "warmup.database"]
+    assert phases[0]["runs"] == 3 and phases[1]["runs"] == 1
+
+
+def test_phase_is_recorded_when_it_raises():
+    profile = StartupProfile()
+    try:
+        with profile.phase("broken"):
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+
+    assert profile.report()["phases"][0]["phase"] == "broken"
+    assert not profile.ready
@@ -0,0 +1,69 @@
+import asyncio
+import json
+
+import pytest
+
+from parallel_api import stream_ingest
+
+
+class FakeEmbeddingService:
+    def __init__(self, fail_batches=()):
+        self.fail_batches = set(fail_batches)
+        self.calls = 0
+
+    async def generate_embeddings_batch(self, texts):
+        self.calls += 1
+        if self.calls in self.fail_batches:
+            raise RuntimeError("embeddings down")
+        return [[0.0] for _ in texts]
+
+
+class FakeSession:
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def ingest(monkeypatch):
+    def fake_insert(db, rows):
+        return [(100 + i, None) for i in range(len(rows))]
+
+    monkeypatch.setattr(stream_ingest, "SessionLocal", FakeSession)
+    monkeypatch.setattr(stream_ingest, "_insert_and_commit", fake_insert)
+
+    def run(lines, service, batch_size=2):
+        monkeypatch.setattr(stream_ingest, "get_async_embedding_service", lambda: service)
+
+        async def body():
+            for line in lines:
+                yield (line + "\n").encode()
+
+        async def collect():
+            return [json.loads(line) async for line in stream_ingest.ingest_ndjson(body(), batch_size=batch_size, max_pending_batches=1)]
+
+        return asyncio.run(collect())
+
+    return run
+
+
+def record(n):
+    return json.dumps({"url": f"https://example.com/{n}", "title": f"T{n}", "excerpts": [f"Article {n} text."]})
+
+
+def test_every_record_gets_a_line(ingest):
+    lines = ingest([record(1), "not json", record(2), record(3)], FakeEmbeddingService())
+
+    assert sorted(line["line"] for line in lines[:-1]) == [1, 2, 3, 4]
+    assert lines[-1] == {"summary": {"articles_created": 3, "errors": 1, "stream_errors": 0}}
+
+
+def test_failed_embedding_batch_fails_only_its_records(ingest):
+    service = FakeEmbeddingService(fail_batches={1})
+
+    lines = ingest([record(n) for n in range(1, 8)], service)
+
+    failed = sorted(line["line"] for line in lines[:-1] if line["error"])
+    assert failed == [1, 2]
+    assert all("Embedding failed" in line["error"] for line in lines[:-1] if line["error"])
+    assert service.calls == 4
+    assert lines[-1] == {"summary": {"articles_created": 5, "errors": 2, "stream_errors": 0}}
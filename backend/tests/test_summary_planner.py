@@ -0,0 +1,65 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from parallel_api.summary_planner import SummaryPlanner
+
+
+@pytest.fixture
+def planner():
+    planner = SummaryPlanner()
+    planner.compress_input = False
+    planner.pack_max_article_chars = 1000
+    planner.pack_max_items = 3
+    planner.pack_max_tokens = 100_000
+    return planner
+
+
+def response(content):
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+        usage=SimpleNamespace(prompt_tokens=10, completion_tokens=20)
+    )
+
+
+def test_short_articles_are_packed_up_to_max_items(planner):
+    items = [("short text", "")] * 4 + [("x" * 2000, "long")]
+
+    assert planner.plan_packs(items, [0, 1, 2, 3, 4], 2) == [[0, 1, 2], [4], [3]]
+
+
+def test_pack_token_budget_starts_a_new_pack(planner):
+    planner.pack_max_tokens = 400 + 2 * (planner.completion_tokens_per_summary(2) + 30)
+    items = [("a" * 30, "")] * 3
+
+    assert planner.plan_packs(items, [0, 1, 2], 2) == [[0, 1], [2]]
+
+
+def test_packed_response_keeps_known_ids_of_sufficient_length(planner):
+    long_summary = " ".join(["word"] * 80)
+    content = json.dumps({"summaries": [
+        {"id": "0", "summary": long_summary},
+        {"id": "0", "summary": "duplicate " * 80},
+        {"id": "1", "summary": "too short"},
+        {"id": "9", "summary": long_summary},
+    ]})
+
+    summaries, usage = planner.parse_packed_response(response(content), ["0", "1"], 2)
+
+    assert summaries == {"0": long_summary}
+    assert usage == {"prompt_tokens": 10, "completion_tokens": 20}
+
+
+def test_packed_response_without_summaries_list_raises(planner):
+    with pytest.raises(ValueError):
+        planner.parse_packed_response(response('{"other": []}'), ["0"], 2)
+
+
+def test_cache_key_covers_text_as_sent(planner):
+    key = planner.cache_key("x" * 9000, "title", 2)
+
+    assert key != planner.cache_key("x" * 9000, "title", 3)
+    assert key != planner.cache_key("x" * 9000, "other", 2)
+    # Only the first MAX_INPUT_CHARS are sent when compression is off
+    assert key == planner.cache_key("x" * 9000 + "ignored", "title", 2)
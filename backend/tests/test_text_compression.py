@@ -0,0 +1,89 @@
+import numpy as np
+
+from parallel_api.text_compression import (
+    CHARS_PER_TOKEN,
+    compress_text,
+    score_sentences,
+    split_sentences,
+    strip_boilerplate,
+)
+
+ARTICLE = """
+# Site Menu
+[Home](https://example.com) | World | Business
+![Photo](https://example.com/photo.jpg)
+
+The central bank raised interest rates by half a point on Tuesday, its largest increase in two decades.
+Officials said inflation had stayed above the target for the bank for most of the year.
+
+Subscribe to our newsletter for daily updates.
+Accept all cookies
+
+Economists had expected a smaller increase, but inflation data released last week surprised markets.
+Markets fell sharply after the interest rates decision, with bank shares leading the decline.
+The bank said further increases in interest rates remain possible if inflation does not slow.
+Read more: [Related coverage](https://example.com/related)
+Economists had expected a smaller increase, but inflation data released last week surprised markets.
+"""
+
+
+def test_strip_boilerplate_drops_menus_banners_links_and_repeats():
+    cleaned = strip_boilerplate(ARTICLE)
+
+    assert "Subscribe" not in cleaned and "cookies" not in cleaned and "Site Menu" not in cleaned
+    assert "https://" not in cleaned and "Photo" not in cleaned
+    assert cleaned.count("Economists had expected") == 1
+    assert cleaned.startswith("The central bank raised interest rates")
+
+
+def test_split_sentences_keeps_paragraphs_and_decimals():
+    sentences = split_sentences("Rates rose 0.5 points. Markets fell!\n\nA new paragraph starts here.")
+
+    assert sentences == [
+        (0, "Rates rose 0.5 points."),
+        (0, "Markets fell!"),
+        (1, "A new paragraph starts here."),
+    ]
+
+
+def test_score_sentences_favours_central_sentences():
+    sentences = [
+        "Weather was mild.",
+        "Interest rates rose as inflation stayed high.",
+        "Inflation stayed high so interest rates rose again.",
+        "A local team won a game.",
+    ]
+
+    scores = score_sentences(sentences)
+
+    assert scores.shape == (4,)
+    assert scores[1] > scores[3] and scores[2] > scores[3]
+    assert score_sentences([]).size == 0
+    # No shared terms: only the lead bias orders sentences
+    assert np.all(np.diff(score_sentences(["Alpha one.", "Beta two.", "Gamma three."])) < 0)
+
+
+def test_compress_text_returns_cleaned_text_within_budget():
+    compress_text.cache_clear()
+
+    assert compress_text(ARTICLE, 1000) == strip_boilerplate(ARTICLE)
+
+
+def test_compress_text_keeps_top_sentences_in_order_within_budget():
+    compress_text.cache_clear()
+    max_tokens = 80
+
+    compressed = compress_text(ARTICLE, max_tokens)
+
+    assert len(compressed) <= max_tokens * CHARS_PER_TOKEN
+    kept = [sentence for _, sentence in split_sentences(compressed)]
+    original = [sentence for _, sentence in split_sentences(strip_boilerplate(ARTICLE))]
+    assert kept and all(sentence in original for sentence in kept)
+    assert [original.index(sentence) for sentence in kept] == sorted(original.index(sentence) for sentence in kept)
+
+
+def test_compress_text_falls_back_to_original_when_everything_is_boilerplate():
+    compress_text.cache_clear()
+
+    assert compress_text("Subscribe now", 100) == "Subscribe now"
+    assert compress_text("x" * 50, 5) == "x" * 15
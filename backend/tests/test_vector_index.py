@@ -0,0 +1,93 @@
+import pytest
+
+import vector_index
+from services.article_service import ArticleService
+from vector_index import FILTERED_EF_SEARCH, apply_search_params, search_settings, supports_iterative_scan
+
+
+class RecordingCursor:
+    def __init__(self, version):
+        self.version = version
+        self.executed = []
+
+    def execute(self, sql, params=None):
+        self.executed.append((sql, params))
+
+    def fetchone(self):
+        return {"extversion": self.version}
+
+
+@pytest.mark.parametrize("version, expected", [
+    ("0.8.0", True), ("0.10.1", True), ("1.0", True), ("0.7.4", False), (None, False), ("dev", False),
+])
+def test_supports_iterative_scan(version, expected):
+    assert supports_iterative_scan(version) is expected
+
+
+def test_unfiltered_search_only_applies_requested_settings():
+    assert search_settings() == []
+    assert search_settings(ef_search=80, probes=5) == [("hnsw.ef_search", "80"), ("ivfflat.probes", "5")]
+
+
+def test_filtered_search_uses_iterative_scan_when_available():
+    assert search_settings(ef_search=80, filtered=True, iterative_scan=True) == [
+        ("hnsw.iterative_scan", "strict_order"),
+        ("hnsw.ef_search", "80"),
+    ]
+
+
+def test_filtered_search_raises_ef_search_without_iterative_scan():
+    assert search_settings(filtered=True) == [("hnsw.ef_search", str(FILTERED_EF_SEARCH))]
+    assert search_settings(ef_search=500, filtered=True) == [("hnsw.ef_search", "500")]
+
+
+def test_apply_search_params_checks_pgvector_version_once(monkeypatch):
+    monkeypatch.setattr(vector_index, "_iterative_scan", None)
+    cursor = RecordingCursor("0.8.0")
+
+    apply_search_params(cursor, filtered=True)
+    apply_search_params(cursor, filtered=True)
+
+    version_checks = [sql for sql, _ in cursor.executed if sql == vector_index.PGVECTOR_VERSION_SQL]
+    assert len(version_checks) == 1
+    assert cursor.executed[-1] == ("SELECT set_config(%s, %s, true)", ("hnsw.iterative_scan", "strict_order"))
+
+
+def test_build_search_query_numbers_placeholders_for_asyncpg():
+    query, params = ArticleService.build_search_query([0.1, 0.2], limit=5, category_ids=[3], numbered=True)
+
+    assert "%s" not in query
+    assert "ANY($2::int[])" in query and "ORDER BY a.vector <=> $3::vector" in query and "LIMIT $4" in query
+    assert params == ([0.1, 0.2], [3], [0.1, 0.2], 5)
+
+
+def test_build_search_query_without_filter():
+    query, params = ArticleService.build_search_query([0.1], limit=2)
+
+    assert "WHERE" not in query and query.count("%s") == 3
+    assert params == ([0.1], [0.1], 2)
+
+
+def test_async_search_shares_the_process_wide_version_check(monkeypatch):
+    import asyncio
+
+    from services.async_article_service import AsyncArticleService
+
+    monkeypatch.setattr(vector_index, "_iterative_scan", None)
+    checks = []
+
+    class Connection:
+        async def fetchval(self, sql):
+            checks.append(sql)
+            return "0.7.4"
+
+    settings = asyncio.run(AsyncArticleService._search_settings(Connection(), None, None, True))
+
+    assert settings == [("hnsw.ef_search", str(FILTERED_EF_SEARCH))]
+    assert vector_index.cached_iterative_scan() is False
+    assert checks == [vector_index.PGVECTOR_VERSION_SQL]
+
+    # The sync path reuses the answer instead of checking again
+    cursor = RecordingCursor("0.8.0")
+    apply_search_params(cursor, filtered=True)
+    assert cursor.executed == [("SELECT set_config(%s, %s, true)", ("hnsw.ef_search", str(FILTERED_EF_SEARCH)))]
@@ -0,0 +1,500 @@
+"""
+Vector index management for articles.vector
+
+Builds and rebuilds HNSW or IVFFlat indexes with parameters tuned to the
+current row count, applies per-query ef_search/probes settings, checks with
+EXPLAIN that article search actually uses the index, and measures recall@k
+and latency against exact search so the speed/accuracy trade-off is chosen
+on purpose.
+
+Usage:
+    python vector_index.py status
+    python vector_index.py build --method hnsw [--m 16] [--ef-construction 64]
+    python vector_index.py build --method ivfflat [--lists 100]
+    python vector_index.py explain [--query "artificial intelligence"] [--category-ids 1 2]
+    python vector_index.py recall [--k 10] [--samples 50] [--ef-search 20 40 80 160]
+    python vector_index.py recall --probes 1 5 10 20
+"""
+import argparse
+import math
+import statistics
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from psycopg2.extras import RealDictCursor
+
+INDEX_NAME = "idx_articles_vector"
+TABLE_NAME = "articles"
+COLUMN_NAME = "vector"
+OPCLASS = "vector_cosine_ops"
+METHODS = ("hnsw", "ivfflat")
+
+# Minimum HNSW candidate list for filtered searches when pgvector (< 0.8)
+# cannot keep scanning after the filter drops candidates
+FILTERED_EF_SEARCH = 200
+
+PGVECTOR_VERSION_SQL = "SELECT extversion FROM pg_extension WHERE extname = 'vector'"
+
+_iterative_scan: Optional[bool] = None
+
+
+def tuned_index_params(method: str, row_count: int) -> Dict[str, int]:
+    """
+    Pick build parameters for the current table size
+
+    Follows the pgvector guidance: IVFFlat uses rows/1000 lists up to 1M rows
+    and sqrt(rows) beyond that; HNSW keeps the defaults for small tables and
+    raises m/ef_construction for large ones where recall would otherwise drop.
+
+    Args:
+        method: "hnsw" or "ivfflat"
+        row_count: Number of rows with a vector
+
+    Returns:
+        Dict of index build parameters
+    """
+    if method == "ivfflat":
+        if row_count <= 1_000_000:
+            lists = max(1, row_count // 1000)
+        else:
+            lists = int(math.sqrt(row_count))
+        return {"lists": lists}
+
+    if method == "hnsw":
+        if row_count < 1_000_000:
+            return {"m": 16, "ef_construction": 64}
+        return {"m": 24, "ef_construction": 128}
+
+    raise ValueError(f"Unknown index method {method!r}; expected one of {METHODS}")
+
+
+def default_search_params(method: str, index_params: Dict[str, int]) -> Dict[str, int]:
+    """Suggested query-time settings for an index built with index_params."""
+    if method == "ivfflat":
+        return {"probes": max(1, int(math.sqrt(index_params["lists"])))}
+    return {"ef_search": 40}
+
+
+def supports_iterative_scan(version: Optional[str]) -> bool:
+    """Whether a pgvector version string has iterative index scans (0.8.0+)."""
+    try:
+        return tuple(int(part) for part in (version or "").split(".")[:2]) >= (0, 8)
+    except ValueError:
+        return False
+
+
+def cached_iterative_scan() -> Optional[bool]:
+    """Whether the database's pgvector has iterative index scans, or None before it was checked."""
+    return _iterative_scan
+
+
+def set_pgvector_version(version: Optional[str]) -> bool:
+    """Record the database's pgvector version for this process; returns whether it has iterative scans."""
+    global _iterative_scan
+    _iterative_scan = supports_iterative_scan(version)
+    return _iterative_scan
+
+
+def has_iterative_scan(cursor) -> bool:
+    """Whether the database's pgvector has iterative index scans; checked once per process."""
+    if _iterative_scan is None:
+        cursor.execute(PGVECTOR_VERSION_SQL)
+        row = cursor.fetchone()
+        return set_pgvector_version(None if row is None else (row["extversion"] if isinstance(row, dict) else row[0]))
+    return _iterative_scan
+
+
+def search_settings(
+    ef_search: Optional[int] = None,
+    probes: Optional[int] = None,
+    filtered: bool = False,
+    iterative_scan: bool = False
+) -> List[Tuple[str, str]]:
+    """
+    (setting, value) pairs to apply before an article search
+
+    HNSW applies WHERE filters after the index scan, so a category filter can
+    leave fewer than LIMIT rows out of ef_search candidates. Filtered searches
+    therefore enable hnsw.iterative_scan (strict_order keeps results exactly
+    ordered) on pgvector 0.8+, and raise ef_search to at least
+    FILTERED_EF_SEARCH on older versions.
+
+    Args:
+        ef_search: HNSW candidate list size requested for this query
+        probes: IVFFlat lists to probe requested for this query
+        filtered: Whether the query has a WHERE filter besides the ORDER BY
+        iterative_scan: Whether pgvector supports hnsw.iterative_scan
+
+    Returns:
+        List of (setting name, value) pairs
+    """
+    settings = []
+    if filtered and iterative_scan:
+        settings.append(("hnsw.iterative_scan", "strict_order"))
+    elif filtered:
+        ef_search = max(ef_search or 0, FILTERED_EF_SEARCH)
+
+    if ef_search is not None:
+        settings.append(("hnsw.ef_search", str(int(ef_search))))
+    if probes is not None:
+        settings.append(("ivfflat.probes", str(int(probes))))
+    return settings
+
+
+def apply_search_params(
+    cursor,
+    ef_search: Optional[int] = None,
+    probes: Optional[int] = None,
+    filtered: bool = False
+) -> None:
+    """
+    Set ANN search parameters for the current transaction only
+
+    Uses set_config(..., is_local => true) so the values are bound parameters
+    and are reset when the transaction ends, leaving pooled connections clean.
+
+    Args:
+        cursor: psycopg2 cursor inside the transaction that runs the search
+        ef_search: HNSW candidate list size (higher = better recall, slower)
+        probes: IVFFlat lists to probe (higher = better recall, slower)
+        filtered: The search has a category filter (see search_settings)
+    """
+    iterative_scan = filtered and has_iterative_scan(cursor)
+    for name, value in search_settings(ef_search, probes, filtered, iterative_scan):
+        cursor.execute("SELECT set_config(%s, %s, true)", (name, value))
+
+
+def count_vectors(cursor) -> int:
+    cursor.execute(f"SELECT COUNT(*) AS n FROM {TABLE_NAME} WHERE {COLUMN_NAME} IS NOT NULL")
+    row = cursor.fetchone()
+    return row["n"] if isinstance(row, dict) else row[0]
+
+
+def get_index_status(cursor) -> List[Dict[str, Any]]:
+    """Return the vector indexes on articles with their definitions and sizes."""
+    cursor.execute("""
+        SELECT
+            i.indexname,
+            i.indexdef,
+            pg_size_pretty(pg_relation_size(quote_ident(i.indexname)::regclass)) AS size
+        FROM pg_indexes i
+        WHERE i.tablename = %s
+          AND (i.indexdef ILIKE '%%USING hnsw%%' OR i.indexdef ILIKE '%%USING ivfflat%%')
+    """, (TABLE_NAME,))
+    return cursor.fetchall()
+
+
+def build_index(
+    conn,
+    method: str = "hnsw",
+    params: Optional[Dict[str, int]] = None,
+    concurrently: bool = True,
+    maintenance_work_mem: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Build (or rebuild) the articles.vector index
+
+    The new index is built under a temporary name and then swapped in, so
+    searches keep using the old index until the new one is ready.
+
+    Args:
+        conn: psycopg2 connection (switched to autocommit for CONCURRENTLY)
+        method: "hnsw" or "ivfflat"
+        params: Build parameters; tuned to the row count when omitted
+        concurrently: Build without blocking writes
+        maintenance_work_mem: Optional memory setting for the build (e.g. "1GB")
+
+    Returns:
+        Dict with method, params, row_count and build_seconds
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown index method {method!r}; expected one of {METHODS}")
+
+    previous_autocommit = conn.autocommit
+    conn.autocommit = True
+    try:
+        with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+            row_count = count_vectors(cursor)
+            if params is None:
+                params = tuned_index_params(method, row_count)
+
+            if maintenance_work_mem:
+                cursor.execute("SELECT set_config('maintenance_work_mem', %s, false)", (maintenance_work_mem,))
+
+            with_clause = ", ".join(f"{key} = {int(value)}" for key, value in params.items())
+            new_name = f"{INDEX_NAME}_new"
+            concurrent_sql = "CONCURRENTLY " if concurrently else ""
+
+            cursor.execute(f"DROP INDEX {concurrent_sql}IF EXISTS {new_name}")
+
+            started = time.perf_counter()
+            cursor.execute(
+                f"CREATE INDEX {concurrent_sql}{new_name} ON {TABLE_NAME} "
+                f"USING {method} ({COLUMN_NAME} {OPCLASS}) WITH ({with_clause})"
+            )
+            build_seconds = time.perf_counter() - started
+
+            cursor.execute(f"DROP INDEX {concurrent_sql}IF EXISTS {INDEX_NAME}")
+            cursor.execute(f"ALTER INDEX {new_name} RENAME TO {INDEX_NAME}")
+            cursor.execute(f"ANALYZE {TABLE_NAME}")
+    finally:
+        conn.autocommit = previous_autocommit
+
+    return {
+        "method": method,
+        "params": params,
+        "row_count": row_count,
+        "build_seconds": round(build_seconds, 3),
+        "suggested_search_params": default_search_params(method, params),
+    }
+
+
+def _walk_plan(node: Dict[str, Any]) -> Iterable[Dict[str, Any]]:
+    yield node
+    for child in node.get("Plans", []):
+        yield from _walk_plan(child)
+
+
+def explain_search(
+    cursor,
+    query_embedding: Sequence[float],
+    limit: int = 10,
+    category_ids: Optional[List[int]] = None,
+    ef_search: Optional[int] = None,
+    probes: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    EXPLAIN the exact SQL ArticleService.search_articles_by_text runs
+
+    Args:
+        cursor: psycopg2 RealDictCursor
+        query_embedding: Query vector
+        limit: Result limit
+        category_ids: Optional category filter
+        ef_search: Optional HNSW setting to apply first
+        probes: Optional IVFFlat setting to apply first
+
+    Returns:
+        Dict with uses_index, index_name, node_types and the JSON plan
+    """
+    from services.article_service import ArticleService
+
+    query, params = ArticleService.build_search_query(list(query_embedding), limit, category_ids)
+    apply_search_params(cursor, ef_search=ef_search, probes=probes, filtered=bool(category_ids))
+    cursor.execute("EXPLAIN (FORMAT JSON) " + query, params)
+    row = cursor.fetchone()
+    plan = (row["QUERY PLAN"] if isinstance(row, dict) else row[0])[0]["Plan"]
+
+    nodes = list(_walk_plan(plan))
+    index_nodes = [
+        n for n in nodes
+        if n.get("Node Type") in ("Index Scan", "Index Only Scan") and n.get("Index Name") == INDEX_NAME
+    ]
+
+    return {
+        "uses_index": bool(index_nodes),
+        "index_name": index_nodes[0]["Index Name"] if index_nodes else None,
+        "node_types": [n.get("Node Type") for n in nodes],
+        "plan": plan,
+    }
+
+
+def _top_ids(cursor, query_vector, k: int) -> List[int]:
+    cursor.execute(
+        f"SELECT id FROM {TABLE_NAME} WHERE {COLUMN_NAME} IS NOT NULL "
+        f"ORDER BY {COLUMN_NAME} <=> %s::vector LIMIT %s",
+        (query_vector, k)
+    )
+    return [row["id"] for row in cursor.fetchall()]
+
+
+def measure_recall(
+    conn,
+    k: int = 10,
+    samples: int = 50,
+    ef_search_values: Optional[List[int]] = None,
+    probes_values: Optional[List[int]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Compare approximate index search with exact search
+
+    Query vectors are sampled from existing articles. Exact results come from
+    the same query with index scans disabled.
+
+    Args:
+        conn: psycopg2 connection
+        k: Results per query
+        samples: Number of sampled query vectors
+        ef_search_values: HNSW settings to evaluate
+        probes_values: IVFFlat settings to evaluate
+
+    Returns:
+        One dict per setting with recall@k and latency percentiles
+    """
+    settings_to_test = [{"ef_search": v} for v in (ef_search_values or [])]
+    settings_to_test += [{"probes": v} for v in (probes_values or [])]
+    if not settings_to_test:
+        settings_to_test = [{}]
+
+    with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+        cursor.execute(
+            f"SELECT {COLUMN_NAME}::text AS v FROM {TABLE_NAME} "
+            f"WHERE {COLUMN_NAME} IS NOT NULL ORDER BY random() LIMIT %s",
+            (samples,)
+        )
+        query_vectors = [row["v"] for row in cursor.fetchall()]
+        conn.rollback()
+
+        exact_results = []
+        exact_latencies = []
+        for vector in query_vectors:
+            cursor.execute("SET LOCAL enable_indexscan = off")
+            started = time.perf_counter()
+            exact_results.append(set(_top_ids(cursor, vector, k)))
+            exact_latencies.append((time.perf_counter() - started) * 1000)
+            conn.rollback()
+
+        report = [{
+            "setting": "exact",
+            "recall_at_k": 1.0,
+            "p50_ms": round(statistics.median(exact_latencies), 3) if exact_latencies else None,
+            "p95_ms": round(_percentile(exact_latencies, 95), 3) if exact_latencies else None,
+        }]
+
+        for setting in settings_to_test:
+            recalls = []
+            latencies = []
+            for vector, exact in zip(query_vectors, exact_results):
+                apply_search_params(cursor, **setting)
+                started = time.perf_counter()
+                approx = _top_ids(cursor, vector, k)
+                latencies.append((time.perf_counter() - started) * 1000)
+                conn.rollback()
+                if exact:
+                    recalls.append(len(exact.intersection(approx)) / len(exact))
+
+            report.append({
+                "setting": ", ".join(f"{key}={value}" for key, value in setting.items()) or "server default",
+                "recall_at_k": round(statistics.mean(recalls), 4) if recalls else None,
+                "p50_ms": round(statistics.median(latencies), 3) if latencies else None,
+                "p95_ms": round(_percentile(latencies, 95), 3) if latencies else None,
+            })
+
+    return report
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def main():
+    import psycopg2
+    from pgvector.psycopg2 import register_vector
+    from config import settings
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser("status", help="Show vector indexes and row count")
+
+    build_parser = subparsers.add_parser("build", help="Build or rebuild the vector index")
+    build_parser.add_argument("--method", choices=METHODS, default="hnsw")
+    build_parser.add_argument("--m", type=int)
+    build_parser.add_argument("--ef-construction", type=int)
+    build_parser.add_argument("--lists", type=int)
+    build_parser.add_argument("--maintenance-work-mem")
+    build_parser.add_argument("--blocking", action="store_true", help="Build without CONCURRENTLY")
+
+    explain_parser = subparsers.add_parser("explain", help="Check that article search uses the index")
+    explain_parser.add_argument("--query", help="Encode this text with the search model (default: sample an article vector)")
+    explain_parser.add_argument("--limit", type=int, default=10)
+    explain_parser.add_argument("--category-ids", type=int, nargs="*")
+    explain_parser.add_argument("--ef-search", type=int)
+    explain_parser.add_argument("--probes", type=int)
+
+    recall_parser = subparsers.add_parser("recall", help="Measure recall@k and latency against exact search")
+    recall_parser.add_argument("--k", type=int, default=10)
+    recall_parser.add_argument("--samples", type=int, default=50)
+    recall_parser.add_argument("--ef-search", type=int, nargs="*")
+    recall_parser.add_argument("--probes", type=int, nargs="*")
+
+    args = parser.parse_args()
+
+    conn = psycopg2.connect(settings.database_url)
+    register_vector(conn)
+
+    try:
+        if args.command == "status":
+            with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+                print(f"Rows with vectors: {count_vectors(cursor)}")
+                for index in get_index_status(cursor):
+                    print(f"  {index['indexname']} ({index['size']}): {index['indexdef']}")
+
+        elif args.command == "build":
+            overrides = {
+                "m": args.m,
+                "ef_construction": args.ef_construction,
+                "lists": args.lists,
+            }
+            with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+                params = tuned_index_params(args.method, count_vectors(cursor))
+            conn.rollback()
+            params.update({k: v for k, v in overrides.items() if v is not None and k in params})
+
+            result = build_index(
+                conn,
+                method=args.method,
+                params=params,
+                concurrently=not args.blocking,
+                maintenance_work_mem=args.maintenance_work_mem
+            )
+            print(f"Built {result['method']} index with {result['params']} on {result['row_count']} rows "
+                  f"in {result['build_seconds']}s")
+            print(f"Suggested search params: {result['suggested_search_params']}")
+
+        elif args.command == "explain":
+            with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+                if args.query:
+                    from embeddings import get_model
+                    query_embedding = get_model().encode_queries([args.query])[0].tolist()
+                else:
+                    cursor.execute(f"SELECT {COLUMN_NAME} FROM {TABLE_NAME} WHERE {COLUMN_NAME} IS NOT NULL LIMIT 1")
+                    row = cursor.fetchone()
+                    if row is None:
+                        print("No vectors in articles; pass --query to explain with an encoded query")
+                        return
+                    query_embedding = list(row[COLUMN_NAME])
+
+                result = explain_search(
+                    cursor,
+                    query_embedding,
+                    limit=args.limit,
+                    category_ids=args.category_ids,
+                    ef_search=args.ef_search,
+                    probes=args.probes
+                )
+            conn.rollback()
+
+            status = "uses" if result["uses_index"] else "does NOT use"
+            print(f"Article search {status} {INDEX_NAME}")
+            print(f"Plan nodes: {' -> '.join(result['node_types'])}")
+
+        elif args.command == "recall":
+            report = measure_recall(
+                conn,
+                k=args.k,
+                samples=args.samples,
+                ef_search_values=args.ef_search,
+                probes_values=args.probes
+            )
+            print(f"{'setting':<20} {'recall@' + str(args.k):>10} {'p50 ms':>10} {'p95 ms':>10}")
+            for row in report:
+                print(f"{row['setting']:<20} {row['recall_at_k']!s:>10} {row['p50_ms']!s:>10} {row['p95_ms']!s:>10}")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,7 @@ Keywords: AI, Agentic, MCP, Context, HITL, RL
 """
 import requests
 import json
+import time
 from datetime import datetime
 
 # API endpoint
@@ -41,14 +42,39 @@ print("\nPlease wait...\n")
 
 start_time = datetime.now()
 
+def wait_for_job(job_id, timeout=600, poll_interval=2):
+    """Poll a background job until it finishes, printing progress"""
+    deadline = time.time() + timeout
+    last_message = None
+
+    while time.time() < deadline:
+        job = requests.get(f"{API_URL}/jobs/{job_id}", timeout=30).json()
+        message = f"  [{job['progress']:5.1f}%] {job['status']}: {job['message']}"
+        if message != last_message:
+            print(message)
+            last_message = message
+        if job["status"] in ("succeeded", "failed"):
+            return job
+        time.sleep(poll_interval)
+
+    raise TimeoutError(f"Job {job_id} did not finish within {timeout} seconds")
+
+
 try:
-    response = requests.post(ENDPOINT, json=payload, timeout=600)  # 10 min timeout
+    response = requests.post(ENDPOINT, json=payload, timeout=30)
+
+    job = None
+    if response.status_code == 202:
+        print(f"Queued job {response.json()['id']}\n")
+        job = wait_for_job(response.json()["id"])
 
     end_time = datetime.now()
     duration = (end_time - start_time).total_seconds()
 
-    if response.status_code == 200:
-        result = response.json()
+    if job and job["status"] != "succeeded":
+        print(f"\n✗ Job {job['id']} failed: {job['error']}")
+    elif job:
+        result = job["result"]
 
         print("\n" + "="*80)
         print("✓ SUCCESS!")
@@ -89,9 +115,9 @@ try:
         print(f"\n✗ Error: {response.status_code}")
         print(f"Response: {response.text}")
 
-except requests.exceptions.Timeout:
-    print("\n✗ Request timed out (took longer than 10 minutes)")
+except TimeoutError:
+    print("\n✗ Job did not finish within 10 minutes")
 except requests.exceptions.ConnectionError:
-    print("\n✗ Could not connect to server. Is it running on port 8001?")
+    print("\n✗ Could not connect to server. Is it running on port 8001 (with a worker)?")
 except Exception as e:
     print(f"\n✗ Error: {str(e)}")